@@ -0,0 +1,233 @@
+"""
+batch_generate.py — Headless Batch Resume Generator
+=====================================================
+Generates resume PDFs for a whole batch of students without the Streamlit UI.
+
+Input is JSONL (one resume per line) or CSV, in the same dict shape that
+utils.pdf_generator.build_pdf consumes. In CSV, the `education` and
+`experience` columns hold JSON lists. An optional `template` field picks the
+template per record (name or part of it, e.g. "classic").
+
+Usage:
+    python batch_generate.py students.jsonl --out resumes/
+    python batch_generate.py students.csv --zip resumes.zip --template blue
+    GEMINI_API_KEY=... python batch_generate.py students.jsonl --out resumes/ --enhance
+
+Records are streamed (never all loaded), rendered in a process pool across
+all cores, and progress / throughput / failures are reported on stderr. A
+malformed line or CSV cell fails only its own record; --failures writes each
+failed record with its error so it can be fixed and re-run.
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from utils.pdf_generator import TEMPLATES, render_pdf
+
+
+DEFAULT_TEMPLATE = "🎯 Classic Professional"
+ENHANCE_CHUNK = 32          # records enhanced together before rendering
+PROGRESS_EVERY = 50
+
+
+# ── Input ─────────────────────────────────────────────────────────────────────
+def read_records(path):
+    """
+    Yield (record, error) one at a time from a .jsonl or .csv file. When a
+    line or row cannot be parsed, `record` is the raw line / row and `error`
+    says why; otherwise `error` is "".
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            for row in csv.DictReader(f):
+                record = {k: (v or "") for k, v in row.items() if k}
+                try:
+                    for key in ("education", "experience"):
+                        value = record.get(key, "").strip()
+                        record[key] = json.loads(value) if value else []
+                except ValueError as exc:
+                    yield record, f"Invalid JSON in '{key}' column: {exc}"
+                    continue
+                yield record, ""
+        else:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as exc:
+                    yield line.rstrip("\n"), f"Invalid JSON: {exc}"
+                    continue
+                if not isinstance(record, dict):
+                    yield record, "Not a JSON object"
+                    continue
+                yield record, ""
+
+
+def resolve_template(name):
+    """Exact template name, or the first one containing `name` (case-insensitive)."""
+    if not name:
+        return DEFAULT_TEMPLATE
+    if name in TEMPLATES:
+        return name
+    for template_name in TEMPLATES:
+        if name.lower() in template_name.lower():
+            return template_name
+    raise ValueError(f"Unknown template: {name}")
+
+
+def output_name(index, record):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", record.get("name", "")).strip("_") or "resume"
+    return f"{index:05d}_{slug}_Resume.pdf"
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+def render_record(index, record, default_template):
+    """Process-pool entry point: (index, filename, pdf_bytes | None, error)."""
+    try:
+        template_name = resolve_template(record.get("template") or default_template)
+        return index, output_name(index, record), render_pdf(record, template_name), ""
+    except Exception as exc:
+        return index, "", None, f"{type(exc).__name__}: {exc}"
+
+
+# ── Optional AI enhancement ───────────────────────────────────────────────────
+def enhance_records(records, max_concurrency):
+    """Rewrite summaries and experience descriptions in place via Gemini."""
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    from utils.gemini_client import generate_many
+    from utils.prompts import experience_prompt, summary_prompt
+
+    config.get_config_options()   # parse now: parsing resets the log level from config
+    set_log_level("error")        # silence "missing ScriptRunContext" in bare mode
+
+    jobs = []   # (record, key, index-or-None, prompt)
+    for record in records:
+        role = record.get("target_role", "")
+        if record.get("summary") and role:
+            jobs.append((record, "summary", None, summary_prompt(record["summary"], role)))
+        for i, exp in enumerate(record.get("experience") or []):
+            if isinstance(exp, dict) and exp.get("description"):
+                prompt = experience_prompt(exp.get("role", ""), exp.get("company", ""), exp["description"], role)
+                jobs.append((record, "experience", i, prompt))
+    if not jobs:
+        return 0
+
+    results = generate_many(
+        [job[3] for job in jobs], max_concurrency=max_concurrency, feature="batch_enhance"
+    )
+    enhanced = 0
+    for (record, key, i, _), improved in zip(jobs, results):
+        if not improved:
+            continue
+        if key == "summary":
+            record["summary"] = improved
+        else:
+            record["experience"][i]["description"] = improved
+        enhanced += 1
+    return enhanced
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate resume PDFs in bulk.")
+    parser.add_argument("input", help="Resume records (.jsonl or .csv)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="Output directory for the PDFs")
+    target.add_argument("--zip", help="Output .zip file for the PDFs")
+    parser.add_argument("--template", default=DEFAULT_TEMPLATE,
+                        help="Default template (full name or part of it, e.g. 'purple')")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="Render processes (default: all cores)")
+    parser.add_argument("--enhance", action="store_true",
+                        help="Polish summaries/experience with Gemini (needs GEMINI_API_KEY)")
+    parser.add_argument("--ai-concurrency", type=int, default=4,
+                        help="Max concurrent Gemini calls when --enhance is set")
+    parser.add_argument("--failures",
+                        help="Write failed records (index, error, record) to this .jsonl file")
+    args = parser.parse_args(argv)
+
+    default_template = resolve_template(args.template)
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    archive = zipfile.ZipFile(args.zip, "w", zipfile.ZIP_DEFLATED) if args.zip else None
+    failures = open(args.failures, "w", encoding="utf-8") if args.failures else None
+
+    done = failed = enhanced = 0
+    started = time.perf_counter()
+
+    def report(index, filename, pdf_bytes, error, record):
+        nonlocal done, failed
+        if pdf_bytes is None:
+            failed += 1
+            print(f"✗ record {index}: {error}", file=sys.stderr)
+            if failures:
+                failures.write(json.dumps({"index": index, "error": error, "record": record}) + "\n")
+        elif archive:
+            archive.writestr(filename, pdf_bytes)
+        else:
+            with open(os.path.join(args.out, filename), "wb") as f:
+                f.write(pdf_bytes)
+        done += 1
+        if done % PROGRESS_EVERY == 0:
+            rate = done / (time.perf_counter() - started)
+            print(f"… {done} records ({failed} failed) — {rate:.1f} resumes/s", file=sys.stderr)
+
+    def collect(futures):
+        for future in futures:
+            report(*future.result(), in_flight.pop(future))
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            in_flight = {}          # future → record, for the failures file
+            for chunk in chunked(enumerate(read_records(args.input)), ENHANCE_CHUNK):
+                valid = [record for _, (record, error) in chunk if not error]
+                if args.enhance and valid:
+                    enhanced += enhance_records(valid, args.ai_concurrency)
+                for index, (record, error) in chunk:
+                    if error:
+                        report(index, "", None, error, record)
+                        continue
+                    if len(in_flight) >= args.workers * 4:
+                        finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(finished)
+                    future = pool.submit(render_record, index, record, default_template)
+                    in_flight[future] = record
+            collect(list(in_flight))
+    finally:
+        if archive:
+            archive.close()
+        if failures:
+            failures.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ {done - failed} PDFs generated, {failed} failed"
+        + (f", {enhanced} sections AI-enhanced" if args.enhance else "")
+        + f" in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.1f} resumes/s)",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
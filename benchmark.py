@@ -0,0 +1,378 @@
+"""
+benchmark.py — Performance Benchmarks
+=======================================
+Times the hot paths that changes to utils/pdf_generator.py and
+utils/gemini_client.py can slow down:
+- build_pdf across every template × small / typical / oversized resumes
+  (uncached render and cache hit)
+- re-rendering with the section layout cache warm, after a one-project edit,
+  and the builder's live preview (render + rasterize) for that edit
+- ResumePDF.body wrapping and safe_text on large inputs
+- local ATS scoring (utils/ats_scorer.py) and parsing Gemini's structured
+  ATS reply (utils/ats_analysis.py) on realistic resumes and JDs
+- prompt compaction (utils/prompt_prep.py) on a long, boilerplate-heavy input
+- generate / generate_many against a local fake Gemini client with
+  injected latency (no network, no API key)
+
+Usage:
+    python benchmark.py                                   # print results
+    python benchmark.py --save benchmarks/baseline.json   # store a baseline
+    python benchmark.py --compare benchmarks/baseline.json --threshold 0.15
+
+Compare mode exits with status 1 if any benchmark got slower than the
+baseline by more than the threshold (0.15 = 15%).
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from utils.pdf_generator import SAMPLE_RESUME, TEMPLATES, ResumePDF, build_pdf, render_pdf
+from utils.pdf_fonts import unicode_fonts_available
+from utils.pdf_preview import HAS_RASTERIZER
+
+
+DEFAULT_THRESHOLD = 0.15
+MIN_ROUND_SECONDS = 0.2      # each round repeats the call until it lasts this long
+ROUNDS = 5
+FAKE_LATENCY = 0.02          # seconds per fake Gemini call
+
+
+# ── Inputs ────────────────────────────────────────────────────────────────────
+SMALL_RESUME = {
+    "name": "Ravi Kumar",
+    "email": "ravi@gmail.com",
+    "phone": "+91 9000000000",
+    "summary": "B.Sc Computer Science graduate looking for an entry-level developer role.",
+    "education": [{"degree": "B.Sc Computer Science", "institution": "Osmania University",
+                   "year": "2021 – 2024", "grade": "7.9 / 10"}],
+    "experience": [],
+    "skills": "Python, SQL, HTML, CSS",
+}
+
+
+def oversized_resume():
+    """A resume far beyond one page: long summary, many jobs and projects."""
+    data = copy.deepcopy(SAMPLE_RESUME)
+    data["summary"] = " ".join([SAMPLE_RESUME["summary"]] * 8)
+    job = SAMPLE_RESUME["experience"][0]
+    data["experience"] = [
+        dict(job, role=f"{job['role']} {i + 1}",
+             description="\n".join([job["description"]] * 3))
+        for i in range(12)
+    ]
+    data["education"] = SAMPLE_RESUME["education"] * 3
+    data["projects"] = "\n".join([SAMPLE_RESUME["projects"]] * 10)
+    data["achievements"] = "\n".join([SAMPLE_RESUME["achievements"]] * 6)
+    data["extra"] = "\n".join([SAMPLE_RESUME["extra"]] * 6)
+    return data
+
+
+RESUME_SIZES = {
+    "small": SMALL_RESUME,
+    "typical": SAMPLE_RESUME,
+    "oversized": oversized_resume(),
+}
+
+LARGE_BODY = "\n".join(
+    [SAMPLE_RESUME["experience"][0]["description"], SAMPLE_RESUME["projects"],
+     SAMPLE_RESUME["summary"], "", SAMPLE_RESUME["extra"]] * 40
+)
+LARGE_TEXT = (
+    "Led “Project Atlas” — a 3‑tier ETL pipeline… cut costs by 40% – "
+    "‘on time’ • shipped ✓ "
+) * 4000
+
+LARGE_PASTE = "\n\n".join([
+    "About Us:\n" + "We are a fast-growing company that values innovation. " * 30,
+    "Responsibilities:\n" + LARGE_BODY[:6000],
+    "Requirements:\n" + "\n".join(f"- Skill {i}: Python, SQL, dashboards" for i in range(60)),
+    "Benefits & Perks\n" + "\n".join(f"- Perk number {i} for every employee" for i in range(40)),
+    "We are an equal opportunity employer. All qualified applicants will receive consideration.",
+])
+
+ATS_JD = """Data Analyst — Hyderabad (Full-time)
+
+About the role:
+We are looking for a Data Analyst to turn product and customer data into
+decisions. You will work with engineering, product and business teams.
+
+Responsibilities:
+- Build and maintain dashboards in Tableau or Power BI for weekly business reviews
+- Write SQL queries against large datasets and automate reporting with Python
+- Build churn and demand prediction models using scikit-learn or XGBoost
+- Run A/B tests and present findings to stakeholders
+- Clean, validate and document datasets used across teams
+
+Requirements:
+- B.Tech / B.Sc in Computer Science, Statistics or a related field
+- Strong SQL and Python (pandas, NumPy); experience with Tableau or Power BI
+- Knowledge of statistics, A/B testing and machine learning basics
+- Experience with Git and cloud data warehouses (BigQuery, Snowflake) is a plus
+- Good communication skills; able to present dashboards to stakeholders
+
+We are an equal opportunity employer.
+"""
+
+
+def resume_as_text(data):
+    """Plain text of a resume dict, as a pasted or extracted resume would read."""
+    parts = [data.get(k, "") for k in ("name", "email", "phone", "location", "summary")]
+    for edu in data.get("education", []):
+        parts.append(" ".join(edu.values()))
+    for exp in data.get("experience", []):
+        parts.append(" ".join(exp.values()))
+    parts += [data.get(k, "") for k in ("projects", "skills", "achievements", "extra")]
+    return "\n".join(p for p in parts if p)
+
+
+ATS_REPLIES = {
+    "full": {
+        "gaps": [f"No evidence of requirement {i} (e.g. Power BI, BigQuery)" for i in range(8)],
+        "strengths": [f"Quantified impact in project {i} with clear tooling" for i in range(5)],
+        "recommendations": [f"Add a bullet on A/B testing and stakeholder reporting ({i})" for i in range(7)],
+        "verdict": "Strong fit for an entry-level analyst role; apply after adding SQL depth. " * 3,
+    },
+    "malformed": {"gaps": "not a list", "strengths": [1, None, "Clear projects"],
+                  "recommendations": None, "verdict": 42},
+    "empty": None,
+}
+
+
+# ── Fake Gemini client ────────────────────────────────────────────────────────
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeModels:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def generate_content(self, model, contents, **kwargs):
+        time.sleep(self.latency)
+        return _FakeResponse(f"  Improved: {contents[:200]}  ")
+
+
+class _FakeAsyncModels(_FakeModels):
+    async def generate_content(self, model, contents, **kwargs):
+        await asyncio.sleep(self.latency)
+        return _FakeResponse(f"  Improved: {contents[:200]}  ")
+
+
+class _FakeAio:
+    def __init__(self, latency):
+        self.models = _FakeAsyncModels(latency)
+
+
+class FakeClient:
+    """Stands in for genai.Client: fixed latency, echoes the prompt."""
+
+    def __init__(self, latency=FAKE_LATENCY):
+        self.models = _FakeModels(latency)
+        self.aio = _FakeAio(latency)
+
+
+def install_fake_gemini(latency, cache_dir):
+    """Point utils.gemini_client at FakeClient, a throwaway cache and no rate limit."""
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    import utils.gemini_client as gemini_client
+    from utils.gemini_scheduler import GeminiScheduler
+    from utils.response_cache import ResponseCache
+
+    config.get_config_options()   # parse now: parsing resets the log level from config
+    set_log_level("error")        # silence "missing ScriptRunContext" in bare mode
+    client = FakeClient(latency)
+    cache = ResponseCache(os.path.join(cache_dir, "responses.sqlite3"))
+    scheduler = GeminiScheduler(rate_per_minute=1e9, burst=1_000_000, max_in_flight=1_000)
+    gemini_client.get_client = lambda: client
+    gemini_client.get_cache = lambda: cache
+    gemini_client.get_scheduler = lambda: scheduler   # no rate limit in benchmarks
+    return gemini_client
+
+
+# ── Timing ────────────────────────────────────────────────────────────────────
+def measure(fn, rounds=ROUNDS, min_round=MIN_ROUND_SECONDS):
+    """Seconds per call: median and min over `rounds` auto-sized rounds."""
+    fn()   # warm-up (imports, font parsing, glyph tables)
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_round or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_round / elapsed) + 1))
+
+    per_call = [elapsed / number]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - started) / number)
+    return {"median": statistics.median(per_call), "min": min(per_call), "calls": number}
+
+
+def body_benchmark():
+    pdf = ResumePDF(TEMPLATES["🎯 Classic Professional"], cache_layouts=False)
+    pdf.add_page()
+    pdf.body(LARGE_BODY)
+
+
+def one_edit(render):
+    """fn that changes one project line per call, then calls render(data)."""
+    data = copy.deepcopy(SAMPLE_RESUME)
+    counter = iter(range(10**9))
+
+    def fn():
+        data["projects"] = f"{SAMPLE_RESUME['projects']} (rev {next(counter)})"
+        return render(data)
+    return fn
+
+
+def collect_benchmarks(latency, cache_dir):
+    """[(name, fn)] in a stable order."""
+    benchmarks = []
+    for size, data in RESUME_SIZES.items():
+        for template_name in TEMPLATES:
+            label = template_name.split(" ", 1)[1].lower().replace(" ", "_")
+            benchmarks.append((f"render_pdf/{size}/{label}",
+                               lambda d=data, t=template_name: render_pdf(d, t, cache_layouts=False)))
+        benchmarks.append((f"render_pdf_layout_cached/{size}",
+                           lambda d=data: render_pdf(d, "🎯 Classic Professional")))
+        benchmarks.append((f"build_pdf_cached/{size}",
+                           lambda d=data: build_pdf(d, "🎯 Classic Professional")))
+
+    benchmarks.append(("render_pdf_one_edit/typical",
+                       one_edit(lambda d: render_pdf(d, "🎯 Classic Professional"))))
+    if HAS_RASTERIZER:
+        from utils.pdf_preview import render_pages
+        benchmarks.append(("preview_one_edit/typical",
+                           one_edit(lambda d: render_pages(d, "🎯 Classic Professional"))))
+
+    benchmarks.append(("pdf_body/large", body_benchmark))
+    helvetica = ResumePDF(TEMPLATES["🎯 Classic Professional"])
+    helvetica.unicode = False     # measure the latin-1 path even if fonts are installed
+    benchmarks.append(("safe_text/large", lambda: helvetica.safe_text(LARGE_TEXT)))
+
+    from utils.prompt_prep import prepare
+    benchmarks.append(("prompt_prep/large", lambda: prepare(LARGE_PASTE)))
+
+    from utils.ats_analysis import parse_analysis
+    from utils.ats_scorer import score_resume
+    for size, data in RESUME_SIZES.items():
+        text = resume_as_text(data)
+        benchmarks.append((f"ats_score/{size}", lambda r=text: score_resume(r, ATS_JD)))
+    typical = resume_as_text(SAMPLE_RESUME)
+    benchmarks.append(("ats_score/long_jd", lambda: score_resume(typical, LARGE_PASTE)))
+    local = score_resume(typical, ATS_JD)
+    for name, reply in ATS_REPLIES.items():
+        benchmarks.append((f"parse_analysis/{name}", lambda r=reply: parse_analysis(local, r)))
+
+    gemini = install_fake_gemini(latency, cache_dir)
+    prompts = [f"Rewrite experience bullet {i} for a Data Analyst role." for i in range(8)]
+    benchmarks.append(("generate/uncached",
+                       lambda: gemini.generate(prompts[0], use_cache=False)))
+    benchmarks.append(("generate/cache_hit", lambda: gemini.generate(prompts[0])))
+    benchmarks.append(("generate_many/8_uncached",
+                       lambda: gemini.generate_many(prompts, use_cache=False)))
+    return benchmarks
+
+
+def run(only=None, latency=FAKE_LATENCY, rounds=ROUNDS):
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, fn in collect_benchmarks(latency, cache_dir):
+            if only and not any(o in name for o in only):
+                continue
+            results[name] = measure(fn, rounds=rounds)
+            print(f"{name:<45} {format_seconds(results[name]['median']):>10}", file=sys.stderr)
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "unicode_fonts": unicode_fonts_available(),
+            "fake_latency": latency,
+        },
+        "results": results,
+    }
+
+
+# ── Baselines ─────────────────────────────────────────────────────────────────
+def format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def compare(current, baseline, threshold):
+    """Print a comparison table; return the names that regressed."""
+    if current["environment"] != baseline.get("environment"):
+        print("⚠️ Environment differs from the baseline; timings may not be comparable.")
+    regressions = []
+    print(f"{'benchmark':<45} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<45} {'—':>10} {format_seconds(result['median']):>10} {'new':>8}")
+            continue
+        change = result["median"] / before["median"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  ✗ REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  ✓ faster"
+        print(f"{name:<45} {format_seconds(before['median']):>10} "
+              f"{format_seconds(result['median']):>10} {change:>+8.1%}{flag}")
+    return regressions
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PDF rendering, prompt compaction and Gemini calls.")
+    parser.add_argument("--save", help="Write results to this JSON baseline file")
+    parser.add_argument("--compare", help="Compare against this JSON baseline file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before flagging a regression (0.15 = 15%%)")
+    parser.add_argument("--only", action="append",
+                        help="Run only benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--latency", type=float, default=FAKE_LATENCY,
+                        help="Injected fake Gemini latency in seconds")
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    args = parser.parse_args(argv)
+
+    current = run(args.only, args.latency, args.rounds)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"Saved {len(current['results'])} results to {args.save}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} benchmark(s) slower than the baseline by "
+                  f"more than {args.threshold:.0%}")
+            return 1
+        print(f"\n✅ No regressions above {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,14 @@ Project: SmartResumeAI — AI-Powered Resume Builder for Students & Freshers
 Powered by: Google Gemini API + Streamlit
 """
 
+import importlib
+import os
+
 import streamlit as st
 
+from utils.profiling import profile_rerun, profiling_requested
+from utils.rerun_timing import phase, time_rerun
+
 st.set_page_config(
     page_title="SmartResumeAI",
     page_icon="🎓",
@@ -39,6 +45,10 @@ def sidebar():
         "📖  How It Works": "guide",
     }
 
+    from views.admin_metrics import admin_enabled, show_sidebar_panel
+    if admin_enabled():
+        pages["🩺  Diagnostics"] = "diagnostics"
+
     st.sidebar.markdown("### 📌 Navigation")
     selection = st.sidebar.radio("", list(pages.keys()), label_visibility="collapsed")
 
@@ -56,27 +66,61 @@ def sidebar():
         unsafe_allow_html=True,
     )
 
+    show_sidebar_panel()
+
     return pages[selection]
 
 
+# ── Startup ───────────────────────────────────────────────────────────────────
+@st.cache_resource(show_spinner=False)
+def start_warmup():
+    """Preload the Gemini SDK, fonts and template samples in the background."""
+    from utils.startup import start_background_warmup
+    start_background_warmup()
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_endpoint():
+    """Serve Gemini metrics for Prometheus if SMARTRESUME_METRICS_PORT is set."""
+    port = os.environ.get("SMARTRESUME_METRICS_PORT")
+    if port:
+        from utils.llm_metrics import start_metrics_server
+        start_metrics_server(int(port))
+
+
 # ── Router ────────────────────────────────────────────────────────────────────
+VIEWS = {
+    "home": "views.home",
+    "builder": "views.builder",
+    "templates": "views.templates",
+    "cover_letter": "views.cover_letter",
+    "ats": "views.ats_checker",
+    "linkedin": "views.linkedin_summary",
+    "guide": "views.guide",
+    "diagnostics": "views.diagnostics",
+}
+
+
 def main():
-    page = sidebar()
-
-    if page == "home":
-        from views.home import show; show()
-    elif page == "builder":
-        from views.builder import show; show()
-    elif page == "templates":
-        from views.templates import show; show()
-    elif page == "cover_letter":
-        from views.cover_letter import show; show()
-    elif page == "ats":
-        from views.ats_checker import show; show()
-    elif page == "linkedin":
-        from views.linkedin_summary import show; show()
-    elif page == "guide":
-        from views.guide import show; show()
+    start_warmup()
+    start_metrics_endpoint()
+
+    from views.admin_metrics import admin_enabled
+    profile_requested = profiling_requested(st.query_params, admin_enabled())
+    with profile_rerun(profile_requested) as profile:
+        page = sidebar()
+        if profile is not None:
+            profile.page = page
+
+        # Time every page rerun: import vs widgets vs Gemini vs PDF rendering
+        with time_rerun(page):
+            with phase("import"):
+                view = importlib.import_module(VIEWS[page])
+            view.show()
+
+    if profile is not None:
+        from views.diagnostics import show_profile_report
+        show_profile_report(profile)
 
 
 if __name__ == "__main__":
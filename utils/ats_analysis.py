@@ -0,0 +1,118 @@
+"""
+utils/ats_analysis.py — Structured ATS Analysis
+=================================================
+Typed result for the ATS checker and the JSON schema Gemini must answer in.
+- Score, matched and missing keywords come from the local keyword scan
+  (utils/ats_scorer.py); Gemini only returns gaps, strengths,
+  recommendations and a verdict, constrained by RESPONSE_SCHEMA
+- The reply is parsed straight into an ATSAnalysis — no regex recovery of
+  a free-text "EXACT format" that breaks when the model drifts
+- The .txt and .json downloads are generated from the same structured data
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+
+from utils.ats_scorer import ATSResult
+
+
+MAX_OUTPUT_TOKENS = 2048      # ceiling for the JSON reply (~400 tokens typical)
+MAX_GAPS = 5
+MAX_STRENGTHS = 3
+MAX_RECOMMENDATIONS = 5
+
+RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "gaps": {
+            "type": "ARRAY",
+            "items": {"type": "STRING"},
+            "max_items": MAX_GAPS,
+            "description": "Requirements of the role the resume does not show, one short phrase each",
+        },
+        "strengths": {
+            "type": "ARRAY",
+            "items": {"type": "STRING"},
+            "max_items": MAX_STRENGTHS,
+            "description": "Things the resume does well for this role, one sentence each",
+        },
+        "recommendations": {
+            "type": "ARRAY",
+            "items": {"type": "STRING"},
+            "max_items": MAX_RECOMMENDATIONS,
+            "description": "Specific, actionable changes to the resume, most important first",
+        },
+        "verdict": {
+            "type": "STRING",
+            "description": "One honest paragraph: should they apply, and what are their chances?",
+        },
+    },
+    "required": ["gaps", "strengths", "recommendations", "verdict"],
+    "property_ordering": ["gaps", "strengths", "recommendations", "verdict"],
+}
+
+
+@dataclass
+class ATSAnalysis:
+    score: int
+    matched: list = field(default_factory=list)
+    missing: list = field(default_factory=list)
+    gaps: list = field(default_factory=list)
+    strengths: list = field(default_factory=list)
+    recommendations: list = field(default_factory=list)
+    verdict: str = ""
+
+    @property
+    def has_advice(self):
+        return bool(self.gaps or self.strengths or self.recommendations or self.verdict)
+
+
+def _strings(value, limit):
+    if not isinstance(value, list):
+        return []
+    return [v.strip() for v in value if isinstance(v, str) and v.strip()][:limit]
+
+
+def parse_analysis(local: ATSResult, reply) -> ATSAnalysis:
+    """
+    Combine the local keyword scan with Gemini's JSON reply (a dict, or None
+    when the call returned nothing usable). Fields of the wrong type are
+    dropped rather than failing the whole analysis.
+    """
+    reply = reply if isinstance(reply, dict) else {}
+    verdict = reply.get("verdict")
+    return ATSAnalysis(
+        score=local.score,
+        matched=list(local.matched),
+        missing=list(local.missing),
+        gaps=_strings(reply.get("gaps"), MAX_GAPS),
+        strengths=_strings(reply.get("strengths"), MAX_STRENGTHS),
+        recommendations=_strings(reply.get("recommendations"), MAX_RECOMMENDATIONS),
+        verdict=verdict.strip() if isinstance(verdict, str) else "",
+    )
+
+
+def format_text_report(analysis: ATSAnalysis) -> str:
+    """Plain-text report for the .txt download."""
+    def bullets(items, empty="(none)"):
+        return "\n".join(f"• {i}" for i in items) or f"• {empty}"
+
+    sections = [
+        f"ATS MATCH SCORE: {analysis.score}/100",
+        f"MATCHED KEYWORDS:\n{bullets(analysis.matched)}",
+        f"MISSING KEYWORDS:\n{bullets(analysis.missing)}",
+    ]
+    if analysis.gaps:
+        sections.append(f"GAPS:\n{bullets(analysis.gaps)}")
+    if analysis.strengths:
+        sections.append(f"STRENGTHS:\n{bullets(analysis.strengths)}")
+    if analysis.recommendations:
+        numbered = "\n".join(f"{n}. {r}" for n, r in enumerate(analysis.recommendations, 1))
+        sections.append(f"RECOMMENDATIONS:\n{numbered}")
+    if analysis.verdict:
+        sections.append(f"VERDICT:\n{analysis.verdict}")
+    return "\n\n".join(sections)
+
+
+def format_json_report(analysis: ATSAnalysis) -> str:
+    return json.dumps(asdict(analysis), ensure_ascii=False, indent=2)
@@ -0,0 +1,157 @@
+"""
+utils/ats_scorer.py — Local ATS Keyword Scoring
+=================================================
+Deterministic, offline replacement for asking Gemini for a match score.
+1. Tokenize resume + job description (keeps tech tokens like c++, c#, node.js)
+2. Extract 1-3 word keywords from the JD alone, weighted by TF-IDF (IDF from
+   a JD corpus when there is one, else over the JD's own sentences and lines)
+3. Score = weighted share of JD keywords that also appear in the resume
+Runs in milliseconds and gives the same score for the same input every time.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+
+STOPWORDS = frozenset("""
+a about above across after again against all almost also am an and any are as at
+be because been before being below between both but by can could did do does doing
+done down during each either etc even ever every few for from further get gets getting
+had has have having he her here hers him his how however i if in into is it its itself
+just least less let like made make makes many may me might more most much must my
+no nor not now of off often on once one only or other our ours out over own per
+please rather same shall she should since so some such than that the their theirs them
+then there these they this those through thus to too under until up upon us use used
+using very via was we well were what when where whether which while who whom whose why
+will with within without would yet you your yours
+""".split())
+
+# Job-description filler: common in every JD, says nothing about fit.
+JD_FILLER = frozenset("""
+ability able apply applicant applicants candidate candidates company day days degree
+description desired environment excellent experience experienced good great ideal
+include including job join knowledge looking new opportunity plus position preferred
+professional qualification qualifications related required requirement requirements
+responsibilities responsibility role seeking skill skills strong team teams understanding
+work working year years etc e.g i.e
+""".split())
+
+# Words that merely look plural — never strip their trailing 's'.
+NO_STEM = frozenset("""
+analytics aws devops economics graphics ios kubernetes mathematics physics
+sales statistics windows
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+SENTENCE_RE = re.compile(r"(?<=[.!?;:])\s+|\n+")
+TOP_KEYWORDS = 40
+MAX_NGRAM = 3
+
+
+def normalize_token(token):
+    """Light, deterministic normalization: trim punctuation and plural 's'."""
+    token = token.rstrip(".")
+    if token in NO_STEM:
+        return token
+    if token.isalpha() and len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [t for t in (normalize_token(m) for m in TOKEN_RE.findall(text.lower())) if t]
+
+
+def _is_content(token):
+    return token not in STOPWORDS and token not in JD_FILLER and not token.isdigit()
+
+
+def ngrams(tokens, max_n=MAX_NGRAM):
+    """All 1..max_n grams made only of content tokens (stopwords break phrases)."""
+    counts = Counter()
+    for n in range(1, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            gram = tokens[i:i + n]
+            if all(_is_content(t) for t in gram):
+                counts[" ".join(gram)] += 1
+    return counts
+
+
+def sentence_idf(jd_text):
+    """
+    Smoothed IDF over the sentences and bullet lines of one JD, for when no
+    corpus is available: a term spread over every line (the company name,
+    boilerplate) weighs less than one named in a few specific requirements.
+    """
+    sentences = [s for s in SENTENCE_RE.split(jd_text) if s.strip()]
+    df = Counter()
+    for sentence in sentences:
+        df.update(set(ngrams(tokenize(sentence))))
+    n = len(sentences)
+    return {gram: math.log((n + 1) / (count + 1)) + 1.0 for gram, count in df.items()}
+
+
+@dataclass
+class ATSResult:
+    score: int
+    matched: list = field(default_factory=list)
+    missing: list = field(default_factory=list)
+    weights: dict = field(default_factory=dict)
+
+
+def extract_keywords(jd_text, idf=None, top_k=TOP_KEYWORDS):
+    """
+    Rank JD keywords by TF-IDF. `idf` maps keyword → inverse document
+    frequency (e.g. from a JD corpus; unknown keywords default to 1.0) and
+    defaults to sentence_idf(jd_text). The keywords depend on the JD only.
+    Multi-word phrases are only kept when repeated in the JD, so incidental
+    word pairs don't flood the list. A keyword that only ever occurs inside
+    a kept phrase is folded into that phrase.
+    """
+    jd_grams = ngrams(tokenize(jd_text))
+    if idf is None:
+        idf = sentence_idf(jd_text)
+    candidates = {}
+    for gram, tf in jd_grams.items():
+        n = gram.count(" ") + 1
+        if n > 1 and tf < 2:
+            continue
+        if n == 1 and len(gram) < 2 and gram not in ("c", "r"):
+            continue
+        candidates[gram] = tf
+
+    phrases = [g for g in candidates if " " in g]
+    weights = {}
+    for gram, tf in candidates.items():
+        padded = f" {gram} "
+        if any(
+            p != gram and padded in f" {p} " and candidates[p] >= tf
+            for p in phrases
+        ):
+            continue
+        n = gram.count(" ") + 1
+        phrase_boost = 1.0 + 0.5 * (n - 1)
+        weights[gram] = (1.0 + math.log(tf)) * idf.get(gram, 1.0) * phrase_boost
+    ranked = sorted(weights.items(), key=lambda kv: (-kv[1], kv[0]))[:top_k]
+    return dict(ranked)
+
+
+def score_resume(resume_text, jd_text, idf=None, top_k=TOP_KEYWORDS) -> ATSResult:
+    """Score a resume against a job description without any network call."""
+    resume_grams = ngrams(tokenize(resume_text))
+    keywords = extract_keywords(jd_text, idf=idf, top_k=top_k)
+    if not keywords:
+        return ATSResult(score=0)
+
+    matched = [k for k in keywords if k in resume_grams]
+    missing = [k for k in keywords if k not in resume_grams]
+    total = sum(keywords.values())
+    hit = sum(keywords[k] for k in matched)
+    return ATSResult(
+        score=round(100 * hit / total),
+        matched=matched,
+        missing=missing,
+        weights=keywords,
+    )
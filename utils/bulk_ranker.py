@@ -0,0 +1,104 @@
+"""
+utils/bulk_ranker.py — Rank Many Resumes Against One Job Description
+=====================================================================
+Recruiter flow: a zip of resume PDFs is scored against one JD locally.
+- Archive members are read one at a time and handed to a process pool,
+  with a bounded number in flight, so the whole zip is never in memory.
+- Workers are spawned, not forked: forking the multi-threaded Streamlit
+  server can copy a lock held by another thread and hang the child.
+- Candidates are named by their full path in the zip, so same-name files
+  in different folders stay apart.
+- Each worker extracts the text and scores it with utils.ats_scorer.
+- No Gemini calls happen here; the UI calls Gemini only for a shortlist.
+"""
+
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+
+from utils.ats_scorer import score_resume
+from utils.resume_text import extract_text
+
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+MAX_MEMBER_BYTES = 10 * 1024 * 1024   # skip anything larger than 10 MB
+
+
+@dataclass
+class CandidateScore:
+    filename: str
+    score: int = 0
+    matched: list = field(default_factory=list)
+    missing: list = field(default_factory=list)
+    text: str = ""
+    error: str = ""
+
+
+def score_file(filename, data, jd_text):
+    """Worker entry point — must stay at module level so it can be pickled."""
+    try:
+        text = extract_text(filename, data)
+        if not text:
+            return CandidateScore(filename, error="No extractable text (scanned PDF?)")
+        result = score_resume(text, jd_text)
+        return CandidateScore(filename, result.score, result.matched, result.missing, text)
+    except Exception as exc:
+        return CandidateScore(filename, error=f"{type(exc).__name__}: {exc}")
+
+
+def resume_members(archive):
+    """Resume entries of an open ZipFile, skipping folders and macOS metadata."""
+    return [
+        info for info in archive.infolist()
+        if not info.is_dir()
+        and info.filename.lower().endswith(RESUME_EXTENSIONS)
+        and not os.path.basename(info.filename).startswith(("._", "."))
+        and "__MACOSX/" not in info.filename
+    ]
+
+
+def rank_archive(zip_file, jd_text, max_workers=None, progress=None):
+    """
+    Score every resume in `zip_file` (path or file-like) against `jd_text`.
+    `progress(done, total)` is called as results come in.
+    Returns CandidateScores sorted best-first (failures last).
+    """
+    max_workers = max_workers or os.cpu_count() or 2
+    max_in_flight = max_workers * 2
+    results = []
+
+    with zipfile.ZipFile(zip_file) as archive:
+        members = resume_members(archive)
+        total = len(members)
+        if progress:
+            progress(0, total)
+
+        if not members:
+            return results
+        pool = ProcessPoolExecutor(
+            max_workers=min(max_workers, len(members)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        with pool:
+            in_flight = set()
+            for info in members:
+                name = info.filename
+                if info.file_size > MAX_MEMBER_BYTES:
+                    results.append(CandidateScore(name, error="File too large"))
+                    continue
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    results.extend(f.result() for f in done)
+                    if progress:
+                        progress(len(results), total)
+                in_flight.add(pool.submit(score_file, name, archive.read(info), jd_text))
+
+            for future in as_completed(in_flight):
+                results.append(future.result())
+                if progress:
+                    progress(len(results), total)
+
+    results.sort(key=lambda c: (bool(c.error), -c.score, c.filename))
+    return results
@@ -0,0 +1,231 @@
+"""
+utils/draft_store.py — Persistent Resume Builder Drafts
+=========================================================
+SQLite-backed store for resume builder drafts, keyed by a per-user draft
+token (kept in the page URL), so a browser refresh, a dropped websocket or a
+server restart does not lose what the user typed — or the AI-enhanced text
+they already paid a Gemini call for.
+
+Writes are write-behind: save() only keeps the latest draft per token in
+memory, and a background thread writes all pending drafts in one transaction
+every FLUSH_SECONDS. Unchanged drafts are never rewritten. Loading a draft is
+a single primary-key lookup. Drafts not touched for TTL_DAYS are deleted and
+the oldest ones are evicted beyond MAX_DRAFTS; freed pages are returned to
+the file system (incremental vacuum).
+
+Tokens are issued by the store and signed with a per-installation secret
+(HMAC), and only tokens that verify are accepted, so a crafted ?draft= link
+cannot plant a token of the sender's choosing.
+"""
+
+import atexit
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+from utils.response_cache import DEFAULT_CACHE_DIR
+
+
+FLUSH_SECONDS = float(os.environ.get("SMARTRESUME_DRAFT_FLUSH_SECONDS", "2"))
+TTL_DAYS = float(os.environ.get("SMARTRESUME_DRAFT_TTL_DAYS", "30"))
+MAX_DRAFTS = 20_000
+COMPACT_INTERVAL_SECONDS = 60 * 60
+TOKEN_SECRET = os.environ.get("SMARTRESUME_DRAFT_SECRET", "")   # default: generated per store
+
+logger = logging.getLogger("smartresume.drafts")
+
+
+class DraftStore:
+    def __init__(
+        self,
+        path=None,
+        flush_seconds=FLUSH_SECONDS,
+        ttl_seconds=TTL_DAYS * 24 * 60 * 60,
+        max_drafts=MAX_DRAFTS,
+    ):
+        if path is None:
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_CACHE_DIR, "drafts.sqlite3")
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.ttl_seconds = ttl_seconds
+        self.max_drafts = max_drafts
+        self.writes = 0                   # drafts written to disk
+        self.skipped = 0                  # saves dropped because nothing changed
+        self._pending = {}                # token → (json, saved_at), not yet on disk
+        self._written = {}                # token → json last written (for change detection)
+        self._lock = threading.Lock()     # guards _pending / _written / counters
+        self._db_lock = threading.Lock()  # serialises use of the connection
+        self._flusher = None
+        self._last_compact = 0.0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")   # only applies to new files
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS drafts (
+                token       TEXT PRIMARY KEY,
+                data        TEXT NOT NULL,
+                size        INTEGER NOT NULL,
+                updated_at  REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_drafts_updated ON drafts (updated_at)")
+        self._secret = self._load_secret()
+        self.compact()
+        atexit.register(self.flush)
+
+    # ── Tokens ────────────────────────────────────────────────────────────────
+    def _load_secret(self) -> bytes:
+        if TOKEN_SECRET:
+            return TOKEN_SECRET.encode("utf-8")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute(
+            "INSERT OR IGNORE INTO settings (name, value) VALUES ('token_secret', ?)",
+            (secrets.token_hex(32),),
+        )
+        (value,) = self._conn.execute("SELECT value FROM settings WHERE name = 'token_secret'").fetchone()
+        return value.encode("utf-8")
+
+    def _signature(self, draft_id: str) -> str:
+        digest = hmac.new(self._secret, draft_id.encode("utf-8"), hashlib.sha256).digest()[:16]
+        return base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+    def issue_token(self) -> str:
+        """A new draft token: random id + signature."""
+        draft_id = secrets.token_urlsafe(18)
+        return f"{draft_id}.{self._signature(draft_id)}"
+
+    def is_valid_token(self, token: str) -> bool:
+        """True only for tokens this store issued."""
+        draft_id, _, signature = (token or "").partition(".")
+        return bool(draft_id) and len(token) <= 64 and hmac.compare_digest(
+            signature, self._signature(draft_id)
+        )
+
+    # ── Reads / writes ────────────────────────────────────────────────────────
+    def load(self, token: str):
+        """The latest draft for `token` (pending or on disk), or None."""
+        with self._lock:
+            pending = self._pending.get(token)
+        if pending is not None:
+            return json.loads(pending[0])
+        with self._db_lock:
+            row = self._conn.execute("SELECT data FROM drafts WHERE token = ?", (token,)).fetchone()
+        if row is None:
+            return None
+        with self._lock:
+            self._written[token] = row[0]
+        return json.loads(row[0])
+
+    def save(self, token: str, draft: dict):
+        """Queue `draft` for writing; cheap enough to call on every rerun."""
+        data = json.dumps(draft, ensure_ascii=False, sort_keys=True)
+        with self._lock:
+            latest = self._pending.get(token, (self._written.get(token),))[0]
+            if data == latest:
+                self.skipped += 1
+                return
+            self._pending[token] = (data, time.time())
+        self._ensure_flusher()
+
+    def delete(self, token: str):
+        with self._lock:
+            self._pending.pop(token, None)
+            self._written.pop(token, None)
+        with self._db_lock:
+            self._conn.execute("DELETE FROM drafts WHERE token = ?", (token,))
+
+    def flush(self):
+        """
+        Write every pending draft in one transaction. The connection lock is
+        held from taking the pending drafts until they are written, so a
+        concurrent delete() cannot be undone by this flush.
+        """
+        with self._db_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            rows = [(token, data, len(data.encode("utf-8")), saved_at)
+                    for token, (data, saved_at) in pending.items()]
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO drafts (token, data, size, updated_at) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                with self._lock:   # retry next time, unless a newer save replaced them
+                    for token, entry in pending.items():
+                        self._pending.setdefault(token, entry)
+                raise
+            with self._lock:
+                for token, data, _, _ in rows:
+                    self._written[token] = data
+                if len(self._written) > self.max_drafts:
+                    self._written.clear()    # only an optimisation; reloads on demand
+                self.writes += len(rows)
+        return len(rows)
+
+    # ── Background flushing ───────────────────────────────────────────────────
+    def _ensure_flusher(self):
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="draft-flush")
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+                if time.time() - self._last_compact > COMPACT_INTERVAL_SECONDS:
+                    self.compact()
+            except Exception as exc:   # keep the thread alive; drafts stay pending
+                logger.warning("Saving drafts failed: %s", exc)
+
+    # ── Compaction ────────────────────────────────────────────────────────────
+    def compact(self):
+        """Delete stale drafts, evict the oldest over the limit, reclaim space."""
+        now = time.time()
+        with self._db_lock:
+            if self.ttl_seconds:
+                self._conn.execute("DELETE FROM drafts WHERE updated_at < ?", (now - self.ttl_seconds,))
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM drafts").fetchone()
+            if count > self.max_drafts:
+                self._conn.execute(
+                    "DELETE FROM drafts WHERE token IN "
+                    "(SELECT token FROM drafts ORDER BY updated_at ASC LIMIT ?)",
+                    (count - self.max_drafts,),
+                )
+            self._conn.execute("PRAGMA incremental_vacuum").fetchall()
+        self._last_compact = now
+
+    def stats(self) -> dict:
+        with self._db_lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM drafts"
+            ).fetchone()
+        with self._lock:
+            return {
+                "drafts": count,
+                "bytes": total,
+                "pending": len(self._pending),
+                "writes": self.writes,
+                "skipped": self.skipped,
+            }
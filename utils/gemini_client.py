@@ -1,5 +1,24 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
 import streamlit as st
-from google import genai
+
+from utils import llm_metrics
+from utils.gemini_scheduler import (
+    MAX_RETRIES, WAIT_POLL_SECONDS, GeminiScheduler, backoff_delay, is_retryable, priority_for,
+)
+from utils.rerun_timing import phase
+from utils.response_cache import ResponseCache, cache_key
+
+
+MODEL_NAME = "gemini-flash-latest"
+MAX_CONCURRENCY = 4
+DEFAULT_FEATURE = "other"      # metrics tag when the caller gives none
 
 
 @st.cache_resource
@@ -7,6 +26,9 @@ def get_client():
     try:
         api_key = st.secrets["GEMINI_API_KEY"]
     except Exception:
+        # Headless use (e.g. batch_generate.py) reads the key from the environment
+        api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
         st.sidebar.markdown("---")
         api_key = st.sidebar.text_input(
             "🔑 Gemini API Key",
@@ -18,14 +40,549 @@ def get_client():
             st.warning("⚠️ Please enter your Gemini API key in the sidebar.")
             st.stop()
 
+    from google import genai   # deferred: the SDK is slow to import
     return genai.Client(api_key=api_key)
 
 
-def generate(prompt: str, spinner_text: str = "🤖 Generating with Gemini AI...") -> str:
+@st.cache_resource
+def get_cache():
+    """Process-wide response cache shared by every session."""
+    return ResponseCache()
+
+
+@st.cache_resource
+def get_scheduler():
+    """Process-wide rate limiter / fair queue in front of every Gemini call."""
+    return GeminiScheduler()
+
+
+# ── Scheduling ────────────────────────────────────────────────────────────────
+def session_id():
+    """The calling Streamlit session, or one shared id for headless use."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "headless"
+
+
+def queue_message(position, eta):
+    return (
+        f"⏳ Lots of students are using SmartResumeAI right now — you're "
+        f"**#{position}** in the queue (about {max(1, eta)}s)."
+    )
+
+
+@contextmanager
+def queued(feature):
+    """Wait for a scheduler slot (showing the queue position), hold it, release it."""
+    placeholder = None
+
+    def on_wait(position, eta):
+        nonlocal placeholder
+        if placeholder is None:
+            placeholder = st.empty()
+        placeholder.info(queue_message(position, eta))
+
+    scheduler = get_scheduler()
+    ticket = scheduler.acquire(session_id(), priority_for(feature), on_wait)
+    if placeholder is not None:
+        placeholder.empty()
+    try:
+        yield scheduler
+    finally:
+        scheduler.release(ticket)
+
+
+def call_with_retries(scheduler, feature, call):
+    """Run `call()`, retrying 429 / 5xx errors with jittered exponential backoff."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return call()
+        except Exception as exc:
+            if attempt == MAX_RETRIES or not is_retryable(exc):
+                raise
+            llm_metrics.record_retry(feature)
+            time.sleep(backoff_delay(attempt))
+            scheduler.wait_for_token()
+
+
+def _generate_content(prompt, feature, spinner_text, **kwargs) -> str:
+    """One scheduled, retried and metered generate_content call."""
     client = get_client()
-    with st.spinner(spinner_text):
-        response = client.models.generate_content(
-            model="gemini-flash-latest",
-            contents=prompt
+    with phase("gemini"), queued(feature) as scheduler:
+        started = time.perf_counter()
+        try:
+            with st.spinner(spinner_text):
+                response = call_with_retries(scheduler, feature, lambda: client.models.generate_content(
+                    model=MODEL_NAME,
+                    contents=prompt,
+                    **kwargs,
+                ))
+            text = response.text.strip()
+        except Exception:
+            llm_metrics.record_call(feature, time.perf_counter() - started, prompt, error=True)
+            raise
+        llm_metrics.record_call(feature, time.perf_counter() - started, prompt, text, response)
+    return text
+
+
+# ── Single-flight ─────────────────────────────────────────────────────────────
+_in_flight = {}                 # cache_key → Future of the call currently running
+_in_flight_lock = threading.Lock()
+_ABANDONED = object()           # leader stopped by a rerun / st.stop, not an error
+
+
+def _join(key):
+    """(future, leader): the in-flight Future for `key`, created if there is none."""
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        if future is not None:
+            return future, False
+        future = _in_flight[key] = Future()
+        return future, True
+
+
+def _leave(key):
+    with _in_flight_lock:
+        _in_flight.pop(key, None)
+
+
+def single_flight(key, feature, spinner_text, call):
+    """
+    Run `call()` once per key at a time: concurrent callers with the same key
+    (double clicks, a classroom running the same ATS check) wait for the
+    in-flight call and all receive its result — or its exception. The
+    streaming and batch paths (generate_stream, generate_many) join the same
+    in-flight calls.
+    """
+    future, leader = _join(key)
+    if not leader:
+        with phase("gemini"), st.spinner(spinner_text):
+            result = future.result()
+        if result is not _ABANDONED:
+            llm_metrics.record_coalesced(feature)
+            return result
+        return call()
+
+    try:
+        result = call()
+    except Exception as exc:
+        future.set_exception(exc)
+        raise
+    except BaseException:
+        future.set_result(_ABANDONED)   # followers make their own call
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _leave(key)
+
+
+def generate_in_background(client, cache, scheduler, session, prompt, feature, claim) -> bool:
+    """
+    Headless generate() for worker threads (no Streamlit calls): answer
+    `prompt` into the response cache so a later generate() is a cache hit.
+    `claim()` is asked right before the API call and may veto it (input
+    changed, quota spent). A foreground call for the same prompt that
+    arrives meanwhile waits for this one instead of calling again.
+    Returns True if an API call was made.
+    """
+    key = cache_key(MODEL_NAME, prompt)
+    if cache.get(MODEL_NAME, prompt) is not None:
+        return False
+    ticket = scheduler.acquire(session, priority_for(feature))
+    try:
+        if cache.get(MODEL_NAME, prompt) is not None:   # answered while queued
+            return False
+        with _in_flight_lock:
+            if key in _in_flight or not claim():
+                return False
+            future = _in_flight[key] = Future()
+        started = time.perf_counter()
+        try:
+            response = call_with_retries(scheduler, feature, lambda: client.models.generate_content(
+                model=MODEL_NAME,
+                contents=prompt,
+            ))
+            text = response.text.strip()
+        except Exception:
+            llm_metrics.record_call(feature, time.perf_counter() - started, prompt, error=True)
+            text = _ABANDONED                # a waiting click makes its own call
+        else:
+            llm_metrics.record_call(feature, time.perf_counter() - started, prompt, text, response)
+            if text:
+                cache.put(MODEL_NAME, prompt, text)
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+        future.set_result(text)
+        return True
+    finally:
+        scheduler.release(ticket)
+
+
+def generate(
+    prompt: str,
+    spinner_text: str = "🤖 Generating with Gemini AI...",
+    use_cache: bool = True,
+    feature: str = DEFAULT_FEATURE,
+) -> str:
+    cache = get_cache()
+    if use_cache:
+        cached = cache.get(MODEL_NAME, prompt)
+        if cached is not None:
+            llm_metrics.record_cache_hit(feature)
+            return cached
+
+    text = single_flight(
+        cache_key(MODEL_NAME, prompt), feature, spinner_text,
+        lambda: _generate_content(prompt, feature, spinner_text),
+    )
+
+    if use_cache and text:
+        cache.put(MODEL_NAME, prompt, text)
+    return text
+
+
+def generate_json(
+    prompt: str,
+    schema: dict,
+    spinner_text: str = "🤖 Generating with Gemini AI...",
+    use_cache: bool = True,
+    feature: str = DEFAULT_FEATURE,
+    max_output_tokens: int = None,
+):
+    """
+    Ask for a JSON reply constrained by `schema` (OpenAPI subset, see
+    google.genai.types.Schema) and return it parsed, or None if the reply
+    is not valid JSON (e.g. cut off at `max_output_tokens`). Only valid
+    replies are cached; the schema and token cap are part of the cache key.
+    """
+    config = {"response_mime_type": "application/json", "response_schema": schema}
+    if max_output_tokens:
+        config["max_output_tokens"] = max_output_tokens
+    cache_prompt = f"{prompt}\n\n{json.dumps(config, sort_keys=True)}"
+
+    cache = get_cache()
+    text = cache.get(MODEL_NAME, cache_prompt) if use_cache else None
+    if text is not None:
+        llm_metrics.record_cache_hit(feature)
+    else:
+        text = single_flight(
+            cache_key(MODEL_NAME, cache_prompt), feature, spinner_text,
+            lambda: _generate_content(prompt, feature, spinner_text, config=config),
+        )
+
+    try:
+        reply = json.loads(text)
+    except ValueError:
+        return None
+    if use_cache:
+        cache.put(MODEL_NAME, cache_prompt, text)
+    return reply
+
+
+def generate_stream(prompt: str, use_cache: bool = True, feature: str = DEFAULT_FEATURE):
+    """
+    Yield response text chunks as Gemini produces them.
+    A cache hit yields the whole stored response as a single chunk; a fully
+    streamed response is written back to the cache once it completes.
+    While the same prompt is already in flight (streamed or not), this waits
+    for it and yields its whole response as a single chunk too.
+    """
+    cache = get_cache()
+    if use_cache:
+        cached = cache.get(MODEL_NAME, prompt)
+        if cached is not None:
+            llm_metrics.record_cache_hit(feature)
+            yield cached
+            return
+
+    key = cache_key(MODEL_NAME, prompt)
+    future, leader = _join(key)
+    if not leader:
+        text = future.result()
+        if text is not _ABANDONED:
+            llm_metrics.record_coalesced(feature)
+            yield text
+            return
+        yield from _stream_content(prompt, feature)
+        return
+
+    parts = []
+    try:
+        for chunk in _stream_content(prompt, feature):
+            parts.append(chunk)
+            yield chunk
+    except Exception as exc:
+        future.set_exception(exc)
+        raise
+    except BaseException:                # closed early / stopped by a rerun
+        future.set_result(_ABANDONED)
+        raise
+    else:
+        text = "".join(parts).strip()
+        future.set_result(text)
+    finally:
+        _leave(key)
+    if use_cache and text:
+        cache.put(MODEL_NAME, prompt, text)
+
+
+def _stream_content(prompt, feature):
+    """
+    One scheduled, retried and metered generate_content_stream call.
+    Latency is recorded for the whole stream (first request to last chunk).
+    """
+    client = get_client()
+    parts = []
+    last_chunk = None
+    with queued(feature) as scheduler:
+        started = time.perf_counter()
+        try:
+            for attempt in range(MAX_RETRIES + 1):
+                try:
+                    for chunk in client.models.generate_content_stream(
+                        model=MODEL_NAME,
+                        contents=prompt
+                    ):
+                        last_chunk = chunk   # the final chunk carries the usage metadata
+                        if chunk.text:
+                            parts.append(chunk.text)
+                            yield chunk.text
+                    break
+                except Exception as exc:
+                    # Only retry before anything was shown to the user
+                    if parts or attempt == MAX_RETRIES or not is_retryable(exc):
+                        raise
+                    llm_metrics.record_retry(feature)
+                    time.sleep(backoff_delay(attempt))
+                    scheduler.wait_for_token()
+        except Exception:
+            llm_metrics.record_call(
+                feature, time.perf_counter() - started, prompt, "".join(parts), error=True
+            )
+            raise
+
+    text = "".join(parts).strip()
+    llm_metrics.record_call(feature, time.perf_counter() - started, prompt, text, last_chunk)
+
+
+def stream_generate(
+    prompt: str,
+    render,
+    spinner_text: str = "🤖 Generating with Gemini AI...",
+    use_cache: bool = True,
+    feature: str = DEFAULT_FEATURE,
+) -> str:
+    """
+    Stream a response into a placeholder, re-rendering it as chunks arrive.
+    `render(text)` must return the markdown/HTML for the partial text.
+    The spinner only covers the wait for the first token.
+    Returns the final stripped text (for downloads, parsing, etc.).
+    """
+    placeholder = st.empty()
+    chunks = generate_stream(prompt, use_cache=use_cache, feature=feature)
+    with phase("gemini"):
+        with st.spinner(spinner_text):
+            text = next(chunks, "")
+        placeholder.markdown(render(text), unsafe_allow_html=True)
+        for chunk in chunks:
+            text += chunk
+            placeholder.markdown(render(text), unsafe_allow_html=True)
+
+    text = text.strip()
+    placeholder.markdown(render(text), unsafe_allow_html=True)
+    return text
+
+
+async def _generate_concurrently(client, prompts, features, max_concurrency, session, on_wait=None):
+    """
+    `on_wait(report)` is called on the event loop's thread with the best
+    (position, eta) among this batch's queued prompts, or None once none is queued.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    scheduler = get_scheduler()
+    loop = asyncio.get_running_loop()
+    queued_at = {}              # prompt → (position, eta) while in the scheduler queue
+
+    async def show_queue():
+        shown = None
+        while True:
+            report = min(queued_at.values(), default=None)
+            if report != shown:
+                on_wait(report)
+                shown = report
+            await asyncio.sleep(WAIT_POLL_SECONDS)
+
+    async def call(prompt, feature):
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return await client.aio.models.generate_content(
+                    model=MODEL_NAME,
+                    contents=prompt
+                )
+            except Exception as exc:
+                if attempt == MAX_RETRIES or not is_retryable(exc):
+                    raise
+                llm_metrics.record_retry(feature)
+                await asyncio.sleep(backoff_delay(attempt))
+                await asyncio.to_thread(scheduler.wait_for_token)
+
+    async def one(prompt, feature):
+        key = cache_key(MODEL_NAME, prompt)
+        future, leader = _join(key)
+        if not leader:
+            text = await asyncio.wrap_future(future)
+            if text is not _ABANDONED:
+                llm_metrics.record_coalesced(feature)
+                return text
+            return await scheduled(prompt, feature)
+        try:
+            text = await scheduled(prompt, feature)
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        except BaseException:
+            future.set_result(_ABANDONED)
+            raise
+        else:
+            future.set_result(text)
+            return text
+        finally:
+            _leave(key)
+
+    async def scheduled(prompt, feature):
+        async with semaphore:
+            ticket = await asyncio.to_thread(
+                scheduler.acquire, session, priority_for(feature),
+                lambda *report: loop.call_soon_threadsafe(queued_at.__setitem__, prompt, report),
+            )
+            queued_at.pop(prompt, None)
+            started = time.perf_counter()
+            try:
+                response = await call(prompt, feature)
+                text = response.text.strip()
+            except Exception:
+                llm_metrics.record_call(feature, time.perf_counter() - started, prompt, error=True)
+                raise
+            finally:
+                scheduler.release(ticket)
+            llm_metrics.record_call(feature, time.perf_counter() - started, prompt, text, response)
+            return text
+
+    monitor = asyncio.create_task(show_queue()) if on_wait else None
+    try:
+        return await asyncio.gather(
+            *(one(p, f) for p, f in zip(prompts, features)), return_exceptions=True
         )
-    return response.text.strip()
+    finally:
+        if monitor:
+            monitor.cancel()
+            on_wait(None)
+
+
+def generate_many(
+    prompts,
+    spinner_text: str = "🤖 Generating with Gemini AI...",
+    max_concurrency: int = MAX_CONCURRENCY,
+    use_cache: bool = True,
+    feature=DEFAULT_FEATURE,
+) -> list:
+    """
+    Run several independent prompts concurrently (at most `max_concurrency`
+    in flight). Returns one result per prompt, in order; a prompt whose call
+    failed yields None so the caller can report it without losing the rest.
+    `feature` is one metrics tag for all prompts or a list with one per prompt.
+    """
+    features = [feature] * len(prompts) if isinstance(feature, str) else list(feature)
+    cache = get_cache()
+    results = [None] * len(prompts)
+    pending = {}
+    for i, prompt in enumerate(prompts):
+        cached = cache.get(MODEL_NAME, prompt) if use_cache else None
+        if cached is not None:
+            llm_metrics.record_cache_hit(features[i])
+            results[i] = cached
+        else:
+            pending.setdefault(prompt, []).append(i)
+
+    if pending:
+        client = get_client()
+        unique = list(pending)
+        unique_features = [features[pending[p][0]] for p in unique]
+        placeholder = st.empty()
+
+        def on_wait(report):
+            if report is None:
+                placeholder.empty()
+            else:
+                placeholder.info(queue_message(*report))
+
+        with phase("gemini"), st.spinner(spinner_text):
+            answers = asyncio.run(
+                _generate_concurrently(
+                    client, unique, unique_features, max_concurrency, session_id(), on_wait
+                )
+            )
+        for prompt, answer in zip(unique, answers):
+            if isinstance(answer, BaseException) or not answer:
+                continue
+            if use_cache:
+                cache.put(MODEL_NAME, prompt, answer)
+            for i in pending[prompt]:
+                results[i] = answer
+    return results
+
+
+def generate_packed(
+    prompts,
+    spinner_text: str = "🤖 Generating with Gemini AI...",
+    use_cache: bool = True,
+    feature: str = DEFAULT_FEATURE,
+) -> list:
+    """
+    Answer several independent prompts with ONE request that returns a JSON
+    array. Falls back to generate_many() if the reply is not a JSON array of
+    the expected length.
+    """
+    if not prompts:
+        return []
+    tasks = "\n\n".join(
+        f"=== TASK {i + 1} ===\n{p.strip()}" for i, p in enumerate(prompts)
+    )
+    packed_prompt = f"""
+You will receive {len(prompts)} independent tasks.
+Complete each one exactly as instructed.
+
+{tasks}
+
+Return ONLY a JSON array of {len(prompts)} strings, where element N is the
+answer to TASK N. No keys, no commentary, no markdown fences.
+"""
+    cache = get_cache()
+    text = cache.get(MODEL_NAME, packed_prompt) if use_cache else None
+    if text is not None:
+        llm_metrics.record_cache_hit(feature)
+    else:
+        text = single_flight(
+            cache_key(MODEL_NAME, packed_prompt), feature, spinner_text,
+            lambda: _generate_content(
+                packed_prompt, feature, spinner_text,
+                config={"response_mime_type": "application/json"},
+            ),
+        )
+
+    try:
+        answers = json.loads(text)
+    except ValueError:
+        answers = None
+    if (
+        not isinstance(answers, list)
+        or len(answers) != len(prompts)
+        or not all(isinstance(a, str) for a in answers)
+    ):
+        return generate_many(prompts, spinner_text, use_cache=use_cache, feature=feature)
+
+    if use_cache:
+        cache.put(MODEL_NAME, packed_prompt, text)
+    return [a.strip() for a in answers]
@@ -0,0 +1,235 @@
+"""
+utils/gemini_scheduler.py — Fair, Rate-Limited Gemini Scheduling
+==================================================================
+One process-wide scheduler in front of every Gemini call, so a classroom
+clicking "Check My ATS Score" at once queues up instead of tripping the
+provider's rate limit and failing at random.
+
+- Token bucket: at most `rate_per_minute` calls start per minute (with a
+  small burst), and at most `max_in_flight` run at the same time.
+- Priority: short interactive rewrites (builder) go before long analyses
+  (ATS, cover letter, LinkedIn), which go before background batch work.
+  Waiting tickets age one priority level every AGING_SECONDS so nothing starves.
+- Fair queuing: within a priority level, sessions take turns — the session
+  served least recently goes next, so one user's "Enhance All" cannot push
+  everyone else to the back of the line.
+- Retries: 429 / 5xx errors are retried with jittered exponential backoff.
+
+Waiters get (queue position, estimated wait in seconds) callbacks for the UI.
+The admission order is built with a heap and reused by every waiter until
+the queue changes or a ticket ages into the next priority level.
+"""
+
+import heapq
+import itertools
+import math
+import os
+import random
+import threading
+import time
+
+
+RATE_PER_MINUTE = float(os.environ.get("SMARTRESUME_GEMINI_RPM", "60"))
+BURST = int(os.environ.get("SMARTRESUME_GEMINI_BURST", "10"))
+MAX_IN_FLIGHT = int(os.environ.get("SMARTRESUME_GEMINI_MAX_IN_FLIGHT", "8"))
+
+PRIORITY_INTERACTIVE = 0     # short rewrites in the builder
+PRIORITY_ANALYSIS = 1        # ATS analysis, cover letter, LinkedIn summary
+PRIORITY_BACKGROUND = 2      # batch / prefetch work nobody is waiting on
+FEATURE_PRIORITY = {
+    "builder_summary": PRIORITY_INTERACTIVE,
+    "builder_experience": PRIORITY_INTERACTIVE,
+    "builder_project": PRIORITY_INTERACTIVE,
+    "builder_enhance_all": PRIORITY_INTERACTIVE,
+    "batch_enhance": PRIORITY_BACKGROUND,
+    "builder_prefetch": PRIORITY_BACKGROUND,
+}
+AGING_SECONDS = 20.0
+WAIT_POLL_SECONDS = 0.5
+
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def priority_for(feature: str) -> int:
+    return FEATURE_PRIORITY.get(feature, PRIORITY_ANALYSIS)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for rate-limit (429) and server (5xx) errors from the Gemini API."""
+    status = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    return isinstance(status, int) and status in RETRYABLE_STATUS
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, base · 2^attempt), capped."""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`. Not thread-safe."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def seconds_until_token(self) -> float:
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class Ticket:
+    __slots__ = ("seq", "session", "priority", "enqueued")
+
+    def __init__(self, seq, session, priority):
+        self.seq = seq
+        self.session = session
+        self.priority = priority
+        self.enqueued = time.monotonic()
+
+
+class GeminiScheduler:
+    def __init__(self, rate_per_minute=RATE_PER_MINUTE, burst=BURST, max_in_flight=MAX_IN_FLIGHT):
+        self.bucket = TokenBucket(rate_per_minute / 60, burst)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.waiting = []                 # Tickets, in arrival order
+        self.last_served = {}             # session → monotonic time of last admission
+        self.avg_call_seconds = 5.0       # running estimate for the UI's wait time
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._order = None                # cached _queue_order() result …
+        self._positions = {}              # … ticket → index in it
+        self._order_expires = 0.0         # … valid until a ticket ages a level
+
+    # ── Ordering ──────────────────────────────────────────────────────────────
+    def _invalidate_order(self):
+        self._order = None
+
+    def _queue_order(self):
+        """
+        Waiting tickets in the order they will be admitted: lowest effective
+        priority first, then round-robin over sessions (least recently served
+        first), FIFO within a session. O(n log n), and only recomputed when the
+        queue changes or a ticket ages into the next level.
+        """
+        now = time.monotonic()
+        if self._order is not None and now < self._order_expires:
+            return self._order
+
+        queues = {}                       # (effective priority, session) → tickets by seq
+        expires = math.inf
+        for ticket in self.waiting:
+            aged = int((now - ticket.enqueued) / AGING_SECONDS)
+            queues.setdefault((ticket.priority - aged, ticket.session), []).append(ticket)
+            expires = min(expires, ticket.enqueued + (aged + 1) * AGING_SECONDS)
+        served = {session: self.last_served.get(session, 0.0) for _, session in queues}
+        heap = [(level, served[session], q[0].seq, session) for (level, session), q in queues.items()]
+        heapq.heapify(heap)
+
+        order = []
+        heads = dict.fromkeys(queues, 0)
+        while heap:
+            level, when, seq, session = heapq.heappop(heap)
+            if when != served[session]:   # served again at another level since pushed
+                heapq.heappush(heap, (level, served[session], seq, session))
+                continue
+            queue = queues[level, session]
+            order.append(queue[heads[level, session]])
+            heads[level, session] += 1
+            served[session] = now + len(order)   # then other sessions go first
+            if heads[level, session] < len(queue):
+                heapq.heappush(heap, (level, served[session], queue[heads[level, session]].seq, session))
+
+        self._order = order
+        self._positions = {ticket: i for i, ticket in enumerate(order)}
+        self._order_expires = expires
+        return order
+
+    def _estimated_wait(self, position):
+        """Seconds until the ticket at 1-based `position` starts."""
+        by_rate = max(0.0, position - self.bucket.tokens) / self.bucket.rate
+        by_slots = 0.0
+        if self.in_flight >= self.max_in_flight:
+            by_slots = math.ceil(position / self.max_in_flight) * self.avg_call_seconds
+        return max(by_rate, by_slots)
+
+    # ── Admission ─────────────────────────────────────────────────────────────
+    def acquire(self, session, priority=PRIORITY_ANALYSIS, on_wait=None):
+        """
+        Block until this call may start. While queued, `on_wait(position,
+        eta_seconds)` is called from this thread (outside the lock) whenever
+        either changes. Returns a ticket for release().
+        """
+        last_report = None
+        with self._cond:
+            ticket = Ticket(next(self._seq), session, priority)
+            self.waiting.append(ticket)
+            self._invalidate_order()
+        try:
+            while True:
+                with self._cond:
+                    order = self._queue_order()
+                    timeout = WAIT_POLL_SECONDS
+                    if order[0] is ticket and self.in_flight < self.max_in_flight:
+                        if self.bucket.try_take():
+                            self._admit(ticket)
+                            return ticket
+                        timeout = min(timeout, self.bucket.seconds_until_token())
+                    position = self._positions[ticket] + 1
+                    report = (position, round(self._estimated_wait(position)))
+                    if on_wait is None or report == last_report:
+                        self._cond.wait(timeout)
+                        continue
+                last_report = report
+                on_wait(*report)
+        except BaseException:
+            with self._cond:
+                self.waiting.remove(ticket)
+                self._invalidate_order()
+                self._cond.notify_all()
+            raise
+
+    def _admit(self, ticket):
+        self.waiting.remove(ticket)
+        self._invalidate_order()
+        self.in_flight += 1
+        self.last_served[ticket.session] = time.monotonic()
+        ticket.enqueued = time.monotonic()   # reused as the call start time
+        self._cond.notify_all()              # the next head may start too
+
+    def release(self, ticket):
+        with self._cond:
+            self.in_flight -= 1
+            elapsed = time.monotonic() - ticket.enqueued
+            self.avg_call_seconds = 0.8 * self.avg_call_seconds + 0.2 * elapsed
+            if len(self.last_served) > 10_000:
+                self.last_served.clear()
+                self._invalidate_order()
+            self._cond.notify_all()
+
+    def wait_for_token(self):
+        """Take one rate-limit token (used before each retry of an admitted call)."""
+        with self._cond:
+            while not self.bucket.try_take():
+                self._cond.wait(self.bucket.seconds_until_token())
+
+    def queue_length(self):
+        with self._cond:
+            return len(self.waiting)
@@ -0,0 +1,207 @@
+"""
+utils/jd_index.py — Job Description Library Index
+===================================================
+Indexes many job descriptions once so a single resume can be ranked
+against all of them in one vectorized pass, with no Gemini call.
+
+Each build is written to a fresh version directory, then made current by
+atomically replacing the CURRENT pointer file, so sessions still reading
+the previous version's memory maps are never truncated underneath. Only the
+newest KEEP_VERSIONS versions are kept.
+
+On-disk layout (one version directory, arrays opened memory-mapped):
+    meta.json        titles + build info
+    vocab.json       keyword strings, position = term id
+    jds.jsonl        original JD text (only read for the few chosen JDs)
+    term_ptr.npy     postings offsets per term   (inverted index, CSC-style)
+    post_doc.npy     JD id for each posting
+    post_weight.npy  TF-IDF weight for each posting
+    doc_ptr.npy      keyword offsets per JD      (forward index, CSR-style)
+    doc_term.npy     term id for each JD keyword
+    doc_total.npy    sum of keyword weights per JD
+"""
+
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from utils.ats_scorer import extract_keywords, ngrams, tokenize
+
+
+DEFAULT_INDEX_DIR = os.path.join(os.environ.get("SMARTRESUME_CACHE_DIR", ".cache"), "jd_index")
+ARRAY_FILES = ("term_ptr", "post_doc", "post_weight", "doc_ptr", "doc_term", "doc_total")
+POINTER_FILE = "CURRENT"
+KEEP_VERSIONS = 2              # the current one + the one open sessions may still map
+
+
+@dataclass
+class JDMatch:
+    jd_id: int
+    title: str
+    score: int
+    matched: list = field(default_factory=list)
+    missing: list = field(default_factory=list)
+
+
+def corpus_idf(jd_texts):
+    """Smoothed inverse document frequency of every n-gram in the corpus."""
+    df = Counter()
+    for text in jd_texts:
+        df.update(set(ngrams(tokenize(text))))
+    n = len(jd_texts)
+    return {gram: math.log((n + 1) / (count + 1)) + 1.0 for gram, count in df.items()}
+
+
+def build_index(jds, index_dir=DEFAULT_INDEX_DIR):
+    """
+    Index a list of (title, text) pairs as a new version under `index_dir`
+    and make it the current one. Returns the loaded JDIndex.
+    """
+    titles = [title for title, _ in jds]
+    texts = [text for _, text in jds]
+    idf = corpus_idf(texts)
+
+    vocab = {}
+    doc_ptr = [0]
+    doc_term, doc_weight = [], []
+    for text in texts:
+        for gram, weight in extract_keywords(text, idf=idf).items():
+            doc_term.append(vocab.setdefault(gram, len(vocab)))
+            doc_weight.append(weight)
+        doc_ptr.append(len(doc_term))
+
+    doc_ptr = np.asarray(doc_ptr, dtype=np.int64)
+    doc_term = np.asarray(doc_term, dtype=np.int32)
+    doc_weight = np.asarray(doc_weight, dtype=np.float32)
+    doc_ids = np.repeat(np.arange(len(texts), dtype=np.int32), np.diff(doc_ptr))
+    doc_total = np.bincount(doc_ids, weights=doc_weight, minlength=len(texts)).astype(np.float32)
+
+    # Transpose the forward index into term-major postings
+    order = np.argsort(doc_term, kind="stable")
+    post_doc = doc_ids[order]
+    post_weight = doc_weight[order]
+    term_ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(doc_term, minlength=len(vocab)), out=term_ptr[1:])
+
+    os.makedirs(index_dir, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix="building-", dir=index_dir)
+    try:
+        arrays = {
+            "term_ptr": term_ptr, "post_doc": post_doc, "post_weight": post_weight,
+            "doc_ptr": doc_ptr, "doc_term": doc_term, "doc_total": doc_total,
+        }
+        for name, arr in arrays.items():
+            np.save(os.path.join(build_dir, f"{name}.npy"), arr)
+        terms = sorted(vocab, key=vocab.get)
+        with open(os.path.join(build_dir, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(terms, f)
+        with open(os.path.join(build_dir, "jds.jsonl"), "w", encoding="utf-8") as f:
+            for title, text in jds:
+                f.write(json.dumps({"title": title, "text": text}) + "\n")
+        with open(os.path.join(build_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"titles": titles, "num_jds": len(texts), "num_terms": len(terms)}, f)
+
+        version = f"v{time.time_ns()}"
+        os.replace(build_dir, os.path.join(index_dir, version))
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+    pointer = os.path.join(index_dir, POINTER_FILE)
+    with open(f"{pointer}.{version}.tmp", "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(f"{pointer}.{version}.tmp", pointer)
+    prune_versions(index_dir)
+    return JDIndex(index_dir)
+
+
+def current_version(index_dir=DEFAULT_INDEX_DIR):
+    """Name of the current version directory, or None if nothing is indexed."""
+    try:
+        with open(os.path.join(index_dir, POINTER_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def prune_versions(index_dir=DEFAULT_INDEX_DIR, keep=KEEP_VERSIONS):
+    """Delete all but the newest `keep` versions (open memory maps stay valid on POSIX)."""
+    versions = sorted(
+        (name for name in os.listdir(index_dir)
+         if name.startswith("v") and os.path.isdir(os.path.join(index_dir, name))),
+        key=lambda name: int(name[1:]) if name[1:].isdigit() else -1,
+    )
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(index_dir, name), ignore_errors=True)
+
+
+def index_exists(index_dir=DEFAULT_INDEX_DIR):
+    return current_version(index_dir) is not None
+
+
+class JDIndex:
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR, version=None):
+        self.version = version or current_version(index_dir)
+        if self.version is None:
+            raise FileNotFoundError(f"No job description index in {index_dir}")
+        self.index_dir = index_dir = os.path.join(index_dir, self.version)
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(index_dir, "vocab.json"), encoding="utf-8") as f:
+            self.terms = json.load(f)
+        self.titles = meta["titles"]
+        self.term_ids = {t: i for i, t in enumerate(self.terms)}
+        for name in ARRAY_FILES:
+            setattr(self, name, np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r"))
+
+    def __len__(self):
+        return len(self.titles)
+
+    def scores(self, resume_text):
+        """Weighted keyword coverage (0-100) of every JD, in one pass."""
+        present = {self.term_ids[g] for g in ngrams(tokenize(resume_text)) if g in self.term_ids}
+        slices = [np.arange(self.term_ptr[t], self.term_ptr[t + 1]) for t in present]
+        postings = np.concatenate(slices) if slices else np.zeros(0, dtype=np.int64)
+        hit = np.bincount(
+            self.post_doc[postings],
+            weights=self.post_weight[postings],
+            minlength=len(self.titles),
+        )
+        total = np.asarray(self.doc_total, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(total > 0, 100.0 * hit / total, 0.0)
+        return pct, present
+
+    def rank(self, resume_text, top_n=10):
+        """Top-N best-fit JDs with per-JD matched / missing keywords."""
+        pct, present = self.scores(resume_text)
+        top_n = min(top_n, len(pct))
+        if top_n == 0:
+            return []
+        # Sort by score desc, then JD id for a stable, reproducible order
+        top = np.lexsort((np.arange(len(pct)), -np.round(pct)))[:top_n]
+        matches = []
+        for jd_id in top:
+            lo, hi = self.doc_ptr[jd_id], self.doc_ptr[jd_id + 1]
+            terms = self.doc_term[lo:hi]
+            matches.append(JDMatch(
+                jd_id=int(jd_id),
+                title=self.titles[jd_id],
+                score=int(round(pct[jd_id])),
+                matched=[self.terms[t] for t in terms if t in present],
+                missing=[self.terms[t] for t in terms if t not in present],
+            ))
+        return matches
+
+    def jd_text(self, jd_id):
+        with open(os.path.join(self.index_dir, "jds.jsonl"), encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                if i == jd_id:
+                    return json.loads(line)["text"]
+        raise IndexError(jd_id)
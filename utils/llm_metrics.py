@@ -0,0 +1,229 @@
+"""
+utils/llm_metrics.py — Gemini Call Metrics
+============================================
+Process-wide counters and latency histograms for every Gemini call, tagged
+by the feature that made it (builder_summary, ats, cover_letter, ...).
+
+Per feature it records:
+- requests by status (ok / error), response-cache hits, 429/5xx retries
+  and calls deduplicated onto an identical in-flight request
+- a latency histogram (seconds)
+- prompt / response sizes in characters and in tokens (from the response's
+  usage_metadata, when the API reports it)
+- estimated prompt tokens saved by compacting pasted inputs (utils/prompt_prep.py)
+
+Exposed as a sidebar admin panel (views/admin_metrics.py) and in Prometheus
+text format: written to $SMARTRESUME_METRICS_FILE after each call, and/or
+served on http://0.0.0.0:$SMARTRESUME_METRICS_PORT/metrics.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+METRICS_FILE = os.environ.get("SMARTRESUME_METRICS_FILE", "")
+PREFIX = "smartresume_llm"
+
+
+class FeatureMetrics:
+    """Running totals for one feature tag."""
+
+    def __init__(self):
+        self.ok = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.prompt_chars = 0
+        self.response_chars = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.tokens_saved = 0
+
+    @property
+    def calls(self):
+        return self.ok + self.errors
+
+    def observe_latency(self, seconds):
+        self.latency_sum += seconds
+        self.latency_max = max(self.latency_max, seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+
+_features = {}
+_lock = threading.Lock()
+_server = None
+
+
+def _feature(name):
+    metrics = _features.get(name)
+    if metrics is None:
+        metrics = _features[name] = FeatureMetrics()
+    return metrics
+
+
+def usage_tokens(response):
+    """(prompt_tokens, response_tokens) from a Gemini response, 0 if not reported."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return 0, 0
+    return (getattr(usage, "prompt_token_count", None) or 0,
+            getattr(usage, "candidates_token_count", None) or 0)
+
+
+def record_call(feature, seconds, prompt, text="", response=None, error=False):
+    """Record one Gemini API call (successful or failed)."""
+    prompt_tokens, response_tokens = usage_tokens(response)
+    with _lock:
+        m = _feature(feature)
+        if error:
+            m.errors += 1
+        else:
+            m.ok += 1
+        m.observe_latency(seconds)
+        m.prompt_chars += len(prompt)
+        m.response_chars += len(text or "")
+        m.prompt_tokens += prompt_tokens
+        m.response_tokens += response_tokens
+    if METRICS_FILE:
+        write_prometheus_file(METRICS_FILE)
+
+
+def record_cache_hit(feature, count=1):
+    with _lock:
+        _feature(feature).cache_hits += count
+
+
+def record_coalesced(feature):
+    """A caller that shared an identical in-flight call instead of making its own."""
+    with _lock:
+        _feature(feature).coalesced += 1
+
+
+def record_prompt_savings(feature, tokens_before, tokens_after):
+    """Estimated tokens removed from a pasted input before it went into a prompt."""
+    with _lock:
+        _feature(feature).tokens_saved += max(0, tokens_before - tokens_after)
+
+
+def record_retry(feature):
+    """A 429 / 5xx answer that the scheduler is retrying."""
+    with _lock:
+        _feature(feature).retries += 1
+
+
+def snapshot():
+    """[{feature, calls, errors, ...}] for display, sorted by feature."""
+    with _lock:
+        rows = []
+        for name, m in sorted(_features.items()):
+            rows.append({
+                "feature": name,
+                "calls": m.calls,
+                "errors": m.errors,
+                "cache hits": m.cache_hits,
+                "retries": m.retries,
+                "deduplicated": m.coalesced,
+                "avg s": round(m.latency_sum / m.calls, 2) if m.calls else 0.0,
+                "max s": round(m.latency_max, 2),
+                "prompt tokens": m.prompt_tokens,
+                "response tokens": m.response_tokens,
+                "tokens saved": m.tokens_saved,
+                "prompt chars": m.prompt_chars,
+                "response chars": m.response_chars,
+            })
+        return rows
+
+
+def reset():
+    with _lock:
+        _features.clear()
+
+
+# ── Prometheus export ─────────────────────────────────────────────────────────
+def _counter(lines, name, help_text, values):
+    lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+    lines.append(f"# TYPE {PREFIX}_{name} counter")
+    for labels, value in values:
+        lines.append(f"{PREFIX}_{name}{{{labels}}} {value}")
+
+
+def prometheus_text() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        features = sorted(_features.items())
+        lines = []
+        _counter(lines, "requests_total", "Gemini API calls by feature and status.", [
+            (f'feature="{f}",status="{status}"', count)
+            for f, m in features for status, count in (("ok", m.ok), ("error", m.errors))
+        ])
+        _counter(lines, "cache_hits_total", "Responses served from the response cache.",
+                 [(f'feature="{f}"', m.cache_hits) for f, m in features])
+        _counter(lines, "coalesced_total", "Callers served by an identical in-flight call.",
+                 [(f'feature="{f}"', m.coalesced) for f, m in features])
+        _counter(lines, "retries_total", "Calls retried after a 429 / 5xx error.",
+                 [(f'feature="{f}"', m.retries) for f, m in features])
+        for name, attr, help_text in (
+            ("prompt_chars_total", "prompt_chars", "Prompt characters sent."),
+            ("response_chars_total", "response_chars", "Response characters received."),
+            ("prompt_tokens_total", "prompt_tokens", "Prompt tokens (usage metadata)."),
+            ("response_tokens_total", "response_tokens", "Response tokens (usage metadata)."),
+            ("prompt_tokens_saved_total", "tokens_saved", "Estimated prompt tokens removed by compaction."),
+        ):
+            _counter(lines, name, help_text, [(f'feature="{f}"', getattr(m, attr)) for f, m in features])
+
+        lines.append(f"# HELP {PREFIX}_latency_seconds Gemini API call latency.")
+        lines.append(f"# TYPE {PREFIX}_latency_seconds histogram")
+        for f, m in features:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, m.bucket_counts):
+                cumulative += count
+                lines.append(f'{PREFIX}_latency_seconds_bucket{{feature="{f}",le="{bound}"}} {cumulative}')
+            lines.append(f'{PREFIX}_latency_seconds_bucket{{feature="{f}",le="+Inf"}} {m.calls}')
+            lines.append(f'{PREFIX}_latency_seconds_sum{{feature="{f}"}} {m.latency_sum:.6f}')
+            lines.append(f'{PREFIX}_latency_seconds_count{{feature="{f}"}} {m.calls}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_file(path):
+    """Atomically (re)write the metrics file, e.g. for node_exporter's textfile collector."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0"):
+    """Serve /metrics on a daemon thread (idempotent per process)."""
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True,
+                             name="llm-metrics").start()
+        return _server
+
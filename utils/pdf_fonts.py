@@ -0,0 +1,198 @@
+"""
+utils/pdf_fonts.py — Unicode Fonts for Resume PDFs
+====================================================
+Embeds Noto Sans (plus Devanagari / Telugu / Tamil fallbacks) so names and
+places in Indian scripts render instead of turning into "?". fpdf subsets
+the embedded fonts, so only the glyphs used end up in the PDF.
+
+Parsing a TTF is expensive, so each font file is parsed ONCE per process
+into a prototype; every ResumePDF gets a cheap copy that shares the parsed
+metrics and only re-opens the raw bytes (lazily) for its own subset.
+Text-shaping results (when uharfbuzz is installed) are cached per font too.
+
+The fonts are not shipped with the repo; fetch them into fonts/ (or
+$SMARTRESUME_FONT_DIR) once with:
+    python -m utils.pdf_fonts
+Without them the PDFs fall back to the built-in Helvetica / latin-1 path,
+and a resume with letters outside latin-1 raises MissingFontsError instead
+of silently printing "?".
+"""
+
+import argparse
+import copy
+import io
+import os
+import sys
+import threading
+import urllib.request
+from functools import lru_cache
+
+from fpdf import FPDF
+from fpdf.fonts import SubsetMap, TTFFont
+from fontTools import ttLib
+
+from utils.resume_templates import MissingFontsError, needs_unicode_fonts  # noqa: F401  (re-exported)
+
+
+FONT_DIR = os.environ.get(
+    "SMARTRESUME_FONT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fonts"),
+)
+UNICODE_FAMILY = "NotoSans"
+BASE_FONTS = {
+    "": "NotoSans-Regular.ttf",
+    "B": "NotoSans-Bold.ttf",
+    "I": "NotoSans-Italic.ttf",
+}
+# family → {style: file}; missing files are simply skipped
+FALLBACK_FONTS = {
+    "NotoSansDevanagari": {"": "NotoSansDevanagari-Regular.ttf", "B": "NotoSansDevanagari-Bold.ttf"},
+    "NotoSansTelugu": {"": "NotoSansTelugu-Regular.ttf", "B": "NotoSansTelugu-Bold.ttf"},
+    "NotoSansTamil": {"": "NotoSansTamil-Regular.ttf", "B": "NotoSansTamil-Bold.ttf"},
+}
+SHAPING_CACHE_ENTRIES = 4096
+DOWNLOAD_URL = "https://github.com/notofonts/notofonts.github.io/raw/main/fonts/{family}/hinted/ttf/{file}"
+
+try:
+    import uharfbuzz  # noqa: F401  (optional — enables complex-script shaping)
+    HAS_SHAPING = True
+except ImportError:
+    HAS_SHAPING = False
+
+
+class CachedTTFFont(TTFFont):
+    """TTFFont whose HarfBuzz shaping results are memoized and shared by all copies."""
+
+    def perform_harfbuzz_shaping(self, text, font_size_pt, text_shaping_params):
+        params = text_shaping_params or {}
+        key = (text, font_size_pt, repr(sorted(params.items(), key=lambda kv: kv[0])))
+        cache = self._shaping_cache
+        with self._shaping_lock:
+            hit = cache.get(key)
+            if hit is None:
+                hit = super().perform_harfbuzz_shaping(text, font_size_pt, text_shaping_params)
+                if len(cache) >= SHAPING_CACHE_ENTRIES:
+                    cache.pop(next(iter(cache)))
+                cache[key] = hit
+        return hit
+
+
+_prototypes = {}
+_font_bytes = {}
+_lock = threading.Lock()
+
+
+def _prototype(path, fontkey, style):
+    """Parse `path` once per process; later calls reuse the parsed font."""
+    key = (path, fontkey)
+    with _lock:
+        proto = _prototypes.get(key)
+        if proto is None:
+            with open(path, "rb") as f:
+                _font_bytes[path] = f.read()
+            proto = CachedTTFFont(FPDF(), path, fontkey, style)
+            proto._shaping_cache = {}
+            proto._shaping_lock = threading.Lock()
+            _prototypes[key] = proto
+        return proto
+
+
+def add_cached_font(pdf, family, style, path):
+    """Register a font on `pdf` from the process-wide parsed-font cache."""
+    fontkey = f"{family.lower()}{style}"
+    if fontkey in pdf.fonts:
+        return
+    font = copy.copy(_prototype(path, fontkey, style))
+    # Per-document state: font number, glyph subset and a private TTFont to subset
+    font.i = len(pdf.fonts) + 1
+    font.ttfont = ttLib.TTFont(io.BytesIO(_font_bytes[path]), recalcTimestamp=False, lazy=True)
+    font.subset = SubsetMap(font)
+    font.missing_glyphs = []
+    font.biggest_size_pt = 0
+    font.color_font = None
+    pdf.fonts[fontkey] = font
+
+
+def preload_fonts():
+    """Parse every installed font file now (server warm-up). Returns the count."""
+    if not unicode_fonts_available():
+        return 0
+    fonts = [(UNICODE_FAMILY, BASE_FONTS)] + list(FALLBACK_FONTS.items())
+    loaded = 0
+    for family, files in fonts:
+        for style, filename in files.items():
+            path = os.path.join(FONT_DIR, filename)
+            if os.path.exists(path):
+                _prototype(path, f"{family.lower()}{style}", style)
+                loaded += 1
+    return loaded
+
+
+@lru_cache(maxsize=1)
+def unicode_fonts_available():
+    return all(os.path.exists(os.path.join(FONT_DIR, f)) for f in BASE_FONTS.values())
+
+
+def setup_unicode_fonts(pdf):
+    """
+    Register Noto Sans + script fallbacks on `pdf`.
+    Returns the family name to use, or None if the fonts are not installed.
+    """
+    if not unicode_fonts_available():
+        return None
+    for style, filename in BASE_FONTS.items():
+        add_cached_font(pdf, UNICODE_FAMILY, style, os.path.join(FONT_DIR, filename))
+
+    fallbacks = []
+    for family, files in FALLBACK_FONTS.items():
+        for style, filename in files.items():
+            path = os.path.join(FONT_DIR, filename)
+            if os.path.exists(path):
+                add_cached_font(pdf, family, style, path)
+                if style == "":
+                    fallbacks.append(family.lower())
+    if fallbacks:
+        pdf.set_fallback_fonts(fallbacks, exact_match=False)
+    if HAS_SHAPING:
+        pdf.set_text_shaping(True)
+    return UNICODE_FAMILY
+
+
+# ── Download ──────────────────────────────────────────────────────────────────
+def download_fonts(font_dir=FONT_DIR, progress=print):
+    """Fetch every missing font file into `font_dir`. Returns the number fetched."""
+    os.makedirs(font_dir, exist_ok=True)
+    fonts = [(UNICODE_FAMILY, BASE_FONTS)] + list(FALLBACK_FONTS.items())
+    fetched = 0
+    for family, files in fonts:
+        for filename in files.values():
+            path = os.path.join(font_dir, filename)
+            if os.path.exists(path):
+                continue
+            url = DOWNLOAD_URL.format(family=family, file=filename)
+            progress(f"Downloading {filename}")
+            with urllib.request.urlopen(url, timeout=60) as response:
+                data = response.read()
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(data)
+            os.replace(f"{path}.tmp", path)
+            fetched += 1
+    unicode_fonts_available.cache_clear()
+    return fetched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download the Noto fonts used for Unicode resumes.")
+    parser.add_argument("--dir", default=FONT_DIR, help=f"Font directory (default: {FONT_DIR})")
+    args = parser.parse_args(argv)
+    try:
+        fetched = download_fonts(args.dir)
+    except OSError as exc:
+        print(f"Download failed: {exc}", file=sys.stderr)
+        return 1
+    print(f"{fetched} font file(s) downloaded to {args.dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,117 +5,297 @@ Fixes:
 1. Year separator ? → – (encoding fix)
 2. Bullet points • added to experience
 3. Extra-curricular section no longer cut off
+
+build_pdf() is deterministic (fixed creation date → byte-identical output
+for identical input) and memoized in a bounded, process-wide LRU keyed on
+a canonical hash of (data, template_name).
+
+Below that, each section (header, section titles, every education /
+experience entry, each body block) is laid out once and cached by a hash of
+its content and template: the cached layout is the list of positioned text
+runs and rules, replayed with cheap text() calls and paginated on replay.
+Editing one project therefore only re-lays out that block.
 """
 
 from fpdf import FPDF
-import textwrap
-
-
-TEMPLATES = {
-    "🎯 Classic Professional": {
-        "header_bg": (255, 255, 255),
-        "header_text": (0, 0, 0),
-        "accent": (0, 0, 0),
-        "divider": (0, 0, 0),
-        "style": "classic",
-    },
-    "💜 Modern Purple": {
-        "header_bg": (108, 99, 255),
-        "header_text": (255, 255, 255),
-        "accent": (108, 99, 255),
-        "divider": (108, 99, 255),
-        "style": "modern",
-    },
-    "🌊 Corporate Blue": {
-        "header_bg": (26, 82, 160),
-        "header_text": (255, 255, 255),
-        "accent": (26, 82, 160),
-        "divider": (26, 82, 160),
-        "style": "modern",
-    },
-    "🍃 Minimal Green": {
-        "header_bg": (39, 174, 96),
-        "header_text": (255, 255, 255),
-        "accent": (39, 174, 96),
-        "divider": (39, 174, 96),
-        "style": "modern",
-    },
-    "🔥 Bold Red": {
-        "header_bg": (192, 57, 43),
-        "header_text": (255, 255, 255),
-        "accent": (192, 57, 43),
-        "divider": (192, 57, 43),
-        "style": "modern",
-    },
-}
+from collections import OrderedDict
+from datetime import datetime, timezone
+import hashlib
+import json
+import threading
+
+from utils.pdf_fonts import setup_unicode_fonts
+from utils.rerun_timing import phase
+from utils.resume_templates import MissingFontsError, needs_unicode_fonts
+from utils.resume_templates import SAMPLE_RESUME, TEMPLATES, pdf_cache_key  # noqa: F401  (re-exported)
+from utils.text_layout import wrap_font_widths, wrap_text
+
+
+# Fixed metadata date so identical input always yields identical bytes
+PDF_CREATION_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+PDF_CACHE_ENTRIES = 128
+PDF_CACHE_MAX_BYTES = 64 * 1024 * 1024
+LAYOUT_CACHE_ENTRIES = 4096
+
+# Typographic characters the built-in (latin-1) Helvetica cannot encode
+LATIN1_TRANSLATION = str.maketrans({
+    "\u2013": "-",   # en dash –
+    "\u2014": "-",   # em dash —
+    "\u2019": "'",   # right single quote '
+    "\u2018": "'",   # left single quote '
+    "\u201c": '"',   # left double quote "
+    "\u201d": '"',   # right double quote "
+    "\u2022": "-",   # bullet •  (fpdf handles this separately)
+    "\u00a0": " ",   # non-breaking space
+    "\u2026": "...", # ellipsis …
+})
+
+
+# ── Section layout cache ──────────────────────────────────────────────────────
+_layout_cache = OrderedDict()
+_layout_cache_lock = threading.Lock()
+
+
+def _layout_get(key):
+    with _layout_cache_lock:
+        layout = _layout_cache.get(key)
+        if layout is not None:
+            _layout_cache.move_to_end(key)
+        return layout
+
+
+def _layout_put(key, layout):
+    with _layout_cache_lock:
+        _layout_cache[key] = layout
+        while len(_layout_cache) > LAYOUT_CACHE_ENTRIES:
+            _layout_cache.popitem(last=False)
+
+
+def clear_layout_cache():
+    with _layout_cache_lock:
+        _layout_cache.clear()
 
 
 class ResumePDF(FPDF):
-    def __init__(self, t):
+    _ops = None          # list of drawing ops while a section is being recorded
+    _origin = 0.0        # cursor y where that recording started
+
+    def __init__(self, t, cache_layouts=True):
         super().__init__()
         self.t = t
+        self.cache_layouts = cache_layouts
         self.set_auto_page_break(auto=True, margin=15)
+        self.set_creation_date(PDF_CREATION_DATE)
+        # Embedded Unicode fonts when installed, else built-in Helvetica
+        self.family = setup_unicode_fonts(self) or "Helvetica"
+        self.unicode = self.family != "Helvetica"
+        # text() is ~10x cheaper than cell() but does no shaping or font fallback
+        self.fast_text = not (self.text_shaping or self._fallback_font_ids)
+        # Everything besides the section's own content that changes its layout
+        self.layout_prefix = json.dumps(
+            [sorted(t.items()), self.family, self.unicode, self.text_shaping is not None],
+            ensure_ascii=False,
+        )
+
+    # ── Recording & replay ────────────────────────────────────────────────────
+    def laid_out(self, kind, draw, *args):
+        """Draw a section via its cached layout, recording it on first use."""
+        if not self.cache_layouts:
+            draw(*args)
+            return
+        digest = hashlib.sha256(
+            json.dumps([self.layout_prefix, kind, args], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        layout = _layout_get(digest)
+        if layout is None:
+            layout = self.record(draw, *args)
+            _layout_put(digest, layout)
+        self.replay(layout)
+
+    def record(self, draw, *args):
+        """
+        Run `draw` without drawing anything: collect its ops, with y relative
+        to the current cursor. Returns (ops, end_x, end_dy) for replay().
+        """
+        start_y, auto, margin = self.y, self.auto_page_break, self.b_margin
+        self.set_auto_page_break(False)
+        self._origin = start_y
+        self._ops = ops = []
+        try:
+            draw(*args)
+        finally:
+            self._ops = None
+            self.set_auto_page_break(auto, margin)
+        end_x, end_dy = self.x, self.y - start_y
+        self.y = start_y
+        return tuple(ops), end_x, end_dy
+
+    def replay(self, layout):
+        """Draw a recorded layout at the cursor, breaking pages like cell() would."""
+        ops, end_x, end_dy = layout
+        offset = self.y
+        for op in ops:
+            kind = op[0]
+            if kind == "text":
+                _, x, dy, w, h, text, align, text_x, baseline = op
+                top = offset + dy
+                if self.auto_page_break and top + h > self.page_break_trigger:
+                    self.add_page(same=True)
+                    offset += self.t_margin - top
+                    top = self.t_margin
+                if not self.fast_text:
+                    self.set_xy(x, top)
+                    FPDF.cell(self, w, h, text, align=align)
+                else:
+                    self.text(text_x, top + baseline, text)
+            elif kind == "font":
+                FPDF.set_font(self, *op[1:])
+            elif kind == "line":
+                _, x1, dy1, x2, dy2 = op
+                FPDF.line(self, x1, offset + dy1, x2, offset + dy2)
+            elif kind == "rect":
+                _, x, dy, w, h, style = op
+                FPDF.rect(self, x, offset + dy, w, h, style)
+            else:
+                getattr(FPDF, kind)(self, *op[1:])
+        self.x, self.y = end_x, offset + end_dy
+
+    # While recording, drawing primitives become ops instead of PDF output
+    def set_font(self, family=None, style="", size=0):
+        if self._ops is not None:
+            self._ops.append(("font", family, style, size))
+        super().set_font(family, style, size)   # metrics are needed for wrapping
+
+    def set_text_color(self, *args):
+        if self._ops is not None:
+            self._ops.append(("set_text_color", *args))
+        else:
+            super().set_text_color(*args)
+
+    def set_draw_color(self, *args):
+        if self._ops is not None:
+            self._ops.append(("set_draw_color", *args))
+        else:
+            super().set_draw_color(*args)
+
+    def set_fill_color(self, *args):
+        if self._ops is not None:
+            self._ops.append(("set_fill_color", *args))
+        else:
+            super().set_fill_color(*args)
+
+    def set_line_width(self, width):
+        if self._ops is not None:
+            self._ops.append(("set_line_width", width))
+        else:
+            super().set_line_width(width)
+
+    def line(self, x1, y1, x2, y2):
+        if self._ops is not None:
+            self._ops.append(("line", x1, y1 - self._origin, x2, y2 - self._origin))
+        else:
+            super().line(x1, y1, x2, y2)
+
+    def rect(self, x, y, w, h, style=None):
+        if self._ops is not None:
+            self._ops.append(("rect", x, y - self._origin, w, h, style))
+        else:
+            super().rect(x, y, w, h, style)
+
+    def cell(self, w=None, h=None, text="", ln=False, align=""):
+        if self._ops is None:
+            return super().cell(w, h, text, ln=ln, align=align)
+        # Same geometry as FPDF.cell: text offset by the cell margin / alignment,
+        # baseline at 0.5·h + 0.3·font size below the top of the cell
+        if not w:
+            w = self.w - self.r_margin - self.x
+        dx = self.c_margin
+        if align in ("R", "C"):
+            width = self.get_string_width(text)
+            dx = w - self.c_margin - width if align == "R" else (w - width) / 2
+        if text:
+            self._ops.append(("text", self.x, self.y - self._origin, w, h, text, align,
+                              self.x + dx, 0.5 * h + 0.3 * self.font_size))
+        if ln:
+            self.x, self.y = self.l_margin, self.y + h
+        else:
+            self.x += w
+        return True
 
     def safe_text(self, text):
         """
         FIX 1: Replace special characters that break latin-1 encoding.
         – (en dash), — (em dash), and similar chars → simple hyphen or ASCII.
+        With embedded Unicode fonts the text is kept as-is; without them, letters
+        beyond latin-1 raise MissingFontsError rather than turn into "?".
         """
         if not text:
             return ""
-        replacements = {
-            "\u2013": "-",   # en dash –
-            "\u2014": "-",   # em dash —
-            "\u2019": "'",   # right single quote '
-            "\u2018": "'",   # left single quote '
-            "\u201c": '"',   # left double quote "
-            "\u201d": '"',   # right double quote "
-            "\u2022": "-",   # bullet •  (fpdf handles this separately)
-            "\u00a0": " ",   # non-breaking space
-            "\u2026": "...", # ellipsis …
-        }
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
+        if self.unicode:
+            return text
+        text = text.translate(LATIN1_TRANSLATION)
+        if needs_unicode_fonts(text):
+            raise MissingFontsError(
+                f"Cannot render {text[:40]!r} without the Unicode fonts: "
+                "run `python -m utils.pdf_fonts` to download them"
+            )
         return text.encode("latin-1", "replace").decode("latin-1")
 
+    # ── Sections (cached) ─────────────────────────────────────────────────────
     def header_block(self, name, email, phone, location, linkedin, github):
+        self.laid_out("header", self._draw_header_block, name, email, phone, location, linkedin, github)
+
+    def section_title(self, title):
+        self.laid_out("title", self._draw_section_title, title)
+
+    def body(self, text, indent=0):
+        self.laid_out("body", self._draw_body, text, indent)
+
+    def experience_entry(self, role, company, duration, desc):
+        self.laid_out("experience", self._draw_experience_entry, role, company, duration, desc)
+
+    def education_entry(self, degree, institution, year, grade):
+        self.laid_out("education", self._draw_education_entry, degree, institution, year, grade)
+
+    # ── Sections (drawing) ────────────────────────────────────────────────────
+    def _draw_header_block(self, name, email, phone, location, linkedin, github):
         t = self.t
         if t["style"] == "modern":
             self.set_fill_color(*t["header_bg"])
             self.rect(0, 0, 210, 45, "F")
             self.set_text_color(*t["header_text"])
-            self.set_font("Helvetica", "B", 22)
+            self.set_font(self.family, "B", 22)
             self.set_xy(12, 8)
             self.cell(0, 10, self.safe_text(name.upper()), ln=True)
-            self.set_font("Helvetica", "", 8.5)
+            self.set_font(self.family, "", 8.5)
             parts = [p for p in [email, phone, location] if p]
             self.set_x(12)
-            self.cell(0, 5, "  |  ".join(parts), ln=True)
+            self.cell(0, 5, self.safe_text("  |  ".join(parts)), ln=True)
             if linkedin or github:
                 links = [p for p in [linkedin, github] if p]
                 self.set_x(12)
-                self.cell(0, 5, "  |  ".join(links), ln=True)
+                self.cell(0, 5, self.safe_text("  |  ".join(links)), ln=True)
             self.ln(18)
         else:
             self.set_text_color(0, 0, 0)
-            self.set_font("Helvetica", "B", 22)
+            self.set_font(self.family, "B", 22)
             self.cell(0, 12, self.safe_text(name.upper()), ln=True, align="C")
-            self.set_font("Helvetica", "", 9)
+            self.set_font(self.family, "", 9)
             parts = [p for p in [email, phone, location] if p]
-            self.cell(0, 5, "  |  ".join(parts), ln=True, align="C")
+            self.cell(0, 5, self.safe_text("  |  ".join(parts)), ln=True, align="C")
             if linkedin or github:
                 links = [p for p in [linkedin, github] if p]
-                self.set_font("Helvetica", "", 8.5)
-                self.cell(0, 5, "  |  ".join(links), ln=True, align="C")
+                self.set_font(self.family, "", 8.5)
+                self.cell(0, 5, self.safe_text("  |  ".join(links)), ln=True, align="C")
             self.set_draw_color(*t["divider"])
             self.set_line_width(0.6)
             self.line(12, self.get_y() + 2, 198, self.get_y() + 2)
             self.ln(8)
 
-    def section_title(self, title):
+    def _draw_section_title(self, title):
         t = self.t
         self.set_text_color(*t["accent"])
-        self.set_font("Helvetica", "B", 11)
+        self.set_font(self.family, "B", 11)
         self.set_x(12)
         self.cell(0, 8, self.safe_text(title.upper()), ln=True)
         self.set_draw_color(*t["divider"])
@@ -124,13 +304,25 @@ class ResumePDF(FPDF):
         self.set_text_color(30, 30, 30)
         self.ln(3)
 
-    def body(self, text, indent=0):
+    def line_width_from(self, x):
+        """Usable text width of a full-width cell starting at `x`."""
+        return self.w - self.r_margin - x - 2 * self.c_margin
+
+    def wrap(self, text, width, next_width=None):
+        """Break `text` into lines that fit `width` mm in the current font."""
+        if self.font_family == "helvetica":
+            return wrap_text(text, width, self.font_style, self.font_size_pt, next_width) or [""]
+        return wrap_font_widths(
+            text, width, self.current_font.cw, self.font_size_pt, next_width
+        ) or [""]
+
+    def _draw_body(self, text, indent=0):
         """
         FIX 2: Properly handle bullet points.
         Lines starting with •, -, or * get a dash prefix and indent.
         FIX 3: auto_page_break handles overflow automatically.
         """
-        self.set_font("Helvetica", "", 9.5)
+        self.set_font(self.family, "", 9.5)
         self.set_text_color(40, 40, 40)
         for line in text.strip().split("\n"):
             line = line.strip()
@@ -149,57 +341,104 @@ class ResumePDF(FPDF):
                 prefix = ""
                 extra_indent = 0
 
-            # Wrap long lines
-            wrapped = textwrap.wrap(
+            # Wrap long lines by glyph width; continuation lines indent more
+            x = 12 + indent + extra_indent
+            wrapped = self.wrap(
                 self.safe_text(prefix + line),
-                width=88
+                self.line_width_from(x),
+                self.line_width_from(x + 2),
             )
             for i, wl in enumerate(wrapped):
-                self.set_x(12 + indent + extra_indent)
+                self.set_x(x if i == 0 else x + 2)
                 self.cell(0, 5.5, wl, ln=True)
-                # continuation lines indent more
-                if i == 0 and len(wrapped) > 1:
-                    extra_indent += 2
 
         self.ln(3)
 
-    def experience_entry(self, role, company, duration, desc):
+    def _draw_experience_entry(self, role, company, duration, desc):
         """FIX 2: Experience bullets now show properly."""
-        self.set_font("Helvetica", "B", 10)
+        self.set_font(self.family, "B", 10)
         self.set_text_color(30, 30, 30)
         self.set_x(12)
 
-        # Role and duration on same line
-        self.cell(130, 6, self.safe_text(f"{role}  -  {company}"), ln=False)
-        self.set_font("Helvetica", "I", 9)
+        # Role and duration on same line; a long role/company wraps below
+        title = self.wrap(self.safe_text(f"{role}  -  {company}"), 130 - 2 * self.c_margin)
+        self.cell(130, 6, title[0], ln=False)
+        self.set_font(self.family, "I", 9)
         self.set_text_color(110, 110, 110)
         self.cell(0, 6, self.safe_text(duration), ln=True, align="R")
+        if len(title) > 1:
+            self.set_font(self.family, "B", 10)
+            self.set_text_color(30, 30, 30)
+            for wl in title[1:]:
+                self.set_x(12)
+                self.cell(130, 6, wl, ln=True)
 
         # Description with bullet handling
-        self.body(desc, indent=4)
+        self._draw_body(desc, indent=4)
 
-    def education_entry(self, degree, institution, year, grade):
+    def _draw_education_entry(self, degree, institution, year, grade):
         """FIX 1: Year now uses - instead of special dash character."""
-        self.set_font("Helvetica", "B", 10)
+        self.set_font(self.family, "B", 10)
         self.set_text_color(30, 30, 30)
         self.set_x(12)
-        self.cell(130, 6, self.safe_text(degree), ln=False)
-        self.set_font("Helvetica", "I", 9)
+        title = self.wrap(self.safe_text(degree), 130 - 2 * self.c_margin)
+        self.cell(130, 6, title[0], ln=False)
+        self.set_font(self.family, "I", 9)
         self.set_text_color(110, 110, 110)
         # FIX: replace any dash variants in year
         safe_year = self.safe_text(year)
         self.cell(0, 6, safe_year, ln=True, align="R")
-        self.set_font("Helvetica", "", 9)
+        if len(title) > 1:
+            self.set_font(self.family, "B", 10)
+            self.set_text_color(30, 30, 30)
+            for wl in title[1:]:
+                self.set_x(12)
+                self.cell(130, 6, wl, ln=True)
+        self.set_font(self.family, "", 9)
         self.set_text_color(60, 60, 60)
-        self.set_x(16)
         extra = f"  |  {grade}" if grade else ""
-        self.cell(0, 5, self.safe_text(f"{institution}{extra}"), ln=True)
+        for wl in self.wrap(self.safe_text(f"{institution}{extra}"), self.line_width_from(16)):
+            self.set_x(16)
+            self.cell(0, 5, wl, ln=True)
         self.ln(2)
 
 
+_pdf_cache = OrderedDict()
+_pdf_cache_bytes = 0
+_pdf_cache_lock = threading.Lock()
+
+
 def build_pdf(data: dict, template_name: str) -> bytes:
+    """Render (or reuse) the resume PDF for `data` in `template_name`."""
+    global _pdf_cache_bytes
+    key = pdf_cache_key(data, template_name)
+    with _pdf_cache_lock:
+        if key in _pdf_cache:
+            _pdf_cache.move_to_end(key)
+            return _pdf_cache[key]
+
+    with phase("pdf"):
+        pdf_bytes = render_pdf(data, template_name)
+
+    with _pdf_cache_lock:
+        if key not in _pdf_cache:
+            _pdf_cache[key] = pdf_bytes
+            _pdf_cache_bytes += len(pdf_bytes)
+        while len(_pdf_cache) > PDF_CACHE_ENTRIES or _pdf_cache_bytes > PDF_CACHE_MAX_BYTES:
+            _, evicted = _pdf_cache.popitem(last=False)
+            _pdf_cache_bytes -= len(evicted)
+    return pdf_bytes
+
+
+def prerender_samples():
+    """Warm the cache with SAMPLE_RESUME in every template."""
+    for template_name in TEMPLATES:
+        build_pdf(SAMPLE_RESUME, template_name)
+
+
+def render_pdf(data: dict, template_name: str, cache_layouts=True) -> bytes:
     t = TEMPLATES[template_name]
-    pdf = ResumePDF(t)
+    pdf = ResumePDF(t, cache_layouts)
     pdf.add_page()
 
     # Header
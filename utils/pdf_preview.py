@@ -0,0 +1,139 @@
+"""
+utils/pdf_preview.py — Resume Thumbnails in Every Template
+============================================================
+Renders PNG thumbnails of the first page of a resume PDF.
+- The five templates are rendered in parallel in worker processes
+- Thumbnails are cached (LRU) by pdf_cache_key(data, template) + scale,
+  so switching templates shows an already-rendered image instantly
+- The builder's live preview renders every page in-process (no worker
+  round trip), on top of the section layout cache in utils/pdf_generator.py
+- PDFium is not thread-safe, so every pypdfium2 call in a process holds
+  _pdfium_lock; concurrent sessions rasterize one at a time
+Rasterizing needs the optional `pypdfium2` package. Neither it nor fpdf is
+imported until a thumbnail is actually rendered.
+"""
+
+import importlib.util
+import io
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.rerun_timing import phase
+from utils.resume_templates import TEMPLATES, pdf_cache_key
+
+HAS_RASTERIZER = importlib.util.find_spec("pypdfium2") is not None
+
+
+THUMBNAIL_SCALE = 0.6          # 1.0 = 72 dpi
+PREVIEW_SCALE = 1.0
+PREVIEW_CACHE_ENTRIES = 100
+PREVIEW_WORKERS = 2
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_pool = None
+_pool_lock = threading.Lock()
+_pdfium_lock = threading.Lock()   # PDFium crashes if used from two threads at once
+
+
+def render_thumbnail(data: dict, template_name: str, scale: float = THUMBNAIL_SCALE) -> bytes:
+    """First page of the resume as PNG bytes (worker entry point)."""
+    import pypdfium2
+    from utils.pdf_generator import build_pdf
+
+    pdf = build_pdf(data, template_name)
+    out = io.BytesIO()
+    with _pdfium_lock:
+        document = pypdfium2.PdfDocument(pdf)
+        try:
+            document[0].render(scale=scale).to_pil().save(out, format="PNG", optimize=True)
+        finally:
+            document.close()
+    return out.getvalue()
+
+
+def render_pages(data: dict, template_name: str, scale: float = PREVIEW_SCALE) -> list:
+    """Every page of the resume as PNG bytes, rendered in this process and cached."""
+    key = (pdf_cache_key(data, template_name), "pages", scale)
+    pages = _cache_get(key)
+    if pages is not None:
+        return pages
+
+    import pypdfium2
+    from utils.pdf_generator import build_pdf
+
+    with phase("pdf"):
+        pdf = build_pdf(data, template_name)
+        with _pdfium_lock:   # bitmaps are PDFium memory too: encode before releasing
+            document = pypdfium2.PdfDocument(pdf)
+            try:
+                pages = []
+                for page in document:
+                    out = io.BytesIO()
+                    page.render(scale=scale).to_pil().save(out, format="PNG", compress_level=1)
+                    pages.append(out.getvalue())
+            finally:
+                document.close()
+    _cache_put(key, pages)
+    return pages
+
+
+def _get_pool():
+    """Process-wide worker pool; spawn avoids forking the threaded server."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PREVIEW_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _cache_get(key):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    return None
+
+
+def _cache_put(key, png):
+    with _cache_lock:
+        _cache[key] = png
+        _cache.move_to_end(key)
+        while len(_cache) > PREVIEW_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def cached_thumbnail(data: dict, template_name: str, scale: float = THUMBNAIL_SCALE):
+    """Thumbnail if already rendered, else None (never renders)."""
+    return _cache_get((pdf_cache_key(data, template_name), scale))
+
+
+def render_all_thumbnails(data: dict, template_names=None, scale: float = THUMBNAIL_SCALE) -> dict:
+    """
+    {template_name: png_bytes} for every template, rendering the uncached
+    ones in parallel in worker processes.
+    """
+    template_names = list(template_names or TEMPLATES)
+    thumbnails, pending = {}, {}
+    for name in template_names:
+        key = (pdf_cache_key(data, name), scale)
+        png = _cache_get(key)
+        if png is not None:
+            thumbnails[name] = png
+        else:
+            pending[name] = key
+
+    if pending:
+        pool = _get_pool()
+        with phase("pdf"):
+            futures = {name: pool.submit(render_thumbnail, data, name, scale) for name in pending}
+            for name, future in futures.items():
+                png = future.result()
+                _cache_put(pending[name], png)
+                thumbnails[name] = png
+    return {name: thumbnails[name] for name in template_names}
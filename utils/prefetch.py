@@ -0,0 +1,125 @@
+"""
+utils/prefetch.py — Speculative Prefetch of Builder Enhancements
+==================================================================
+Opt-in: once a section's "Enhance" prompt can be built (target role plus a
+summary / experience / project description) and has not changed for
+STABLE_SECONDS, it is answered on a background worker into the response
+cache. The later "Enhance" click is then a cache hit — or, if the prefetch
+is still running, waits for it instead of calling Gemini again.
+- One Prefetcher per session keeps the latest prompt per section; a changed
+  or removed section cancels its pending prefetch (a call already past the
+  wait is checked once more right before it is sent)
+- At most MAX_PER_SESSION speculative API calls per session; cache hits
+  and cancelled prefetches do not count
+- Calls run at background priority in utils/gemini_scheduler.py, so they
+  never delay anyone's real clicks, on at most WORKERS threads per process
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.gemini_client import generate_in_background
+
+
+STABLE_SECONDS = 3.0
+MAX_PER_SESSION = int(os.environ.get("SMARTRESUME_PREFETCH_MAX_PER_SESSION", "8"))
+WORKERS = 2
+FEATURE = "builder_prefetch"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+logger = logging.getLogger("smartresume.prefetch")
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="prefetch")
+        return _executor
+
+
+class _Job:
+    __slots__ = ("prompt", "timer", "cancelled")
+
+    def __init__(self, prompt):
+        self.prompt = prompt
+        self.timer = None
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.timer.cancel()
+        self.cancelled.set()
+
+
+class Prefetcher:
+    """Speculative enhancement calls for one session."""
+
+    def __init__(self, session, max_calls=MAX_PER_SESSION, stable_seconds=STABLE_SECONDS):
+        self.session = session
+        self.max_calls = max_calls
+        self.stable_seconds = stable_seconds
+        self.calls = 0                  # API calls made (counts toward max_calls)
+        self._jobs = {}                 # section key → _Job for its latest prompt
+        self._lock = threading.Lock()
+
+    @property
+    def exhausted(self):
+        return self.calls >= self.max_calls
+
+    def update(self, jobs, client, cache, scheduler):
+        """
+        Make the pending prefetches match `jobs` ([(section key, prompt)]):
+        cancel those whose prompt changed or disappeared, schedule new ones.
+        Cheap to call on every rerun. The Gemini client, cache and scheduler
+        are passed in because worker threads cannot resolve Streamlit resources.
+        """
+        wanted = dict(jobs)
+        with self._lock:
+            for key, job in list(self._jobs.items()):
+                if wanted.get(key) != job.prompt:
+                    self._cancel(key)
+            if self.exhausted:
+                return
+            for key, prompt in wanted.items():
+                if key in self._jobs:
+                    continue
+                job = _Job(prompt)
+                job.timer = threading.Timer(
+                    self.stable_seconds, self._dispatch, (job, client, cache, scheduler)
+                )
+                job.timer.daemon = True
+                self._jobs[key] = job
+                job.timer.start()
+
+    def cancel_all(self):
+        with self._lock:
+            for key in list(self._jobs):
+                self._cancel(key)
+
+    def _cancel(self, key):
+        self._jobs.pop(key).cancel()
+
+    def _dispatch(self, job, client, cache, scheduler):
+        if not job.cancelled.is_set():
+            _get_executor().submit(self._run, job, client, cache, scheduler)
+
+    def _claim(self, job):
+        with self._lock:
+            if job.cancelled.is_set() or self.exhausted:
+                return False
+            self.calls += 1
+            return True
+
+    def _run(self, job, client, cache, scheduler):
+        if job.cancelled.is_set():
+            return
+        try:
+            generate_in_background(
+                client, cache, scheduler, self.session, job.prompt, FEATURE, lambda: self._claim(job)
+            )
+        except Exception as exc:   # speculative: the real click simply calls Gemini itself
+            logger.warning("Prefetch failed: %s", exc)
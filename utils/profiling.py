@@ -0,0 +1,143 @@
+"""
+utils/profiling.py — Opt-In CPU & Memory Profiling per Rerun
+==============================================================
+Profiles whole Streamlit reruns with cProfile (CPU) and tracemalloc
+(memory) to find hot spots in the builder and the PDF generator under real
+data, without patching code.
+
+Enable with either:
+- SMARTRESUME_PROFILE=1            → every rerun is profiled
+- ?profile=1 in the URL            → only that session (needs SMARTRESUME_ADMIN=1)
+
+Each profiled rerun writes, under .cache/profiles/<page>/ ($SMARTRESUME_PROFILE_DIR):
+- <timestamp>.pstats — load with `python -m pstats` or snakeviz
+- <timestamp>.json   — top functions and allocation sites, peak memory
+
+Only one rerun is profiled at a time (tracemalloc is process-wide); reruns
+from other sessions meanwhile run unprofiled.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+PROFILE_DIR = os.environ.get(
+    "SMARTRESUME_PROFILE_DIR",
+    os.path.join(os.environ.get("SMARTRESUME_CACHE_DIR", ".cache"), "profiles"),
+)
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 15
+TRACEMALLOC_FRAMES = 10
+
+_profile_lock = threading.Lock()
+
+
+@dataclass
+class ProfileReport:
+    page: str = ""
+    seconds: float = 0.0
+    peak_kib: float = 0.0
+    retained_kib: float = 0.0
+    top_cumulative: list = field(default_factory=list)
+    top_self: list = field(default_factory=list)
+    top_allocations: list = field(default_factory=list)
+    pstats_path: str = ""
+    json_path: str = ""
+
+
+def profiling_requested(query_params, admin: bool) -> bool:
+    if os.environ.get("SMARTRESUME_PROFILE", "").lower() in ("1", "true", "yes"):
+        return True
+    return admin and query_params.get("profile") == "1"
+
+
+def _function_rows(stats, sort_key, limit):
+    rows = []
+    for (filename, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        if filename.startswith("<frozen"):
+            continue   # import machinery; still in the .pstats file
+        rows.append({
+            "function": f"{func} ({os.path.basename(filename)}:{line})",
+            "calls": ncalls,
+            "self ms": round(tottime * 1000, 2),
+            "cumulative ms": round(cumtime * 1000, 2),
+        })
+    rows.sort(key=lambda r: r[sort_key], reverse=True)
+    return rows[:limit]
+
+
+def _allocation_rows(snapshot, limit):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    rows = []
+    for stat in snapshot.statistics("lineno")[:limit]:
+        frame = stat.traceback[0]
+        rows.append({
+            "site": f"{frame.filename}:{frame.lineno}",
+            "KiB": round(stat.size / 1024, 1),
+            "blocks": stat.count,
+        })
+    return rows
+
+
+def _write(report, profiler):
+    directory = os.path.join(PROFILE_DIR, report.page or "unknown")
+    os.makedirs(directory, exist_ok=True)
+    now = time.time()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+    report.pstats_path = os.path.join(directory, f"{stamp}.pstats")
+    report.json_path = os.path.join(directory, f"{stamp}.json")
+    profiler.dump_stats(report.pstats_path)
+    with open(report.json_path, "w", encoding="utf-8") as f:
+        json.dump(report.__dict__, f, indent=2)
+
+
+@contextmanager
+def profile_rerun(enabled: bool):
+    """
+    Profile the block if `enabled` (and no other rerun is being profiled).
+    Yields a ProfileReport (set .page inside the block) or None; the report
+    is filled in and written to disk when the block exits.
+    """
+    if not enabled or not _profile_lock.acquire(blocking=False):
+        yield None
+        return
+
+    report = ProfileReport()
+    profiler = cProfile.Profile()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        report.seconds = round(time.perf_counter() - started, 3)
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            report.peak_kib = round(peak / 1024, 1)
+            report.retained_kib = round(current / 1024, 1)
+            report.top_allocations = _allocation_rows(snapshot, TOP_ALLOCATIONS)
+
+            stats = pstats.Stats(profiler)
+            report.top_cumulative = _function_rows(stats, "cumulative ms", TOP_FUNCTIONS)
+            report.top_self = _function_rows(stats, "self ms", TOP_FUNCTIONS)
+            _write(report, profiler)
+        finally:
+            _profile_lock.release()
@@ -0,0 +1,170 @@
+"""
+utils/prompt_prep.py — Prompt Input Compaction
+================================================
+Shrinks pasted free text (resumes, job descriptions, notes) before it is
+inlined into a Gemini prompt:
+1. Normalize whitespace (tabs, runs of spaces, non-breaking spaces, blank lines)
+2. Drop repeated long lines (page headers/footers repeated by PDF copy-paste)
+3. Drop known boilerplate: "About us", benefits, EEO / equal-opportunity
+   text, privacy notices, "Declaration" / "References on request" blocks
+4. Estimate tokens locally (no API call) and, if still over the feature's
+   budget, keep requirement / skills / experience sections first and cut
+   the rest at line boundaries
+
+Smaller prompts mean lower latency and cost. Savings per call are recorded
+in utils/llm_metrics.py ("tokens saved").
+"""
+
+import math
+import re
+from dataclasses import dataclass
+
+from utils import llm_metrics
+
+
+CHARS_PER_TOKEN = 4          # rough average for English prose on Gemini tokenizers
+FEATURE_BUDGETS = {          # max estimated tokens per pasted input, by feature
+    "ats": 1500,
+    "cover_letter": 300,
+    "linkedin": 300,
+}
+DEFAULT_BUDGET = 1500
+OMITTED = "[…]"
+
+BOILERPLATE_HEADING = re.compile(    # whole heading line, optional trailing colon
+    r"^(about (?!(the )?(role|job|position|opportunity|you|me)\b)[\w&.,' -]{1,40}"
+    r"|who we are|our (story|mission|culture|values)|what we offer|how to apply"
+    r"|(employee |compensation (and|&) )?benefits( (and|&) perks)?|perks( (and|&) benefits)?"
+    r"|why (join|work (with|at)) [\w&.' -]{1,30}|equal (employment )?opportunity( employer)?"
+    r"|eeo( statement)?|diversity( (and|&) inclusion)?|reasonable accommodations?"
+    r"|privacy( notice| policy)?|disclaimer|declaration|references)\s*:?$",
+    re.IGNORECASE,
+)
+BOILERPLATE_LINE = re.compile(
+    r"equal (employment )?opportunity employer|all qualified applicants will receive"
+    r"|^page \d+ ?(of|/) ?\d+$|references (are )?available (up)?on request|i hereby declare",
+    re.IGNORECASE,
+)
+PRIORITY_HEADING = re.compile(
+    r"requirement|qualification|skill|must[- ]have|nice[- ]to[- ]have|technical"
+    r"|what you('ll| will) (need|bring|do)|responsibilit|experience|projects|education",
+    re.IGNORECASE,
+)
+MAX_HEADING_CHARS = 60
+MIN_DEDUP_CHARS = 25         # shorter lines (dates, cities) legitimately repeat
+
+
+@dataclass
+class PreparedText:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    truncated: bool = False
+
+    @property
+    def tokens_saved(self):
+        return self.tokens_before - self.tokens_after
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def normalize_whitespace(text: str) -> str:
+    text = text.replace("\u00a0", " ").replace("\r\n", "\n").replace("\r", "\n")
+    lines = [re.sub(r"[ \t\f\v]+", " ", line).strip() for line in text.split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def is_heading(line: str) -> bool:
+    if not line or len(line) > MAX_HEADING_CHARS:
+        return False
+    if line.endswith(":") or BOILERPLATE_HEADING.match(line):
+        return True
+    letters = [c for c in line if c.isalpha()]
+    return len(letters) >= 3 and all(c.isupper() for c in letters)
+
+
+def split_sections(text: str):
+    """[(heading or None, [lines])] in document order."""
+    sections = [(None, [])]
+    for line in text.split("\n"):
+        if is_heading(line):
+            sections.append((line, []))
+        else:
+            sections[-1][1].append(line)
+    return [s for s in sections if s[0] is not None or any(s[1])]
+
+
+def drop_noise(text: str) -> str:
+    """Drop duplicate lines, boilerplate lines and whole boilerplate sections."""
+    seen = set()
+    kept = []
+    for heading, lines in split_sections(text):
+        if heading is not None and BOILERPLATE_HEADING.match(heading):
+            continue
+        body = []
+        for line in lines:
+            folded = line.casefold()
+            if BOILERPLATE_LINE.search(line):
+                continue
+            if len(line) >= MIN_DEDUP_CHARS:
+                if folded in seen:
+                    continue
+                seen.add(folded)
+            body.append(line)
+        kept.append("\n".join(([heading] if heading else []) + body).strip())
+    return "\n\n".join(s for s in kept if s)
+
+
+def truncate_to_budget(text: str, budget: int):
+    """
+    Keep the opening lines (job title / candidate name) and sections whose
+    heading looks like requirements / skills / experience first, then the
+    others in order, until `budget` estimated tokens are used.
+    Returns (text, truncated).
+    """
+    if estimate_tokens(text) <= budget:
+        return text, False
+    parts = split_sections(text)
+    headings = [h for h, _ in parts]
+    sections = ["\n".join(([h] if h else []) + lines).strip() for h, lines in parts]
+    order = sorted(
+        range(len(sections)),
+        key=lambda i: (not (headings[i] is None or PRIORITY_HEADING.search(headings[i])), i),
+    )
+    remaining = budget
+    kept = {}
+    for i in order:
+        cost = estimate_tokens(sections[i]) + 1
+        if cost <= remaining:
+            kept[i] = sections[i]
+            remaining -= cost
+            continue
+        # Partial section: whole lines while they fit, then stop
+        lines = []
+        for line in sections[i].split("\n"):
+            cost = estimate_tokens(line) + 1
+            if cost > remaining:
+                break
+            lines.append(line)
+            remaining -= cost
+        if lines:
+            kept[i] = "\n".join(lines + [OMITTED])
+        break
+    return "\n\n".join(kept[i] for i in sorted(kept)), True
+
+
+def prepare(text: str, budget: int = DEFAULT_BUDGET) -> PreparedText:
+    """Run every compaction step on one pasted input."""
+    before = estimate_tokens(text or "")
+    compact = drop_noise(normalize_whitespace(text or ""))
+    compact, truncated = truncate_to_budget(compact, budget)
+    return PreparedText(compact, before, estimate_tokens(compact), truncated)
+
+
+def prepare_for(feature: str, text: str) -> PreparedText:
+    """prepare() with the feature's budget, recording the tokens saved."""
+    prepared = prepare(text, FEATURE_BUDGETS.get(feature, DEFAULT_BUDGET))
+    llm_metrics.record_prompt_savings(feature, prepared.tokens_before, prepared.tokens_after)
+    return prepared
@@ -0,0 +1,56 @@
+"""
+utils/prompts.py — Resume Enhancement Prompts
+===============================================
+Gemini prompts for the builder's "Enhance" actions, shared by the
+Streamlit builder and the headless batch generator.
+"""
+
+
+def summary_prompt(summary, target_role):
+    return f"""
+You are a professional resume writer for students and freshers.
+Rewrite this summary for a student applying for: {target_role}
+
+Original: {summary}
+
+Requirements:
+- 2-3 impactful sentences
+- Use strong action-oriented language
+- Mention the role they're targeting
+- Sound enthusiastic but professional
+- No filler phrases like "passionate about" or "highly motivated"
+- Return ONLY the improved summary, nothing else.
+"""
+
+
+def experience_prompt(exp_role, exp_company, exp_desc, target_role):
+    return f"""
+Improve this internship/work experience description for a student's resume.
+Role: {exp_role} at {exp_company}
+Target Job: {target_role or 'Software/Data role'}
+
+Original:
+{exp_desc}
+
+Rules:
+- Use bullet points starting with strong action verbs (Built, Developed, Designed, Improved, etc.)
+- Add quantifiable impact wherever possible
+- Keep it under 4 bullet points
+- Return ONLY the improved bullet points.
+"""
+
+
+def project_prompt(proj_name, proj_tech, proj_desc):
+    return f"""
+Improve this project description for a student resume.
+Project: {proj_name} | Tech: {proj_tech}
+
+Original: {proj_desc}
+
+Rules:
+- Start with an action verb
+- Mention the tech stack naturally
+- Include the impact/outcome (accuracy, users, speed improvement etc.)
+- 1-2 concise sentences max
+- Return ONLY the improved description.
+"""
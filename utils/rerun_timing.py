@@ -0,0 +1,131 @@
+"""
+utils/rerun_timing.py — Per-Page Rerun Timing
+===============================================
+Times every page rerun dispatched by the main.py router and splits it into:
+- import   — importing the page module (first visit per process)
+- gemini   — waiting on Gemini calls (utils/gemini_client.py)
+- pdf      — rendering PDFs / thumbnails (utils/pdf_generator.py, pdf_preview.py)
+- widgets  — everything else: building the page's widgets and layout
+
+Timings go into a rolling window per page (last ROLLING_WINDOW reruns) from
+which p50 / p95 / p99 are computed for the diagnostics page. Reruns slower
+than SLOW_RERUN_SECONDS are logged with the page name and widget counts.
+
+Phases are tracked per script thread, so concurrent sessions don't mix, and
+nested phases (e.g. a PDF built inside a Gemini phase) are counted once.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+PHASES = ("import", "widgets", "gemini", "pdf")
+ROLLING_WINDOW = 500
+SLOW_RERUN_SECONDS = float(os.environ.get("SMARTRESUME_SLOW_RERUN_SECONDS", "2.0"))
+
+logger = logging.getLogger("smartresume.rerun")
+
+_local = threading.local()
+_history = {}               # page → deque of {"total": s, "import": s, ...}
+_history_lock = threading.Lock()
+
+
+@contextmanager
+def phase(name):
+    """Attribute the time spent in the block to `name` in the current rerun."""
+    run = getattr(_local, "run", None)
+    if run is None or run["depth"]:
+        yield   # no rerun being timed, or already inside a phase
+        return
+    run["depth"] += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        run[name] = run.get(name, 0.0) + time.perf_counter() - started
+        run["depth"] -= 1
+
+
+@contextmanager
+def time_rerun(page):
+    """Time one rerun of `page`; phases inside the block are attributed to it."""
+    run = {"depth": 0}
+    _local.run = run
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.run = None
+        total = time.perf_counter() - started
+        record = {"total": total}
+        for name in ("import", "gemini", "pdf"):
+            record[name] = run.get(name, 0.0)
+        record["widgets"] = max(0.0, total - record["import"] - record["gemini"] - record["pdf"])
+        with _history_lock:
+            _history.setdefault(page, deque(maxlen=ROLLING_WINDOW)).append(record)
+        if total >= SLOW_RERUN_SECONDS:
+            log_slow_rerun(page, record)
+
+
+def widget_counts():
+    """(widgets rendered this run, session_state keys) for the current session."""
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None, None
+    # Internal API (a set, or a ThreadSafeSet on ctx.shared in newer versions),
+    # so never let it break the page
+    widgets = None
+    try:
+        widget_ids = getattr(getattr(ctx, "shared", ctx), "widget_ids_this_run")
+        widgets = len(widget_ids.snapshot() if hasattr(widget_ids, "snapshot") else widget_ids)
+    except Exception:
+        pass
+    return widgets, len(st.session_state)
+
+
+def log_slow_rerun(page, record):
+    widgets, session_keys = widget_counts()
+    logger.warning(
+        "Slow rerun on %s: %.2fs (import %.2fs, widgets %.2fs, gemini %.2fs, pdf %.2fs); "
+        "%s widgets, %s session_state keys",
+        page, record["total"], record["import"], record["widgets"],
+        record["gemini"], record["pdf"], widgets, session_keys,
+    )
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def page_stats():
+    """
+    {page: {"reruns": n, "total": {"p50", "p95", "p99"}, "import": {...}, ...}}
+    over each page's rolling window.
+    """
+    with _history_lock:
+        history = {page: list(records) for page, records in _history.items()}
+    stats = {}
+    for page, records in sorted(history.items()):
+        entry = {"reruns": len(records)}
+        for name in ("total",) + PHASES:
+            values = sorted(r[name] for r in records)
+            entry[name] = {f"p{q}": percentile(values, q) for q in (50, 95, 99)}
+        stats[page] = entry
+    return stats
+
+
+def reset():
+    with _history_lock:
+        _history.clear()
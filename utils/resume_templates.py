@@ -0,0 +1,92 @@
+"""
+utils/resume_templates.py — Template Definitions
+==================================================
+Everything the UI needs to know about the resume templates — colours and
+styles, the sample resume, the content key used by the PDF / thumbnail
+caches, and the error raised when a resume needs fonts that are missing —
+without importing fpdf. Pages list and pick templates from here and only
+load utils.pdf_generator when they actually render a PDF.
+"""
+
+import hashlib
+import json
+
+
+TEMPLATES = {
+    "🎯 Classic Professional": {
+        "header_bg": (255, 255, 255),
+        "header_text": (0, 0, 0),
+        "accent": (0, 0, 0),
+        "divider": (0, 0, 0),
+        "style": "classic",
+    },
+    "💜 Modern Purple": {
+        "header_bg": (108, 99, 255),
+        "header_text": (255, 255, 255),
+        "accent": (108, 99, 255),
+        "divider": (108, 99, 255),
+        "style": "modern",
+    },
+    "🌊 Corporate Blue": {
+        "header_bg": (26, 82, 160),
+        "header_text": (255, 255, 255),
+        "accent": (26, 82, 160),
+        "divider": (26, 82, 160),
+        "style": "modern",
+    },
+    "🍃 Minimal Green": {
+        "header_bg": (39, 174, 96),
+        "header_text": (255, 255, 255),
+        "accent": (39, 174, 96),
+        "divider": (39, 174, 96),
+        "style": "modern",
+    },
+    "🔥 Bold Red": {
+        "header_bg": (192, 57, 43),
+        "header_text": (255, 255, 255),
+        "accent": (192, 57, 43),
+        "divider": (192, 57, 43),
+        "style": "modern",
+    },
+}
+
+
+# Sample resume used by the template showcase (prerendered at startup)
+SAMPLE_RESUME = {
+    "name": "Priya Sharma",
+    "email": "priya@gmail.com",
+    "phone": "+91 9876543210",
+    "location": "Hyderabad, India",
+    "linkedin": "linkedin.com/in/priyasharma",
+    "github": "github.com/priyasharma",
+    "summary": "Final year B.Tech CSE student with a strong foundation in Python, Machine Learning, and web development. Built 3+ end-to-end ML projects and completed a data science internship at a tech startup. Seeking a full-time SDE/Data Science role where I can apply my skills to solve real-world problems.",
+    "education": [
+        {"degree": "B.Tech Computer Science", "institution": "JNTU Hyderabad", "year": "2020 – 2024", "grade": "8.5 / 10"},
+        {"degree": "Class 12 (MPC)", "institution": "Narayana Junior College", "year": "2018 – 2020", "grade": "95.4%"},
+    ],
+    "experience": [
+        {"role": "Data Science Intern", "company": "TechStartup Pvt. Ltd.", "duration": "May – Aug 2023",
+         "description": "• Built a customer churn prediction model using XGBoost with 89% accuracy, reducing churn by 12%\n• Automated weekly reporting dashboards using Python and Tableau, saving 5 hours per week\n• Collaborated with a team of 4 engineers in an Agile environment"}
+    ],
+    "projects": "• Fake News Detector (Python, NLP, LSTM): Classified news articles as real/fake with 94% accuracy. Deployed as a Flask web app.\n• Stock Price Predictor (Python, LSTM, yfinance): Predicted next-day stock prices with RMSE of 2.3 for NIFTY 50.\n• Personal Finance Tracker (React, Firebase): Built a full-stack app to track expenses with visualizations.",
+    "skills": "Languages: Python, Java, SQL, JavaScript\nFrameworks: TensorFlow, Scikit-learn, React, Flask\nTools: Git, Docker, Jupyter, VS Code, Tableau\nSoft Skills: Problem Solving, Team Collaboration, Communication",
+    "achievements": "• Google Data Analytics Professional Certificate – Coursera (2023)\n• Ranked Top 5% in HackerRank Python Assessment (Gold Badge)\n• 1st Place – College Hackathon 2023 (50+ teams)",
+    "extra": "• Technical Lead, College Coding Club (2022-23) — organized workshops for 200+ students\n• NSS Volunteer — coordinated blood donation drives and awareness campaigns",
+}
+
+
+def pdf_cache_key(data: dict, template_name: str) -> str:
+    """Canonical content hash of a render request (usable as an ETag)."""
+    canonical = json.dumps(
+        [template_name, data], sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MissingFontsError(RuntimeError):
+    """Text needs the Unicode fonts (utils/pdf_fonts.py), but they are not installed."""
+
+
+def needs_unicode_fonts(text):
+    """True if `text` has letters (e.g. Devanagari, Telugu, Tamil) beyond latin-1."""
+    return any(ord(ch) > 0xFF and ch.isalpha() for ch in text)
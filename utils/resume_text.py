@@ -0,0 +1,114 @@
+"""
+utils/resume_text.py — Resume Text Extraction
+===============================================
+Pulls plain text out of uploaded resume files locally (no API call).
+- PDF: pure-Python pypdf parser, read page by page and capped at
+  MAX_PAGES so a huge upload cannot stall the Streamlit script thread
+- DOCX: read straight from the zip's word/document.xml (no extra dependency)
+- Results are cached by SHA-256 of the file content, so re-uploads and
+  reruns skip parsing entirely (the page count is cached with the text)
+"""
+
+import hashlib
+import io
+import threading
+import zipfile
+from collections import OrderedDict
+from xml.etree import ElementTree
+
+
+MAX_PAGES = 5          # resumes longer than this are truncated, not parsed
+CACHE_ENTRIES = 256
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def iter_pdf_pages(data: bytes, max_pages: int = MAX_PAGES):
+    """Lazily yield (page_number, total_pages, text), at most `max_pages` pages."""
+    from pypdf import PdfReader   # deferred until a PDF is uploaded
+
+    reader = PdfReader(io.BytesIO(data))
+    total = len(reader.pages)
+    for i in range(min(total, max_pages)):
+        yield i + 1, total, reader.pages[i].extract_text() or ""
+
+
+def extract_pdf_text(data: bytes, max_pages: int = MAX_PAGES, on_page=None) -> str:
+    """`on_page(done, limit, total)` is called after each parsed page."""
+    parts = []
+    for number, total, text in iter_pdf_pages(data, max_pages):
+        parts.append(text)
+        if on_page:
+            on_page(number, min(total, max_pages), total)
+    return "\n".join(parts).strip()
+
+
+def extract_docx_text(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as docx:
+        root = ElementTree.fromstring(docx.read("word/document.xml"))
+    paragraphs = []
+    for para in root.iter(f"{WORD_NS}p"):
+        chunks = []
+        for node in para.iter():
+            if node.tag == f"{WORD_NS}t":
+                chunks.append(node.text or "")
+            elif node.tag == f"{WORD_NS}tab":
+                chunks.append("\t")
+            elif node.tag in (f"{WORD_NS}br", f"{WORD_NS}cr"):
+                chunks.append("\n")
+        paragraphs.append("".join(chunks))
+    return "\n".join(paragraphs).strip()
+
+
+def extract_text(filename: str, data: bytes, max_pages: int = MAX_PAGES, on_page=None) -> str:
+    """Extract text from a resume file based on its extension."""
+    name = filename.lower()
+    if name.endswith(".pdf"):
+        return extract_pdf_text(data, max_pages, on_page)
+    if name.endswith(".docx"):
+        return extract_docx_text(data)
+    if name.endswith(".txt"):
+        return data.decode("utf-8", "replace").strip()
+    raise ValueError(f"Unsupported resume file type: {filename}")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def extract_text_cached(filename: str, data: bytes, max_pages: int = MAX_PAGES, on_page=None) -> str:
+    """
+    extract_text() memoized on file content, shared across sessions (LRU).
+    On a cache hit `on_page` is called once with the cached page counts, so
+    callers still learn when pages were cut off.
+    """
+    key = (content_hash(data), filename.lower().rsplit(".", 1)[-1], max_pages)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+    if cached is not None:
+        text, pages = cached
+        if on_page and pages:
+            on_page(*pages)
+        return text
+
+    pages = None
+
+    def record(done, limit, total):
+        nonlocal pages
+        pages = (done, limit, total)
+        if on_page:
+            on_page(done, limit, total)
+
+    text = extract_text(filename, data, max_pages, record)
+
+    with _cache_lock:
+        _cache[key] = text, pages
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    return text
@@ -0,0 +1,166 @@
+"""
+utils/startup.py — Cold-Start Warm-Up & Import Timing
+=======================================================
+Heavy libraries (google-genai, fpdf + fontTools, pypdf, numpy) are imported
+on first use, so opening the app only pays for Streamlit itself. To keep the
+first click on "Enhance" or "Generate PDF" fast too, a background warm-up
+started with the server preloads:
+- the Gemini SDK
+- the embedded Unicode fonts (parsed once per process)
+- the sample resume in all five templates (for the template gallery)
+- the PDF text extractor used by the ATS checker
+
+Set SMARTRESUME_WARMUP=0 to skip it (e.g. on tiny replicas).
+
+Startup timing mode — track cold-start regressions:
+    python -m utils.startup            # import time of each page, in fresh processes
+    python -m utils.startup --json     # same, machine-readable
+With SMARTRESUME_STARTUP_TIMING=1 the server also logs each warm-up step.
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+
+WARMUP_ENABLED = os.environ.get("SMARTRESUME_WARMUP", "1").lower() not in ("0", "false", "no")
+STARTUP_TIMING = os.environ.get("SMARTRESUME_STARTUP_TIMING", "").lower() in ("1", "true", "yes")
+VIEW_MODULES = (
+    "views.home", "views.builder", "views.templates", "views.cover_letter",
+    "views.ats_checker", "views.linkedin_summary", "views.guide",
+)
+TOP_IMPORTS = 8
+
+logger = logging.getLogger("smartresume.startup")
+
+warmup_timings = {}      # step → seconds, filled in by the warm-up thread
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+
+# ── Background warm-up ────────────────────────────────────────────────────────
+def _warm_gemini_sdk():
+    importlib.import_module("google.genai")
+
+
+def _warm_fonts():
+    from utils.pdf_fonts import preload_fonts
+    preload_fonts()
+
+
+def _warm_template_samples():
+    from utils.pdf_generator import prerender_samples
+    prerender_samples()
+
+
+def _warm_pdf_text():
+    importlib.import_module("pypdf")
+
+
+WARMUP_STEPS = (
+    ("gemini_sdk", _warm_gemini_sdk),
+    ("fonts", _warm_fonts),
+    ("template_samples", _warm_template_samples),
+    ("pdf_text", _warm_pdf_text),
+)
+
+
+def warmup():
+    """Run every warm-up step, recording how long each took."""
+    started = time.perf_counter()
+    for name, step in WARMUP_STEPS:
+        step_started = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:   # warm-up is best effort; first use will retry
+            logger.warning("Warm-up step %s failed: %s", name, exc)
+        warmup_timings[name] = time.perf_counter() - step_started
+    warmup_timings["total"] = time.perf_counter() - started
+    if STARTUP_TIMING:
+        logger.warning(
+            "Warm-up finished in %.2fs (%s)", warmup_timings["total"],
+            ", ".join(f"{n} {s:.2f}s" for n, s in warmup_timings.items() if n != "total"),
+        )
+
+
+def start_background_warmup():
+    """Start the warm-up once per process on a daemon thread (no-op if disabled)."""
+    global _warmup_thread
+    if not WARMUP_ENABLED:
+        return None
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=warmup, daemon=True, name="warmup")
+            _warmup_thread.start()
+        return _warmup_thread
+
+
+# ── Import timing ─────────────────────────────────────────────────────────────
+def parse_importtime(stderr: str):
+    """
+    [(module, cumulative_seconds, depth)] from `python -X importtime` output;
+    depth 0 is the module imported directly, depth 1 what it imported, etc.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(cumulative) / 1e6, depth))
+    return rows
+
+
+def measure_import(module: str) -> dict:
+    """Import `module` in a fresh interpreter and break down where the time went."""
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=repo_root, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    rows = parse_importtime(result.stderr)
+    own = next((s for name, s, depth in rows if depth == 0 and name == module), 0.0)
+    # Direct imports of the module, slowest first (each counted where first imported)
+    top = sorted(
+        ((name, s) for name, s, depth in rows if depth == 1), key=lambda r: r[1], reverse=True
+    )[:TOP_IMPORTS]
+    return {
+        "module": module,
+        "import_seconds": own,
+        "process_seconds": wall,
+        "ok": result.returncode == 0,
+        "top_imports": [{"module": m, "seconds": round(s, 4)} for m, s in top],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import times per page.")
+    parser.add_argument("modules", nargs="*", default=list(VIEW_MODULES))
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    # Streamlit itself is paid once by every page; measure it on its own too
+    results = [measure_import("streamlit")] + [measure_import(m) for m in args.modules]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    for r in results:
+        status = "" if r["ok"] else "  (import failed)"
+        print(f"{r['module']:<26} {r['import_seconds'] * 1000:8.1f} ms import "
+              f"{r['process_seconds'] * 1000:8.1f} ms process{status}")
+        for row in r["top_imports"][:4]:
+            print(f"    {row['module']:<22} {row['seconds'] * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
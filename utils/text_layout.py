@@ -0,0 +1,104 @@
+"""
+utils/text_layout.py — Font-Metric Line Wrapping
+==================================================
+Wraps text by real glyph widths instead of character counts.
+Helvetica regular / bold / italic widths (the only fonts the resume PDFs
+use) are read once from fpdf's core-font metrics into flat lookup tables,
+scaled per font size on first use, and a greedy single pass over the
+words computes the line breaks — no per-line get_string_width() calls.
+Embedded Unicode (TTF) fonts go through the same pass using their own
+width maps.
+"""
+
+from functools import lru_cache
+
+from fpdf.fonts import CORE_FONTS_CHARWIDTHS
+
+
+PT_TO_MM = 25.4 / 72
+FALLBACK_WIDTH = 556   # width of a digit, used for anything outside latin-1
+
+# Glyph widths in 1/1000 em, indexed by latin-1 code point
+GLYPH_WIDTHS = {
+    style: tuple(CORE_FONTS_CHARWIDTHS[f"helvetica{style}"][chr(i)] for i in range(256))
+    for style in ("", "B", "I", "BI")
+}
+
+
+@lru_cache(maxsize=None)
+def glyph_table(style: str, size: float):
+    """Per-character widths in mm for Helvetica `style` at `size` pt."""
+    scale = size * PT_TO_MM / 1000
+    return tuple(w * scale for w in GLYPH_WIDTHS[style])
+
+
+def text_width(text: str, style: str = "", size: float = 9.5) -> float:
+    table = glyph_table(style, size)
+    fallback = FALLBACK_WIDTH * size * PT_TO_MM / 1000
+    return sum(table[o] if o < 256 else fallback for o in map(ord, text))
+
+
+def wrap_text(text: str, width: float, style: str = "", size: float = 9.5, next_width=None):
+    """Wrap `text` in Helvetica `style` at `size` pt (see wrap_measured)."""
+    table = glyph_table(style, size)
+    fallback = FALLBACK_WIDTH * size * PT_TO_MM / 1000
+    return wrap_measured(
+        text, width, lambda o: table[o] if o < 256 else fallback, next_width
+    )
+
+
+def wrap_font_widths(text: str, width: float, char_widths, size: float, next_width=None):
+    """
+    Wrap using an embedded TTF font's width map (code point → 1/1000 em,
+    e.g. fpdf's TTFFont.cw), so Unicode fonts skip get_string_width() too.
+    """
+    scale = size * PT_TO_MM / 1000
+    return wrap_measured(text, width, lambda o: char_widths[o] * scale, next_width)
+
+
+def wrap_measured(text: str, width: float, char_width, next_width=None):
+    """
+    Greedy word wrap of `text` into lines no wider than `width` mm
+    (`next_width` for every line after the first, e.g. hanging indents).
+    `char_width(code_point)` returns a glyph width in mm.
+    Runs of spaces between words are kept (e.g. the "  |  " separators);
+    spaces at a line break are dropped. Words longer than a whole line are
+    split by character.
+    """
+    space = char_width(32)
+    next_width = width if next_width is None else next_width
+
+    lines = []
+    line, line_w, limit = [], 0.0, width
+    for word in text.split(" "):
+        if not word and not line:
+            continue                      # no leading spaces on a line
+        word_w = sum(map(char_width, map(ord, word)))
+        if line and line_w + space + word_w <= limit:
+            line.append(word)
+            line_w += space + word_w
+            continue
+        if line:
+            lines.append(" ".join(line).rstrip(" "))
+            limit = next_width
+        if not word:
+            line, line_w = [], 0.0
+            continue
+        if word_w <= limit:
+            line, line_w = [word], word_w
+            continue
+        # Hard-break an over-long word (URLs, long tech strings)
+        chunk, chunk_w = "", 0.0
+        for ch in word:
+            ch_w = char_width(ord(ch))
+            if chunk and chunk_w + ch_w > limit:
+                lines.append(chunk)
+                limit = next_width
+                chunk, chunk_w = "", 0.0
+            chunk += ch
+            chunk_w += ch_w
+        line, line_w = [chunk], chunk_w
+
+    if line:
+        lines.append(" ".join(line).rstrip(" "))
+    return lines
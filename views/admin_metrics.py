@@ -0,0 +1,51 @@
+"""
+views/admin_metrics.py — Gemini Usage Panel (Admin)
+Sidebar panel with per-feature call counts, latency, tokens and errors.
+Only shown when SMARTRESUME_ADMIN=1 is set for the server process.
+"""
+import os
+
+import streamlit as st
+
+from utils import llm_metrics
+from utils.gemini_client import get_scheduler
+
+
+def admin_enabled():
+    return os.environ.get("SMARTRESUME_ADMIN", "").lower() in ("1", "true", "yes")
+
+
+def show_sidebar_panel():
+    if not admin_enabled():
+        return
+    with st.sidebar.expander("📊 Gemini Usage (admin)"):
+        rows = llm_metrics.snapshot()
+        if not rows:
+            st.caption("No Gemini calls yet in this server process.")
+            return
+
+        calls = sum(r["calls"] for r in rows)
+        errors = sum(r["errors"] for r in rows)
+        c1, c2 = st.columns(2)
+        c1.metric("Calls", calls)
+        c2.metric("Errors", errors)
+        c3, c4 = st.columns(2)
+        c3.metric("Cache hits", sum(r["cache hits"] for r in rows))
+        c4.metric("Deduplicated", sum(r["deduplicated"] for r in rows))
+        scheduler = get_scheduler()
+        st.caption(
+            f"Queue: {scheduler.queue_length()} waiting, {scheduler.in_flight} in flight "
+            f"(limit {scheduler.bucket.rate * 60:.0f}/min, {scheduler.max_in_flight} concurrent)."
+        )
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+        st.download_button(
+            "⬇️ Prometheus metrics",
+            data=llm_metrics.prometheus_text(),
+            file_name="smartresume_metrics.prom",
+            mime="text/plain",
+            key="admin_metrics_download",
+        )
+        if st.button("Reset counters", key="admin_metrics_reset"):
+            llm_metrics.reset()
+            st.rerun()
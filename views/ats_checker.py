@@ -2,16 +2,190 @@
 views/ats_checker.py — ATS Score Checker
 """
 import streamlit as st
-from utils.gemini_client import generate
-import re
+from utils.gemini_client import generate_json
+from utils.ats_analysis import (
+    MAX_GAPS, MAX_OUTPUT_TOKENS, MAX_RECOMMENDATIONS, MAX_STRENGTHS, RESPONSE_SCHEMA,
+    format_json_report, format_text_report, parse_analysis,
+)
+from utils.ats_scorer import score_resume
+from utils.prompt_prep import prepare_for
+from utils.resume_text import MAX_PAGES, content_hash, extract_text_cached
 
 
-def parse_score(text):
-    """Extract numeric score from Gemini response."""
-    match = re.search(r'\b(\d{1,3})\s*(?:/\s*100|%|out of 100)', text, re.IGNORECASE)
-    if match:
-        return min(int(match.group(1)), 100)
-    return None
+def load_upload(upload):
+    """
+    Extract an uploaded resume into the text area (once per distinct file).
+    Parsing is cached by content hash and capped at MAX_PAGES pages.
+    """
+    data = upload.getvalue()
+    digest = content_hash(data)
+    if st.session_state.get("resume_upload_hash") == digest:
+        if "resume_upload_note" in st.session_state:
+            st.caption(f"ℹ️ {st.session_state['resume_upload_note']}")
+        return
+
+    bar = st.progress(0.0, text="📄 Reading your resume...")
+
+    def report(done, limit, total):
+        bar.progress(done / limit, text=f"📄 Reading page {done} of {limit}")
+        if total > limit:
+            st.session_state["resume_upload_note"] = (
+                f"Only the first {limit} of {total} pages were read."
+            )
+
+    st.session_state.pop("resume_upload_note", None)
+    try:
+        text = extract_text_cached(upload.name, data, MAX_PAGES, on_page=report)
+    except Exception:
+        bar.empty()
+        st.error("⚠️ Could not read this file. Please paste your resume text instead.")
+        return
+    bar.empty()
+
+    st.session_state["resume_upload_hash"] = digest
+    if not text:
+        st.warning("⚠️ No text found — this may be a scanned PDF. Please paste your resume text.")
+        return
+    st.session_state["resume_text"] = text
+    if "resume_upload_note" in st.session_state:
+        st.caption(f"ℹ️ {st.session_state['resume_upload_note']}")
+
+
+def score_gauge(score):
+    if score >= 80:
+        color, emoji, label = "#27ae60", "🟢", "Excellent Match!"
+    elif score >= 60:
+        color, emoji, label = "#f39c12", "🟡", "Good Match — Minor Improvements Needed"
+    elif score >= 40:
+        color, emoji, label = "#e67e22", "🟠", "Average — Significant Improvements Needed"
+    else:
+        color, emoji, label = "#e74c3c", "🔴", "Poor Match — Major Changes Required"
+
+    st.markdown(
+        f"""
+        <div style='
+            text-align:center;
+            background:linear-gradient(135deg, {color}15, {color}30);
+            border: 2px solid {color};
+            border-radius:16px;
+            padding:24px;
+            margin-bottom:20px;
+        '>
+            <div style='font-size:3.5rem; font-weight:bold; color:{color};'>{emoji} {score}/100</div>
+            <div style='font-size:1.1rem; color:{color}; font-weight:600;'>{label}</div>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    # Progress bar
+    st.progress(score / 100)
+
+
+def show_advice(analysis):
+    """Gemini's part of the analysis as native widgets."""
+    if analysis.gaps:
+        st.markdown("**🧩 Gaps for This Role**")
+        for gap in analysis.gaps:
+            st.warning(gap, icon="⚠️")
+    if analysis.strengths:
+        st.markdown("**💪 Strengths**")
+        for strength in analysis.strengths:
+            st.success(strength, icon="✅")
+    if analysis.recommendations:
+        st.markdown("**🛠️ Recommendations**")
+        with st.container(border=True):
+            st.markdown("\n".join(f"{n}. {r}" for n, r in enumerate(analysis.recommendations, 1)))
+    if analysis.verdict:
+        st.markdown("**⚖️ Verdict**")
+        st.info(analysis.verdict)
+
+
+def run_analysis(resume_text, job_desc, key="ats"):
+    """Local score + keyword lists, then structured Gemini advice and downloads."""
+    # ── Local score (instant, reproducible) ───────────────────────────────────
+    local = score_resume(resume_text, job_desc)
+    matched = ", ".join(local.matched) or "(none)"
+    missing = ", ".join(local.missing) or "(none)"
+
+    # Score gauge
+    score_gauge(local.score)
+
+    kc1, kc2 = st.columns(2)
+    with kc1:
+        st.markdown("**✅ Matched Keywords**")
+        st.markdown("\n".join(f"- {k}" for k in local.matched) or "*None found*")
+    with kc2:
+        st.markdown("**❌ Missing Keywords**")
+        st.markdown("\n".join(f"- {k}" for k in local.missing) or "*None — great coverage!*")
+
+    # Gemini only writes the advice, as JSON matching RESPONSE_SCHEMA; score and
+    # keywords are precomputed, and both texts are compacted before prompting
+    resume = prepare_for("ats", resume_text)
+    jd = prepare_for("ats", job_desc)
+    prompt = f"""
+You are an expert ATS (Applicant Tracking System) analyzer.
+
+A keyword scan has already compared this resume with the job description.
+
+JOB DESCRIPTION:
+{jd.text}
+
+RESUME:
+{resume.text}
+
+ATS MATCH SCORE: {local.score}/100
+MATCHED KEYWORDS: {matched}
+MISSING KEYWORDS: {missing}
+
+Using the job description and the keyword results above, return:
+- gaps: up to {MAX_GAPS} requirements of the job description the resume does not show
+- strengths: {MAX_STRENGTHS - 1}-{MAX_STRENGTHS} things the resume does well for this role
+- recommendations: {MAX_RECOMMENDATIONS} specific, actionable suggestions to improve the resume for this role
+- verdict: one paragraph honest assessment — should they apply? What's their chance?
+"""
+    # Full analysis
+    reply = generate_json(
+        prompt,
+        RESPONSE_SCHEMA,
+        "🔍 Writing recommendations for your resume...",
+        feature="ats",
+        max_output_tokens=MAX_OUTPUT_TOKENS,
+    )
+    analysis = parse_analysis(local, reply)
+    if analysis.has_advice:
+        show_advice(analysis)
+    else:
+        st.warning("⚠️ The AI recommendations could not be read this time. Your score and keywords above are complete.")
+    before = resume.tokens_before + jd.tokens_before
+    after = resume.tokens_after + jd.tokens_after
+    if before > after:
+        st.caption(
+            f"✂️ Sent ~{after:,} instead of ~{before:,} tokens of resume and job description "
+            f"text to the AI (saved ~{before - after:,}"
+            + (", kept the most relevant sections" if resume.truncated or jd.truncated else "") + ")."
+        )
+
+    # Download report
+    dc1, dc2 = st.columns(2)
+    with dc1:
+        st.download_button(
+            "⬇️ Download ATS Report as .txt",
+            data=format_text_report(analysis),
+            file_name="ATS_Score_Report.txt",
+            mime="text/plain",
+            key=f"{key}_download",
+            use_container_width=True,
+        )
+    with dc2:
+        st.download_button(
+            "⬇️ Download ATS Report as .json",
+            data=format_json_report(analysis),
+            file_name="ATS_Score_Report.json",
+            mime="application/json",
+            key=f"{key}_download_json",
+            use_container_width=True,
+        )
 
 
 def show():
@@ -20,7 +194,7 @@ def show():
         <h1 style='color:#6C63FF;'>🎯 ATS Score Checker</h1>
         <p style='color:gray;'>
             ATS (Applicant Tracking System) filters resumes before a human ever sees them.
-            Paste your resume and the job description below to get your match score and fix suggestions.
+            Upload or paste your resume and the job description below to get your match score and fix suggestions.
         </p>
         <hr/>
         """,
@@ -49,10 +223,31 @@ def show():
 
     st.markdown("---")
 
+    mode = st.radio(
+        "Mode",
+        ["🎯 One job description", "📚 Job description library", "👥 Rank many resumes"],
+        horizontal=True,
+        label_visibility="collapsed",
+    )
+    if mode == "📚 Job description library":
+        from views.jd_library import show as show_library
+        show_library()
+        return
+    if mode == "👥 Rank many resumes":
+        from views.bulk_ranking import show as show_bulk
+        show_bulk()
+        return
+
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("📄 Your Resume Content")
+        upload = st.file_uploader(
+            "Upload your resume (PDF / DOCX) — or paste the text below",
+            type=["pdf", "docx", "txt"],
+        )
+        if upload is not None:
+            load_upload(upload)
         resume_text = st.text_area(
             "Paste your resume text here",
             height=300,
@@ -75,98 +270,6 @@ def show():
         if not resume_text.strip() or not job_desc.strip():
             st.error("⚠️ Please paste both your resume text and the job description.")
         else:
-            prompt = f"""
-You are an expert ATS (Applicant Tracking System) analyzer.
-
-Analyze how well this resume matches the given job description.
-
-RESUME:
-{resume_text}
-
-JOB DESCRIPTION:
-{job_desc}
-
-Provide a detailed analysis in this EXACT format:
-
-ATS MATCH SCORE: [X]/100
-
-MATCHED KEYWORDS:
-[List keywords/skills found in both resume and JD, one per line with •]
-
-MISSING KEYWORDS:
-[List important keywords from JD missing in resume, one per line with •]
-
-SKILL GAPS:
-[List specific skills/qualifications missing, one per line with •]
-
-STRENGTHS:
-[2-3 things the resume does well for this role, one per line with •]
-
-RECOMMENDATIONS:
-[5 specific, actionable suggestions to improve the resume for this role, numbered 1-5]
-
-VERDICT:
-[One paragraph honest assessment — should they apply? What's their chance?]
-"""
-            result = generate(prompt, "🔍 Analyzing your resume against the job description...")
-
-            # ── Parse score ───────────────────────────────────────────────────
-            score = parse_score(result)
-
             st.markdown("---")
             st.subheader("📊 Your ATS Analysis")
-
-            # Score gauge
-            if score is not None:
-                if score >= 80:
-                    color, emoji, label = "#27ae60", "🟢", "Excellent Match!"
-                elif score >= 60:
-                    color, emoji, label = "#f39c12", "🟡", "Good Match — Minor Improvements Needed"
-                elif score >= 40:
-                    color, emoji, label = "#e67e22", "🟠", "Average — Significant Improvements Needed"
-                else:
-                    color, emoji, label = "#e74c3c", "🔴", "Poor Match — Major Changes Required"
-
-                st.markdown(
-                    f"""
-                    <div style='
-                        text-align:center;
-                        background:linear-gradient(135deg, {color}15, {color}30);
-                        border: 2px solid {color};
-                        border-radius:16px;
-                        padding:24px;
-                        margin-bottom:20px;
-                    '>
-                        <div style='font-size:3.5rem; font-weight:bold; color:{color};'>{emoji} {score}/100</div>
-                        <div style='font-size:1.1rem; color:{color}; font-weight:600;'>{label}</div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True,
-                )
-
-                # Progress bar
-                st.progress(score / 100)
-
-            # Full analysis
-            st.markdown(
-                f"""
-                <div style='
-                    background:#f8f9ff;
-                    border-left:4px solid #6C63FF;
-                    border-radius:8px;
-                    padding:20px 24px;
-                    line-height:1.8;
-                    white-space:pre-wrap;
-                    font-size:0.95rem;
-                '>{result}</div>
-                """,
-                unsafe_allow_html=True,
-            )
-
-            # Download report
-            st.download_button(
-                "⬇️ Download ATS Report as .txt",
-                data=result,
-                file_name="ATS_Score_Report.txt",
-                mime="text/plain",
-            )
+            run_analysis(resume_text, job_desc)
@@ -4,11 +4,564 @@ views/builder.py — Comprehensive Resume Builder
 Collects all resume data from the user with a step-by-step form.
 AI enhances each section using Gemini.
 Generates a downloadable PDF.
+
+Each step is its own fragment, so typing in one step reruns only that step.
+Education, experience and project entries live in a single model dict in
+session state; only the entry being edited has widgets, the others are shown
+as one-line rows with Edit / Remove buttons.
+
+The model and any AI-enhanced text are saved as a draft (utils/draft_store.py)
+under a token kept in the page URL, and reloaded from it in a new session.
+
+Optionally, Enhance prompts that have stopped changing are answered in the
+background (utils/prefetch.py), so the Enhance buttons respond instantly.
 """
 
+import time
+
 import streamlit as st
-from utils.gemini_client import generate
-from utils.pdf_generator import build_pdf, TEMPLATES
+from utils.draft_store import DraftStore
+from utils.gemini_client import (
+    generate, generate_many, generate_packed, get_cache, get_client, get_scheduler, session_id,
+)
+from utils.prefetch import MAX_PER_SESSION as PREFETCH_MAX_CALLS, Prefetcher
+from utils.prompts import experience_prompt, project_prompt, summary_prompt
+from utils.resume_templates import TEMPLATES, MissingFontsError, pdf_cache_key
+from utils.pdf_preview import HAS_RASTERIZER, cached_thumbnail, render_all_thumbnails, render_pages
+
+
+MODEL_KEY = "builder"
+MISSING_FONTS_MESSAGE = (
+    "⚠️ Your resume uses letters (e.g. Hindi, Telugu or Tamil) that need fonts this server "
+    "does not have yet. Ask your administrator to run `python -m utils.pdf_fonts`."
+)
+PERSONAL_FIELDS = ("name", "email", "phone", "location", "linkedin", "github", "target_role")
+SKILL_FIELDS = {                 # field → label used in the PDF's skills block
+    "prog_langs": "Languages",
+    "frameworks": "Frameworks",
+    "databases": "Databases",
+    "tools": "Tools",
+    "cloud": "Cloud/DevOps",
+    "soft_skills": "Soft Skills",
+}
+ENTRY_FIELDS = {
+    "education": ("degree", "institution", "year", "grade"),
+    "experience": ("role", "company", "duration", "description"),
+    "projects": ("name", "tech", "link", "description"),
+}
+ENTRY_LABELS = {                 # section → (icon, singular label)
+    "education": ("📚", "Education"),
+    "experience": ("🏢", "Experience"),
+    "projects": ("💡", "Project"),
+}
+DEFAULT_ENTRIES = {"education": 2, "experience": 1, "projects": 2}
+DRAFT_VERSION = 1
+PREVIEW_POLL_SECONDS = 5.0       # idle ticks only hash the model and redraw cached pages
+WIDGET_PREFIXES = ("personal_", "summary_", "edu_", "exp_", "proj_", "skill_", "extras_")
+
+
+def enhance_feature(state_key):
+    """Metrics tag for an "Enhance All" job from its session-state key."""
+    if state_key.startswith("exp_"):
+        return "builder_experience"
+    if state_key.startswith("proj_"):
+        return "builder_project"
+    return "builder_summary"
+
+
+# ── Builder Model ─────────────────────────────────────────────────────────────
+def new_entry(model, section):
+    """A blank entry with a stable id (widget keys and enhanced text use it)."""
+    entry = {"id": model["next_id"], **{field: "" for field in ENTRY_FIELDS[section]}}
+    model["next_id"] += 1
+    return entry
+
+
+def new_model():
+    model = {field: "" for field in PERSONAL_FIELDS}
+    model.update(summary="", achievements="", extra="", next_id=0, active={})
+    model["skills"] = {field: "" for field in SKILL_FIELDS}
+    for section, count in DEFAULT_ENTRIES.items():
+        model[section] = [new_entry(model, section) for _ in range(count)]
+        model["active"][section] = model[section][0]["id"] if model[section] else None
+    return model
+
+
+def get_model():
+    """The builder model, restored from the user's saved draft in a new session."""
+    if MODEL_KEY not in st.session_state:
+        draft = get_draft_store().load(draft_token())
+        if draft and draft.get("version") == DRAFT_VERSION:
+            st.session_state.update(draft["enhanced"])
+            st.session_state[MODEL_KEY] = draft["model"]
+        else:
+            st.session_state[MODEL_KEY] = new_model()
+    return st.session_state[MODEL_KEY]
+
+
+def enhanced_key(section, entry_id):
+    return f"{'exp' if section == 'experience' else 'proj'}_enhanced_{entry_id}"
+
+
+def enhanced_keys(model):
+    """Session-state keys that may hold AI-enhanced text for this model."""
+    return ["summary_enhanced"] + [
+        enhanced_key(section, entry["id"])
+        for section in ("experience", "projects") for entry in model[section]
+    ]
+
+
+# ── Drafts ────────────────────────────────────────────────────────────────────
+@st.cache_resource
+def get_draft_store():
+    """Process-wide draft store shared by every session."""
+    return DraftStore()
+
+
+def draft_token():
+    """
+    This user's draft token, kept in the URL (?draft=…) so a refresh finds the
+    draft. Only tokens the draft store issued (and signed) are taken from the URL.
+    """
+    token = st.session_state.get("draft_token")
+    if token is None:
+        store = get_draft_store()
+        token = st.query_params.get("draft", "")
+        if not store.is_valid_token(token):
+            token = store.issue_token()
+        st.session_state["draft_token"] = token
+    if st.query_params.get("draft") != token:
+        st.query_params["draft"] = token
+    return token
+
+
+def save_draft(model):
+    """Queue the draft for writing (write-behind; unchanged drafts are skipped)."""
+    enhanced = {k: st.session_state[k] for k in enhanced_keys(model) if k in st.session_state}
+    if not enhanced and model == new_model():
+        return   # nothing entered yet
+    get_draft_store().save(
+        draft_token(), {"version": DRAFT_VERSION, "model": model, "enhanced": enhanced}
+    )
+
+
+def start_over():
+    """Forget the draft and every builder input, in this session and on disk."""
+    model = st.session_state.get(MODEL_KEY)
+    if model is not None:
+        for key in enhanced_keys(model):
+            st.session_state.pop(key, None)
+    for key in list(st.session_state):
+        if isinstance(key, str) and key.startswith(WIDGET_PREFIXES):
+            del st.session_state[key]
+    get_draft_store().delete(draft_token())
+    st.session_state[MODEL_KEY] = new_model()
+    if "builder_prefetcher" in st.session_state:
+        st.session_state["builder_prefetcher"].cancel_all()
+
+
+# ── Speculative Prefetch ──────────────────────────────────────────────────────
+def prefetch_enhancements(model):
+    """
+    If the user opted in, keep background prefetches in line with the current
+    Enhance prompts (new ones start after a quiet period, changed ones are
+    cancelled). Nothing is prefetched until a target role is set.
+    """
+    prefetcher = st.session_state.get("builder_prefetcher")
+    if not st.session_state.get("builder_prefetch"):
+        if prefetcher is not None:
+            prefetcher.cancel_all()
+        return
+    jobs = enhance_jobs_from(model) if model["target_role"] else []
+    if prefetcher is None:
+        if not jobs:
+            return
+        prefetcher = st.session_state["builder_prefetcher"] = Prefetcher(session_id())
+    prefetcher.update(jobs, get_client(), get_cache(), get_scheduler())
+
+
+def is_blank(entry):
+    return not any(v.strip() for k, v in entry.items() if k != "id")
+
+
+def enhance_jobs_from(model):
+    """[(session-state key, prompt)] for every section "Enhance All" can rewrite."""
+    target_role = model["target_role"]
+    jobs = []
+    if model["summary"] and target_role:
+        jobs.append(("summary_enhanced", summary_prompt(model["summary"], target_role)))
+    for exp in model["experience"]:
+        if exp["description"]:
+            jobs.append((enhanced_key("experience", exp["id"]), experience_prompt(
+                exp["role"], exp["company"], exp["description"], target_role)))
+    for proj in model["projects"]:
+        if proj["description"]:
+            jobs.append((enhanced_key("projects", proj["id"]), project_prompt(
+                proj["name"], proj["tech"], proj["description"])))
+    return jobs
+
+
+def resume_data_from(model, enhanced):
+    """The dict build_pdf() expects; AI-enhanced text (from `enhanced`) wins if present."""
+    projects = []
+    for proj in model["projects"]:
+        if is_blank(proj):
+            continue
+        link_text = f" | {proj['link']}" if proj["link"] else ""
+        projects.append(enhanced.get(
+            enhanced_key("projects", proj["id"]),
+            f"• {proj['name']} ({proj['tech']}){link_text}: {proj['description']}",
+        ))
+
+    skills = model["skills"]
+    return {
+        **{field: model[field] for field in PERSONAL_FIELDS if field != "target_role"},
+        "summary": enhanced.get("summary_enhanced", model["summary"]),
+        "education": [
+            {f: e[f] for f in ENTRY_FIELDS["education"]}
+            for e in model["education"] if not is_blank(e)
+        ],
+        "experience": [
+            {f: e[f] for f in ENTRY_FIELDS["experience"]}
+            for e in model["experience"] if not is_blank(e)
+        ],
+        "projects": "\n".join(projects),
+        "skills": "\n".join(f"{label}: {skills[f]}" for f, label in SKILL_FIELDS.items() if skills[f]),
+        "achievements": model["achievements"],
+        "extra": model["extra"],
+    }
+
+
+def current_resume_data():
+    """The user's resume as entered so far, or None if the builder was never opened."""
+    if MODEL_KEY not in st.session_state:
+        return None
+    return resume_data_from(st.session_state[MODEL_KEY], st.session_state)
+
+
+# ── Bound Widgets ─────────────────────────────────────────────────────────────
+def bound_input(container, record, field, label, key, area=False, **kwargs):
+    """
+    Text widget whose value lives in `record[field]`, so it survives the
+    widget being unmounted (collapsed entry, closed step) and remounted.
+    """
+    if key not in st.session_state:
+        st.session_state[key] = record[field]
+    widget = container.text_area if area else container.text_input
+    record[field] = widget(label, key=key, **kwargs)
+    return record[field]
+
+
+def show_enhanced(state_key, title, height):
+    """Show AI-enhanced text (kept in session state under `state_key`)."""
+    if state_key not in st.session_state:
+        return
+    display_key = state_key.replace("_enhanced", "_display")
+    if display_key not in st.session_state:
+        st.session_state[display_key] = st.session_state[state_key]
+    st.success(title)
+    st.text_area(title, key=display_key, height=height, label_visibility="collapsed")
+
+
+def store_enhanced(state_key, text):
+    st.session_state[state_key] = text
+    st.session_state.pop(state_key.replace("_enhanced", "_display"), None)
+
+
+# ── Entry Editors ─────────────────────────────────────────────────────────────
+def education_fields(entry, number, model):
+    key = f"edu_{entry['id']}"
+    ec1, ec2, ec3, ec4 = st.columns([3, 3, 2, 2])
+    bound_input(ec1, entry, "degree", "Degree / Board", f"{key}_degree", placeholder="B.Tech CSE / Class 12")
+    bound_input(ec2, entry, "institution", "College / School", f"{key}_institution", placeholder="JNTU Hyderabad")
+    bound_input(ec3, entry, "year", "Year", f"{key}_year", placeholder="2020 – 2024")
+    bound_input(ec4, entry, "grade", "CGPA / %", f"{key}_grade", placeholder="8.5 / 10")
+
+
+def experience_fields(entry, number, model):
+    key = f"exp_{entry['id']}"
+    xc1, xc2, xc3 = st.columns([3, 3, 2])
+    bound_input(xc1, entry, "role", "Role / Designation", f"{key}_role", placeholder="Data Science Intern")
+    bound_input(xc2, entry, "company", "Company / Organization", f"{key}_company", placeholder="TCS / StartupXYZ")
+    bound_input(xc3, entry, "duration", "Duration", f"{key}_duration", placeholder="May 2023 – Jul 2023")
+    bound_input(
+        st, entry, "description", "What did you do? (bullet points preferred)", f"{key}_description",
+        area=True,
+        placeholder="• Built a sentiment analysis model with 87% accuracy using LSTM\n• Automated report generation saving 5 hours per week\n• Collaborated with a team of 4 engineers",
+        height=100,
+    )
+    state_key = enhanced_key("experience", entry["id"])
+    if st.button(f"🤖 Enhance Experience {number} with AI", key=f"enhance_{key}"):
+        if entry["description"]:
+            prompt = experience_prompt(entry["role"], entry["company"], entry["description"], model["target_role"])
+            store_enhanced(state_key, generate(
+                prompt, f"✨ Enhancing experience {number}...", feature="builder_experience"
+            ))
+        else:
+            st.warning("Please enter description first.")
+    show_enhanced(state_key, f"✅ Enhanced Experience {number}:", 100)
+
+
+def project_fields(entry, number, model):
+    key = f"proj_{entry['id']}"
+    pc1, pc2 = st.columns(2)
+    bound_input(pc1, entry, "name", "Project Name", f"{key}_name", placeholder="Fake News Detector")
+    bound_input(pc2, entry, "tech", "Technologies Used", f"{key}_tech", placeholder="Python, NLP, LSTM, Flask")
+    bound_input(st, entry, "link", "GitHub / Live Link (optional)", f"{key}_link", placeholder="github.com/priya/fake-news")
+    bound_input(
+        st, entry, "description", "Project Description", f"{key}_description",
+        area=True,
+        placeholder="Built a machine learning model to classify news articles as real or fake with 94% accuracy.",
+        height=80,
+    )
+    state_key = enhanced_key("projects", entry["id"])
+    if st.button(f"🤖 Enhance Project {number} with AI", key=f"enhance_{key}"):
+        if entry["description"]:
+            prompt = project_prompt(entry["name"], entry["tech"], entry["description"])
+            store_enhanced(state_key, generate(
+                prompt, f"✨ Enhancing project {number}...", feature="builder_project"
+            ))
+    show_enhanced(state_key, f"✅ Enhanced Project {number}:", 70)
+
+
+ENTRY_EDITORS = {
+    "education": education_fields,
+    "experience": experience_fields,
+    "projects": project_fields,
+}
+
+
+@st.fragment
+def entry_editor(section, entry, number, model):
+    """The one expanded entry of a section; typing here reruns only this."""
+    ENTRY_EDITORS[section](entry, number, model)
+    save_draft(model)
+    prefetch_enhancements(model)
+
+
+def entry_title(section, entry):
+    if section == "education":
+        parts = (entry["degree"], entry["institution"], entry["year"])
+    elif section == "experience":
+        parts = (entry["role"], entry["company"], entry["duration"])
+    else:
+        parts = (entry["name"], entry["tech"])
+    return " · ".join(p for p in parts if p) or "*(empty)*"
+
+
+def set_active(model, section, entry_id):
+    model["active"][section] = entry_id
+
+
+def add_entry(model, section):
+    entry = new_entry(model, section)
+    model[section].append(entry)
+    model["active"][section] = entry["id"]
+
+
+def remove_entry(model, section, entry_id):
+    model[section] = [e for e in model[section] if e["id"] != entry_id]
+    st.session_state.pop(enhanced_key(section, entry_id), None)
+    if model["active"].get(section) == entry_id:
+        model["active"][section] = None
+
+
+@st.fragment
+def entry_list(section, model):
+    """All entries of one section: the active one editable, the rest collapsed."""
+    icon, label = ENTRY_LABELS[section]
+    active = model["active"].get(section)
+
+    # Buttons change the model in on_click callbacks, which run before this
+    # fragment reruns, so it renders the new layout straight away.
+    for number, entry in enumerate(model[section], start=1):
+        entry_id = entry["id"]
+        c1, c2, c3 = st.columns([8, 1, 1], vertical_alignment="center")
+        if entry_id == active:
+            c1.markdown(f"**{icon} {label} {number}**")
+            c2.button("✔️", key=f"{section}_done_{entry_id}", help="Done editing",
+                      on_click=set_active, args=(model, section, None))
+        else:
+            c1.markdown(f"**{icon} {label} {number}** — {entry_title(section, entry)}")
+            c2.button("✏️", key=f"{section}_edit_{entry_id}", help="Edit",
+                      on_click=set_active, args=(model, section, entry_id))
+        c3.button("🗑️", key=f"{section}_remove_{entry_id}", help="Remove",
+                  on_click=remove_entry, args=(model, section, entry_id))
+        if entry_id == active:
+            with st.container(border=True):
+                entry_editor(section, entry, number, model)
+
+    st.button(f"➕ Add {label}", key=f"{section}_add", on_click=add_entry, args=(model, section))
+    save_draft(model)
+    prefetch_enhancements(model)
+
+
+# ── Steps ─────────────────────────────────────────────────────────────────────
+@st.fragment
+def personal_step(model):
+    st.markdown("*These details appear at the top of your resume.*")
+    c1, c2 = st.columns(2)
+    bound_input(c1, model, "name", "Full Name *", "personal_name", placeholder="Priya Sharma")
+    bound_input(c1, model, "email", "Email Address *", "personal_email", placeholder="priya@gmail.com")
+    bound_input(c1, model, "phone", "Phone Number *", "personal_phone", placeholder="+91 9876543210")
+    bound_input(c2, model, "location", "City, State *", "personal_location", placeholder="Hyderabad, Telangana")
+    bound_input(c2, model, "linkedin", "LinkedIn URL", "personal_linkedin", placeholder="linkedin.com/in/priyasharma")
+    bound_input(c2, model, "github", "GitHub URL", "personal_github", placeholder="github.com/priyasharma")
+    bound_input(st, model, "target_role", "🎯 Target Job Role / Internship *", "personal_target_role",
+                placeholder="Data Science Intern / Software Developer")
+    save_draft(model)
+    prefetch_enhancements(model)
+
+
+@st.fragment
+def summary_step(model):
+    st.markdown("*2-3 sentences about who you are and what you bring. AI will polish it.*")
+    summary = bound_input(
+        st, model, "summary", "Write your summary (or leave rough notes — AI will fix it)", "summary_input",
+        area=True,
+        placeholder="Final year B.Tech CSE student with interests in data science and ML. Built 3 projects using Python and TensorFlow. Looking for a data science internship.",
+        height=100,
+    )
+    if st.button("🤖 Enhance Summary with AI", key="enhance_summary"):
+        if summary and model["target_role"]:
+            prompt = summary_prompt(summary, model["target_role"])
+            store_enhanced("summary_enhanced", generate(
+                prompt, "✨ Enhancing your summary...", feature="builder_summary"
+            ))
+        else:
+            st.warning("Please fill in your summary and target role first.")
+
+    if "summary_enhanced" in st.session_state:
+        show_enhanced("summary_enhanced", "✅ AI-Enhanced Summary:", 90)
+        st.caption("Copy the above and paste it as your final summary.")
+    save_draft(model)
+    prefetch_enhancements(model)
+
+
+@st.fragment
+def skills_step(model):
+    st.markdown("*Be specific. Group by category for better readability.*")
+    skills = model["skills"]
+    c1, c2 = st.columns(2)
+    bound_input(c1, skills, "prog_langs", "Programming Languages", "skill_prog_langs", placeholder="Python, Java, C++, JavaScript")
+    bound_input(c1, skills, "frameworks", "Frameworks & Libraries", "skill_frameworks", placeholder="TensorFlow, React, Django, Flask")
+    bound_input(c1, skills, "databases", "Databases", "skill_databases", placeholder="MySQL, MongoDB, PostgreSQL")
+    bound_input(c2, skills, "tools", "Tools & Platforms", "skill_tools", placeholder="Git, Docker, VS Code, Jupyter")
+    bound_input(c2, skills, "cloud", "Cloud / DevOps (if any)", "skill_cloud", placeholder="AWS, GCP, GitHub Actions")
+    bound_input(c2, skills, "soft_skills", "Soft Skills", "skill_soft_skills", placeholder="Team Player, Problem Solving, Communication")
+    save_draft(model)
+
+
+@st.fragment
+def extras_step(model):
+    bound_input(
+        st, model, "achievements", "Achievements & Certifications", "extras_achievements",
+        area=True,
+        placeholder="• Google Data Analytics Certificate – Coursera (2023)\n• Ranked Top 5% in HackerRank Python Assessment\n• Won 1st place in College Hackathon (2023)",
+        height=90,
+    )
+    bound_input(
+        st, model, "extra", "Extra-Curricular Activities", "extras_extra",
+        area=True,
+        placeholder="• NSS Volunteer – Organized blood donation camp for 200+ participants\n• Technical Lead, College Coding Club (2022-23)",
+        height=80,
+    )
+    save_draft(model)
+
+
+@st.fragment
+def enhance_all_step(model):
+    enhance_jobs = enhance_jobs_from(model)
+    st.caption(f"Rewrites your summary, experiences and projects together ({len(enhance_jobs)} section(s) ready).")
+    pack_requests = st.checkbox(
+        "Pack everything into a single AI request",
+        help="Uses one API call instead of one per section. Slightly slower per call, but gentler on rate limits.",
+    )
+    if st.button("✨ Enhance All Sections", use_container_width=True, key="enhance_all"):
+        if not enhance_jobs:
+            st.warning("Fill in your summary (with target role), experiences or projects first.")
+        else:
+            prompts = [prompt for _, prompt in enhance_jobs]
+            spinner_text = f"✨ Enhancing {len(prompts)} sections..."
+            if pack_requests:
+                results = generate_packed(prompts, spinner_text, feature="builder_enhance_all")
+            else:
+                features = [enhance_feature(state_key) for state_key, _ in enhance_jobs]
+                results = generate_many(prompts, spinner_text, feature=features)
+
+            failed = 0
+            for (state_key, _), improved in zip(enhance_jobs, results):
+                if improved:
+                    store_enhanced(state_key, improved)
+                else:
+                    failed += 1
+            if failed:
+                st.warning(f"⚠️ {failed} section(s) could not be enhanced. Try again or use the individual buttons.")
+            else:
+                st.rerun()   # the enhanced text shows up in the other steps
+
+
+# ── Live Preview ──────────────────────────────────────────────────────────────
+@st.fragment(run_every=PREVIEW_POLL_SECONDS)
+def live_preview(model):
+    """
+    Pages of the resume in the selected template, beside the form. Checks the
+    model every PREVIEW_POLL_SECONDS (or on "Refresh") and re-renders only if
+    it changed; the section layout cache keeps a re-render to tens of
+    milliseconds.
+    """
+    p1, p2 = st.columns([3, 1], vertical_alignment="center")
+    if not p1.toggle("Show live preview", value=True, key="live_preview"):
+        return
+    p2.button("🔄", key="preview_refresh", help="Refresh the preview now")
+    if not HAS_RASTERIZER:
+        st.caption("Install `pypdfium2` to see your resume here as you type.")
+        return
+
+    template_name = st.session_state.get("builder_template", next(iter(TEMPLATES)))
+    resume_data = resume_data_from(model, st.session_state)
+    key = pdf_cache_key(resume_data, template_name)
+    shown = st.session_state.get("preview_shown")
+    if shown is None or shown[0] != key:
+        started = time.perf_counter()
+        try:
+            pages = render_pages(resume_data, template_name)
+        except MissingFontsError:
+            st.error(MISSING_FONTS_MESSAGE)
+            return
+        shown = (key, pages, time.perf_counter() - started)
+        st.session_state["preview_shown"] = shown
+
+    _, pages, seconds = shown
+    st.caption(f"Rendered in {seconds * 1000:.0f} ms · {template_name} · updates every {PREVIEW_POLL_SECONDS:.0f} s")
+    for number, png in enumerate(pages, start=1):
+        st.image(png, caption=f"Page {number}" if len(pages) > 1 else None, use_container_width=True)
+
+
+# ── Template Previews ─────────────────────────────────────────────────────────
+def show_template_previews(resume_data, template_name):
+    """Gallery of the resume in all templates, with the selected one marked."""
+    if not HAS_RASTERIZER:
+        return
+    with st.expander("👀 Preview your resume in every template"):
+        if st.button("🖼️ Render Previews", key="render_previews"):
+            try:
+                with st.spinner("🖼️ Rendering previews in all templates..."):
+                    render_all_thumbnails(resume_data)
+            except MissingFontsError:
+                st.error(MISSING_FONTS_MESSAGE)
+                return
+
+        selected = cached_thumbnail(resume_data, template_name)
+        if selected is None:
+            st.caption("Click **Render Previews** to see your resume in all five templates.")
+            return
+
+        cols = st.columns(len(TEMPLATES))
+        for col, tname in zip(cols, TEMPLATES):
+            png = cached_thumbnail(resume_data, tname)
+            if png is not None:
+                col.image(png, caption=("✅ " if tname == template_name else "") + tname)
 
 
 def show():
@@ -20,6 +573,19 @@ def show():
         """,
         unsafe_allow_html=True,
     )
+    model = get_model()
+    d1, d2 = st.columns([4, 1], vertical_alignment="center")
+    d1.caption("💾 Your draft is saved automatically — bookmark this page to come back to it later. "
+               "Don't share the link: it opens your draft.")
+    d2.button("🗑️ Start Over", key="builder_start_over", on_click=start_over,
+              help="Clear every field and delete the saved draft.")
+    st.toggle(
+        "⚡ Prepare AI enhancements in the background",
+        key="builder_prefetch",
+        help="Once your target role is set, each summary, experience or project you stop editing "
+             "for a few seconds is enhanced in the background, so its Enhance button answers instantly. "
+             f"Uses at most {PREFETCH_MAX_CALLS} extra AI requests per session.",
+    )
 
     # ── Progress Tracker ──────────────────────────────────────────────────────
     steps = ["Personal Info", "Education", "Experience", "Projects", "Skills", "Extras", "Generate"]
@@ -30,209 +596,45 @@ def show():
     progress_html += "</div>"
     st.markdown(progress_html, unsafe_allow_html=True)
 
-    # ════════════════════════════════════════════════════════════════════════
-    # SECTION 1 — Personal Info
-    # ════════════════════════════════════════════════════════════════════════
-    with st.expander("👤 Step 1 — Personal Information", expanded=True):
-        st.markdown("*These details appear at the top of your resume.*")
-        c1, c2 = st.columns(2)
-        with c1:
-            name      = st.text_input("Full Name *", placeholder="Priya Sharma")
-            email     = st.text_input("Email Address *", placeholder="priya@gmail.com")
-            phone     = st.text_input("Phone Number *", placeholder="+91 9876543210")
-        with c2:
-            location  = st.text_input("City, State *", placeholder="Hyderabad, Telangana")
-            linkedin  = st.text_input("LinkedIn URL", placeholder="linkedin.com/in/priyasharma")
-            github    = st.text_input("GitHub URL", placeholder="github.com/priyasharma")
-        target_role   = st.text_input("🎯 Target Job Role / Internship *", placeholder="Data Science Intern / Software Developer")
+    form_col, preview_col = st.columns([3, 2], gap="large")
+    with form_col:
+        # ════════════════════════════════════════════════════════════════════
+        # SECTIONS 1-7 — each step reruns on its own while the user types
+        # ════════════════════════════════════════════════════════════════════
+        with st.expander("👤 Step 1 — Personal Information", expanded=True):
+            personal_step(model)
 
-    # ════════════════════════════════════════════════════════════════════════
-    # SECTION 2 — Professional Summary
-    # ════════════════════════════════════════════════════════════════════════
-    with st.expander("🗒️ Step 2 — Professional Summary", expanded=False):
-        st.markdown("*2-3 sentences about who you are and what you bring. AI will polish it.*")
-        summary = st.text_area(
-            "Write your summary (or leave rough notes — AI will fix it)",
-            placeholder="Final year B.Tech CSE student with interests in data science and ML. Built 3 projects using Python and TensorFlow. Looking for a data science internship.",
-            height=100,
-            key="summary_input",
-        )
-        if st.button("🤖 Enhance Summary with AI", key="enhance_summary"):
-            if summary and target_role:
-                prompt = f"""
-You are a professional resume writer for students and freshers.
-Rewrite this summary for a student applying for: {target_role}
-
-Original: {summary}
-
-Requirements:
-- 2-3 impactful sentences
-- Use strong action-oriented language
-- Mention the role they're targeting
-- Sound enthusiastic but professional
-- No filler phrases like "passionate about" or "highly motivated"
-- Return ONLY the improved summary, nothing else.
-"""
-                improved = generate(prompt, "✨ Enhancing your summary...")
-                st.session_state["summary_enhanced"] = improved
-            else:
-                st.warning("Please fill in your summary and target role first.")
+        with st.expander("🗒️ Step 2 — Professional Summary", expanded=False):
+            summary_step(model)
 
-        if "summary_enhanced" in st.session_state:
-            st.success("✅ AI-Enhanced Summary:")
-            st.text_area("", value=st.session_state["summary_enhanced"], height=90, key="summary_display")
-            st.caption("Copy the above and paste it as your final summary.")
+        with st.expander("🎓 Step 3 — Education", expanded=False):
+            st.markdown("*Add your most recent degree first. Include 10th & 12th if fresher.*")
+            entry_list("education", model)
 
-    # ════════════════════════════════════════════════════════════════════════
-    # SECTION 3 — Education
-    # ════════════════════════════════════════════════════════════════════════
-    with st.expander("🎓 Step 3 — Education", expanded=False):
-        st.markdown("*Add your most recent degree first. Include 10th & 12th if fresher.*")
-        num_edu = st.number_input("Number of education entries", 1, 4, 2, key="num_edu")
-        education = []
-        for i in range(int(num_edu)):
-            st.markdown(f"**📚 Education {i+1}**")
-            ec1, ec2, ec3, ec4 = st.columns([3, 3, 2, 2])
-            with ec1: degree = st.text_input("Degree / Board", key=f"degree_{i}", placeholder="B.Tech CSE / Class 12")
-            with ec2: institution = st.text_input("College / School", key=f"institution_{i}", placeholder="JNTU Hyderabad")
-            with ec3: year = st.text_input("Year", key=f"year_{i}", placeholder="2020 – 2024")
-            with ec4: grade = st.text_input("CGPA / %", key=f"grade_{i}", placeholder="8.5 / 10")
-            education.append({"degree": degree, "institution": institution, "year": year, "grade": grade})
-            if i < int(num_edu) - 1:
-                st.markdown("---")
+        with st.expander("💼 Step 4 — Internships & Work Experience", expanded=False):
+            st.markdown("*Include internships, part-time jobs, freelance work. Freshers can skip if none.*")
+            entry_list("experience", model)
 
-    # ════════════════════════════════════════════════════════════════════════
-    # SECTION 4 — Internships & Experience
-    # ════════════════════════════════════════════════════════════════════════
-    with st.expander("💼 Step 4 — Internships & Work Experience", expanded=False):
-        st.markdown("*Include internships, part-time jobs, freelance work. Freshers can skip if none.*")
-        num_exp = st.number_input("Number of experience entries (0 if none)", 0, 5, 1, key="num_exp")
-        experiences = []
-        for i in range(int(num_exp)):
-            st.markdown(f"**🏢 Experience {i+1}**")
-            xc1, xc2, xc3 = st.columns([3, 3, 2])
-            with xc1: exp_role = st.text_input("Role / Designation", key=f"exp_role_{i}", placeholder="Data Science Intern")
-            with xc2: exp_company = st.text_input("Company / Organization", key=f"exp_company_{i}", placeholder="TCS / StartupXYZ")
-            with xc3: exp_dur = st.text_input("Duration", key=f"exp_dur_{i}", placeholder="May 2023 – Jul 2023")
-            exp_desc = st.text_area(
-                "What did you do? (bullet points preferred)",
-                key=f"exp_desc_{i}",
-                placeholder="• Built a sentiment analysis model with 87% accuracy using LSTM\n• Automated report generation saving 5 hours per week\n• Collaborated with a team of 4 engineers",
-                height=100,
-            )
-            if st.button(f"🤖 Enhance Experience {i+1} with AI", key=f"enhance_exp_{i}"):
-                if exp_desc:
-                    prompt = f"""
-Improve this internship/work experience description for a student's resume.
-Role: {exp_role} at {exp_company}
-Target Job: {target_role if 'target_role' in dir() else 'Software/Data role'}
-
-Original:
-{exp_desc}
-
-Rules:
-- Use bullet points starting with strong action verbs (Built, Developed, Designed, Improved, etc.)
-- Add quantifiable impact wherever possible
-- Keep it under 4 bullet points
-- Return ONLY the improved bullet points.
-"""
-                    improved_exp = generate(prompt, f"✨ Enhancing experience {i+1}...")
-                    st.session_state[f"exp_enhanced_{i}"] = improved_exp
-                else:
-                    st.warning("Please enter description first.")
+        with st.expander("🛠️ Step 5 — Projects", expanded=False):
+            st.markdown("*Your projects are your portfolio! List 2-4 strong ones with tech stack.*")
+            entry_list("projects", model)
 
-            if f"exp_enhanced_{i}" in st.session_state:
-                st.success(f"✅ Enhanced Experience {i+1}:")
-                st.text_area("", value=st.session_state[f"exp_enhanced_{i}"], height=100, key=f"exp_display_{i}")
+        with st.expander("⚡ Step 6 — Technical Skills", expanded=False):
+            skills_step(model)
 
-            experiences.append({"role": exp_role, "company": exp_company, "duration": exp_dur, "description": exp_desc})
-            if i < int(num_exp) - 1:
-                st.markdown("---")
+        with st.expander("🏆 Step 7 — Achievements, Certifications & Extra-Curriculars", expanded=False):
+            extras_step(model)
 
-    # ════════════════════════════════════════════════════════════════════════
-    # SECTION 5 — Projects
-    # ════════════════════════════════════════════════════════════════════════
-    with st.expander("🛠️ Step 5 — Projects", expanded=False):
-        st.markdown("*Your projects are your portfolio! List 2-4 strong ones with tech stack.*")
-        num_proj = st.number_input("Number of projects", 1, 6, 2, key="num_proj")
-        all_projects = []
-        for i in range(int(num_proj)):
-            st.markdown(f"**💡 Project {i+1}**")
-            pc1, pc2 = st.columns(2)
-            with pc1: proj_name = st.text_input("Project Name", key=f"proj_name_{i}", placeholder="Fake News Detector")
-            with pc2: proj_tech = st.text_input("Technologies Used", key=f"proj_tech_{i}", placeholder="Python, NLP, LSTM, Flask")
-            proj_link = st.text_input("GitHub / Live Link (optional)", key=f"proj_link_{i}", placeholder="github.com/priya/fake-news")
-            proj_desc = st.text_area(
-                "Project Description",
-                key=f"proj_desc_{i}",
-                placeholder="Built a machine learning model to classify news articles as real or fake with 94% accuracy.",
-                height=80,
-            )
-            if st.button(f"🤖 Enhance Project {i+1} with AI", key=f"enhance_proj_{i}"):
-                if proj_desc:
-                    prompt = f"""
-Improve this project description for a student resume.
-Project: {proj_name} | Tech: {proj_tech}
-
-Original: {proj_desc}
-
-Rules:
-- Start with an action verb
-- Mention the tech stack naturally
-- Include the impact/outcome (accuracy, users, speed improvement etc.)
-- 1-2 concise sentences max
-- Return ONLY the improved description.
-"""
-                    improved_proj = generate(prompt, f"✨ Enhancing project {i+1}...")
-                    st.session_state[f"proj_enhanced_{i}"] = improved_proj
-
-            if f"proj_enhanced_{i}" in st.session_state:
-                st.success(f"✅ Enhanced Project {i+1}:")
-                st.text_area("", value=st.session_state[f"proj_enhanced_{i}"], height=70, key=f"proj_display_{i}")
-
-            link_text = f" | {proj_link}" if proj_link else ""
-            all_projects.append(f"• {proj_name} ({proj_tech}){link_text}: {proj_desc}")
-            if i < int(num_proj) - 1:
-                st.markdown("---")
+    with preview_col:
+        st.subheader("👁️ Live Preview")
+        live_preview(model)
 
     # ════════════════════════════════════════════════════════════════════════
-    # SECTION 6 — Skills
-    # ════════════════════════════════════════════════════════════════════════
-    with st.expander("⚡ Step 6 — Technical Skills", expanded=False):
-        st.markdown("*Be specific. Group by category for better readability.*")
-        c1, c2 = st.columns(2)
-        with c1:
-            prog_langs = st.text_input("Programming Languages", placeholder="Python, Java, C++, JavaScript")
-            frameworks = st.text_input("Frameworks & Libraries", placeholder="TensorFlow, React, Django, Flask")
-            databases  = st.text_input("Databases", placeholder="MySQL, MongoDB, PostgreSQL")
-        with c2:
-            tools      = st.text_input("Tools & Platforms", placeholder="Git, Docker, VS Code, Jupyter")
-            cloud      = st.text_input("Cloud / DevOps (if any)", placeholder="AWS, GCP, GitHub Actions")
-            soft_skills = st.text_input("Soft Skills", placeholder="Team Player, Problem Solving, Communication")
-
-        skills_combined = []
-        if prog_langs:  skills_combined.append(f"Languages: {prog_langs}")
-        if frameworks:  skills_combined.append(f"Frameworks: {frameworks}")
-        if databases:   skills_combined.append(f"Databases: {databases}")
-        if tools:       skills_combined.append(f"Tools: {tools}")
-        if cloud:       skills_combined.append(f"Cloud/DevOps: {cloud}")
-        if soft_skills: skills_combined.append(f"Soft Skills: {soft_skills}")
-        skills_text = "\n".join(skills_combined)
-
+    # ONE-CLICK — Enhance every filled-in section at once
     # ════════════════════════════════════════════════════════════════════════
-    # SECTION 7 — Achievements & Extras
-    # ════════════════════════════════════════════════════════════════════════
-    with st.expander("🏆 Step 7 — Achievements, Certifications & Extra-Curriculars", expanded=False):
-        achievements = st.text_area(
-            "Achievements & Certifications",
-            placeholder="• Google Data Analytics Certificate – Coursera (2023)\n• Ranked Top 5% in HackerRank Python Assessment\n• Won 1st place in College Hackathon (2023)",
-            height=90,
-        )
-        extra = st.text_area(
-            "Extra-Curricular Activities",
-            placeholder="• NSS Volunteer – Organized blood donation camp for 200+ participants\n• Technical Lead, College Coding Club (2022-23)",
-            height=80,
-        )
+    st.markdown("---")
+    st.subheader("✨ Enhance All Sections with AI")
+    enhance_all_step(model)
 
     # ════════════════════════════════════════════════════════════════════════
     # SECTION 8 — Template Selection & PDF Generation
@@ -243,6 +645,7 @@ Rules:
     template_name = st.selectbox(
         "Select Resume Template",
         list(TEMPLATES.keys()),
+        key="builder_template",
         help="All templates are ATS-friendly. Choose based on your industry.",
     )
 
@@ -257,42 +660,37 @@ Rules:
 
     st.markdown("<br/>", unsafe_allow_html=True)
 
+    # Built from the model on this (full) rerun; steps edited since then are
+    # picked up again when the user clicks a button below.
+    resume_data = resume_data_from(model, st.session_state)
+
+    # ── Previews ──────────────────────────────────────────────────────────────
+    show_template_previews(resume_data, template_name)
+
     if st.button("🚀 Generate My Resume PDF", use_container_width=True, type="primary"):
         # Validation
-        required = {"Full Name": name, "Email": email, "Phone": phone, "Location": location, "Target Role": target_role}
+        required = {
+            "Full Name": model["name"], "Email": model["email"], "Phone": model["phone"],
+            "Location": model["location"], "Target Role": model["target_role"],
+        }
         missing = [k for k, v in required.items() if not v.strip()]
         if missing:
             st.error(f"⚠️ Please fill in: {', '.join(missing)}")
-        else:
-            # Use AI-enhanced versions if available
-            final_summary = st.session_state.get("summary_enhanced", summary)
-            final_projects = "\n".join(
-                st.session_state.get(f"proj_enhanced_{i}", all_projects[i] if i < len(all_projects) else "")
-                for i in range(int(num_proj))
-            )
-
-            resume_data = {
-                "name": name, "email": email, "phone": phone,
-                "location": location, "linkedin": linkedin, "github": github,
-                "summary": final_summary,
-                "education": education,
-                "experience": experiences,
-                "projects": final_projects or "\n".join(all_projects),
-                "skills": skills_text,
-                "achievements": achievements,
-                "extra": extra,
-            }
-
+            return
+        try:
             with st.spinner("📄 Building your resume PDF..."):
+                from utils.pdf_generator import build_pdf
                 pdf_bytes = build_pdf(resume_data, template_name)
-
+        except MissingFontsError:
+            st.error(MISSING_FONTS_MESSAGE)
+        else:
             st.success("🎉 Your resume is ready!")
             st.balloons()
 
             st.download_button(
                 label=f"⬇️ Download Resume PDF",
                 data=pdf_bytes,
-                file_name=f"{name.replace(' ', '_')}_Resume.pdf",
+                file_name=f"{model['name'].replace(' ', '_')}_Resume.pdf",
                 mime="application/pdf",
                 use_container_width=True,
             )
@@ -0,0 +1,104 @@
+"""
+views/bulk_ranking.py — Bulk Resume Ranking (ATS Checker mode for recruiters)
+Score a zip of resumes against one job description locally, then run the
+full Gemini analysis only for the shortlisted candidates.
+"""
+import csv
+import io
+
+import streamlit as st
+
+from utils.bulk_ranker import rank_archive
+from views.ats_checker import run_analysis
+
+
+MAX_SHORTLIST = 5
+
+
+def ranking_csv(ranked):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["Rank", "Resume", "Score"])
+    writer.writerows((rank, c.filename, c.score) for rank, c in enumerate(ranked, 1))
+    return out.getvalue()
+
+
+def show():
+    st.markdown(
+        "*Upload a `.zip` of resume PDFs (or `.docx` / `.txt` files) and one job description. "
+        "Every resume is scored locally — no AI calls — and you can shortlist the best for a full analysis.*"
+    )
+
+    c1, c2 = st.columns(2)
+    with c1:
+        archive = st.file_uploader("📦 Resumes (.zip)", type=["zip"])
+    with c2:
+        job_desc = st.text_area(
+            "📋 Job Description",
+            height=200,
+            placeholder="Paste the full job description here...",
+            key="bulk_job_desc",
+        )
+
+    if st.button("👥 Rank All Resumes", use_container_width=True, type="primary"):
+        if archive is None or not job_desc.strip():
+            st.error("⚠️ Please upload a zip of resumes and paste the job description.")
+        else:
+            bar = st.progress(0.0, text="📄 Reading resumes...")
+
+            def report(done, total):
+                bar.progress(done / total if total else 1.0, text=f"📄 Scored {done} / {total} resumes")
+
+            st.session_state["bulk_results"] = rank_archive(archive, job_desc, progress=report)
+            st.session_state["bulk_jd"] = job_desc
+
+    results = st.session_state.get("bulk_results")
+    if not results:
+        return
+
+    ranked = [c for c in results if not c.error]
+    failed = [c for c in results if c.error]
+
+    st.markdown("---")
+    st.subheader(f"🏆 Candidate Ranking ({len(ranked)} scored)")
+    st.dataframe(
+        [
+            {
+                "Rank": rank,
+                "Resume": c.filename,
+                "Score": c.score,
+                "Matched": len(c.matched),
+                "Missing": len(c.missing),
+                "Top missing keywords": ", ".join(c.missing[:5]),
+            }
+            for rank, c in enumerate(ranked, 1)
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    st.download_button(
+        "⬇️ Download Ranking as .csv",
+        data=ranking_csv(ranked),
+        file_name="Resume_Ranking.csv",
+        mime="text/csv",
+    )
+
+    if failed:
+        with st.expander(f"⚠️ {len(failed)} file(s) could not be scored"):
+            for c in failed:
+                st.markdown(f"- **{c.filename}** — {c.error}")
+
+    # ── Shortlist → Gemini ────────────────────────────────────────────────────
+    st.markdown("---")
+    st.subheader("🔍 Deep Analysis for Your Shortlist")
+    labels = {f"#{rank} — {c.filename} ({c.score}/100)": rank for rank, c in enumerate(ranked, 1)}
+    chosen = st.multiselect(
+        f"Pick up to {MAX_SHORTLIST} candidates for a full AI analysis",
+        list(labels),
+        max_selections=MAX_SHORTLIST,
+    )
+    if st.button("🔍 Analyze Shortlisted Candidates", use_container_width=True, disabled=not chosen):
+        for label in chosen:
+            rank = labels[label]
+            st.markdown(f"### {label}")
+            run_analysis(ranked[rank - 1].text, st.session_state["bulk_jd"], key=f"bulk_{rank}")
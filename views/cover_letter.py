@@ -2,7 +2,23 @@
 views/cover_letter.py — Cover Letter Generator
 """
 import streamlit as st
-from utils.gemini_client import generate
+from utils.gemini_client import stream_generate
+from utils.prompt_prep import prepare_for
+
+
+def letter_box(letter):
+    return f"""
+    <div style='
+        background:#f8f9ff;
+        border-left:4px solid #6C63FF;
+        padding:24px 28px;
+        border-radius:10px;
+        font-size:15px;
+        line-height:1.9;
+        color:#222;
+        white-space:pre-wrap;
+    '>{letter}</div>
+    """
 
 
 def show():
@@ -74,6 +90,8 @@ def show():
                 "Creative & Unique":         "creative and memorable while staying professional",
             }
 
+            company_reason = prepare_for("cover_letter", company_reason).text
+            achievement = prepare_for("cover_letter", achievement).text
             company_note = f"\nWhy this company (use this): {company_reason}" if company_reason else ""
             achievement_note = f"\nKey achievement to highlight: {achievement}" if achievement else ""
 
@@ -100,28 +118,14 @@ Requirements:
 
 Return ONLY the cover letter text.
 """
-            letter = generate(prompt, "✍️ Writing your cover letter...")
-
-            st.success("✅ Your cover letter is ready!")
             st.markdown("---")
-
             st.subheader("📄 Your Cover Letter")
-            st.markdown(
-                f"""
-                <div style='
-                    background:#f8f9ff;
-                    border-left:4px solid #6C63FF;
-                    padding:24px 28px;
-                    border-radius:10px;
-                    font-size:15px;
-                    line-height:1.9;
-                    color:#222;
-                    white-space:pre-wrap;
-                '>{letter}</div>
-                """,
-                unsafe_allow_html=True,
+            letter = stream_generate(
+                prompt, letter_box, "✍️ Writing your cover letter...", feature="cover_letter"
             )
 
+            st.success("✅ Your cover letter is ready!")
+
             st.markdown("---")
             ca, cb = st.columns(2)
             with ca:
@@ -0,0 +1,95 @@
+"""
+views/diagnostics.py — Rerun Timing Diagnostics (Admin)
+Rolling p50 / p95 / p99 rerun times per page, split into imports, widget
+building, Gemini waits and PDF rendering — plus the report shown under a
+profiled rerun (utils/profiling.py).
+"""
+import streamlit as st
+
+from utils import rerun_timing, startup
+
+
+def ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+def show():
+    st.markdown(
+        """
+        <h1 style='color:#6C63FF;'>🩺 Diagnostics</h1>
+        <p style='color:gray;'>
+            How long each page takes to rerun in this server process
+            (last {window} reruns per page).
+        </p>
+        <hr/>
+        """.format(window=rerun_timing.ROLLING_WINDOW),
+        unsafe_allow_html=True,
+    )
+
+    stats = rerun_timing.page_stats()
+    if not stats:
+        st.info("No reruns recorded yet. Use the app, then come back here.")
+        return
+
+    st.subheader("⏱️ Rerun Time per Page (ms)")
+    st.dataframe(
+        [
+            {
+                "page": page,
+                "reruns": s["reruns"],
+                "p50": ms(s["total"]["p50"]),
+                "p95": ms(s["total"]["p95"]),
+                "p99": ms(s["total"]["p99"]),
+            }
+            for page, s in stats.items()
+        ],
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    st.subheader("🧩 Where the Time Goes (ms)")
+    percentile = st.radio("Percentile", ["p50", "p95", "p99"], horizontal=True, key="diag_percentile")
+    breakdown = {
+        page: {name: ms(s[name][percentile]) for name in rerun_timing.PHASES}
+        for page, s in stats.items()
+    }
+    st.bar_chart(breakdown, horizontal=True)
+    st.dataframe(
+        [{"page": page, **phases} for page, phases in breakdown.items()],
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    if startup.warmup_timings:
+        st.subheader("🚀 Background Warm-Up (ms)")
+        st.dataframe(
+            [{"step": name, "ms": ms(seconds)} for name, seconds in startup.warmup_timings.items()],
+            hide_index=True,
+        )
+        st.caption("Run `python -m utils.startup` for per-page cold-start import times.")
+
+    st.caption(
+        f"Reruns slower than {rerun_timing.SLOW_RERUN_SECONDS:.1f}s are logged "
+        "(logger `smartresume.rerun`) with the page name and widget counts."
+    )
+    if st.button("Reset timings", key="diag_reset"):
+        rerun_timing.reset()
+        st.rerun()
+
+
+def show_profile_report(report):
+    """Top functions and allocation sites of a profiled rerun (page bottom)."""
+    st.markdown("---")
+    with st.expander(f"🔬 Profile of this rerun — {report.page} ({report.seconds:.2f}s)"):
+        c1, c2 = st.columns(2)
+        c1.metric("Peak traced memory", f"{report.peak_kib / 1024:.1f} MiB")
+        c2.metric("Still allocated at end", f"{report.retained_kib / 1024:.1f} MiB")
+
+        tab_cum, tab_self, tab_mem = st.tabs(["Cumulative time", "Self time", "Allocations"])
+        with tab_cum:
+            st.dataframe(report.top_cumulative, hide_index=True, use_container_width=True)
+        with tab_self:
+            st.dataframe(report.top_self, hide_index=True, use_container_width=True)
+        with tab_mem:
+            st.dataframe(report.top_allocations, hide_index=True, use_container_width=True)
+        st.caption(f"Saved to `{report.pstats_path}` and `{report.json_path}`.")
@@ -0,0 +1,160 @@
+"""
+views/jd_library.py — Job Description Library (ATS Checker mode)
+Index many job descriptions once, rank one resume against all of them
+locally, and send only the chosen few to Gemini for a deep analysis.
+The library is shared by every user of the server, so only an admin
+(SMARTRESUME_ADMIN=1) can build or replace it.
+"""
+import json
+import os
+
+import streamlit as st
+
+from utils.jd_index import DEFAULT_INDEX_DIR, JDIndex, build_index, current_version
+from views.admin_metrics import admin_enabled
+from views.ats_checker import run_analysis
+
+
+MAX_DEEP_ANALYSES = 3
+
+
+@st.cache_resource(max_entries=2)
+def load_index(version):
+    """Memory-mapped index, reopened only when a new version is built."""
+    return JDIndex(DEFAULT_INDEX_DIR, version)
+
+
+def get_index():
+    version = current_version()
+    return None if version is None else load_index(version)
+
+
+def parse_jds(uploads, pasted):
+    """
+    Collect (title, text) pairs from uploaded .txt/.jsonl files and pasted
+    text. Returns (jds, skipped) where `skipped` names the .jsonl lines that
+    are not JSON objects with a non-empty "text".
+    """
+    jds, skipped = [], []
+    for f in uploads or []:
+        raw = f.getvalue().decode("utf-8", "replace")
+        if f.name.lower().endswith(".jsonl"):
+            for number, line in enumerate(raw.splitlines(), 1):
+                if not line.strip():
+                    continue
+                try:
+                    rec = json.loads(line)
+                    text = rec["text"]
+                except (ValueError, KeyError, TypeError):
+                    text = None
+                if not isinstance(text, str) or not text.strip():
+                    skipped.append(f"{f.name}:{number}")
+                    continue
+                jds.append((rec.get("title") or f"JD {len(jds) + 1}", text))
+        else:
+            jds.append((os.path.splitext(f.name)[0], raw))
+
+    block = []
+    for line in (pasted or "").splitlines() + ["---"]:
+        if line.strip() == "---":
+            text = "\n".join(block).strip()
+            if text:
+                title = next(l.strip() for l in text.splitlines() if l.strip())[:60]
+                jds.append((title, text))
+            block = []
+        else:
+            block.append(line)
+    return jds, skipped
+
+
+def show():
+    index = get_index()
+
+    # ── Build / replace library (admin only: it is shared by everyone) ───────
+    if admin_enabled():
+        with st.expander("📚 Build the job description library", expanded=index is None):
+            st.markdown(
+                "*Upload `.txt` files (one JD each) or a `.jsonl` file with `title` and `text` fields, "
+                "or paste JDs separated by a line containing only `---`. Indexing happens once, "
+                "and the library replaces the current one for every user.*"
+            )
+            uploads = st.file_uploader(
+                "Job description files", type=["txt", "jsonl"], accept_multiple_files=True
+            )
+            pasted = st.text_area("…or paste job descriptions", height=150, key="jd_library_paste")
+            if st.button("🗂️ Index Job Descriptions", use_container_width=True):
+                jds, skipped = parse_jds(uploads, pasted)
+                if skipped:
+                    st.warning(
+                        f"⚠️ Skipped {len(skipped)} malformed line(s) (not JSON with a \"text\" field): "
+                        + ", ".join(skipped[:10]) + (" …" if len(skipped) > 10 else "")
+                    )
+                if not jds:
+                    st.error("⚠️ Please upload or paste at least one job description.")
+                else:
+                    with st.spinner(f"📚 Indexing {len(jds)} job descriptions..."):
+                        build_index(jds)
+                    st.success(f"✅ Indexed {len(jds)} job descriptions.")
+                    index = get_index()
+
+    if index is None:
+        st.info("💡 No job description library yet. Your placement cell can build one for everyone to rank against.")
+        return
+
+    st.caption(f"📚 Library: {len(index)} job descriptions indexed.")
+
+    # ── Rank ──────────────────────────────────────────────────────────────────
+    resume_text = st.text_area(
+        "Paste your resume text here",
+        height=250,
+        placeholder="Paste the text content of your resume here...",
+        key="library_resume_text",
+    )
+    top_n = st.slider("How many top roles to show", 1, 50, 10)
+
+    if st.button("🏆 Find My Best-Fit Roles", use_container_width=True, type="primary"):
+        if not resume_text.strip():
+            st.error("⚠️ Please paste your resume text.")
+        else:
+            st.session_state["jd_matches"] = (index.version, index.rank(resume_text, top_n))
+
+    # Matches refer to JD ids of the version they were ranked against
+    version, matches = st.session_state.get("jd_matches", (None, None))
+    if not matches or version != index.version:
+        return
+
+    st.markdown("---")
+    st.subheader("🏆 Best-Fit Roles")
+    st.dataframe(
+        [
+            {
+                "Rank": rank,
+                "Role": m.title,
+                "Score": m.score,
+                "Matched": len(m.matched),
+                "Top missing keywords": ", ".join(m.missing[:5]),
+            }
+            for rank, m in enumerate(matches, 1)
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    for rank, m in enumerate(matches, 1):
+        with st.expander(f"#{rank} — {m.title} ({m.score}/100)"):
+            st.markdown("**✅ Matched:** " + (", ".join(m.matched) or "*none*"))
+            st.markdown("**❌ Missing:** " + (", ".join(m.missing) or "*none*"))
+
+    # ── Deep analysis for the chosen few ──────────────────────────────────────
+    st.markdown("---")
+    st.subheader("🔍 Deep Analysis with Gemini")
+    labels = {f"#{rank} — {m.title}": m for rank, m in enumerate(matches, 1)}
+    chosen = st.multiselect(
+        f"Pick up to {MAX_DEEP_ANALYSES} roles for a full AI analysis",
+        list(labels),
+        max_selections=MAX_DEEP_ANALYSES,
+    )
+    if st.button("🔍 Analyze Selected Roles", use_container_width=True, disabled=not chosen):
+        for label in chosen:
+            m = labels[label]
+            st.markdown(f"### {label}")
+            run_analysis(resume_text, index.jd_text(m.jd_id), key=f"jd_{m.jd_id}")
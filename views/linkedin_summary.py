@@ -2,7 +2,23 @@
 views/linkedin_summary.py — LinkedIn Summary Generator
 """
 import streamlit as st
-from utils.gemini_client import generate
+from utils.gemini_client import stream_generate
+from utils.prompt_prep import prepare_for
+
+
+def summary_box(summary):
+    return f"""
+    <div style='
+        background:#f0f7ff;
+        border-left:4px solid #0077b5;
+        padding:22px 26px;
+        border-radius:10px;
+        font-size:15px;
+        line-height:1.85;
+        color:#222;
+        white-space:pre-wrap;
+    '>{summary}</div>
+    """
 
 
 def show():
@@ -48,6 +64,8 @@ def show():
         if not target or not skills:
             st.error("⚠️ Please fill in Target Role and Skills at minimum.")
         else:
+            projects = prepare_for("linkedin", projects).text
+            achievement = prepare_for("linkedin", achievement).text
             prompt = f"""
 Write a compelling LinkedIn 'About' section for a student/fresher:
 
@@ -70,27 +88,13 @@ Requirements:
 
 Return ONLY the LinkedIn summary text.
 """
-            summary = generate(prompt, "✍️ Crafting your LinkedIn summary...")
-
-            st.success("✅ Your LinkedIn summary is ready!")
             st.markdown("---")
-
-            st.markdown(
-                f"""
-                <div style='
-                    background:#f0f7ff;
-                    border-left:4px solid #0077b5;
-                    padding:22px 26px;
-                    border-radius:10px;
-                    font-size:15px;
-                    line-height:1.85;
-                    color:#222;
-                    white-space:pre-wrap;
-                '>{summary}</div>
-                """,
-                unsafe_allow_html=True,
+            summary = stream_generate(
+                prompt, summary_box, "✍️ Crafting your LinkedIn summary...", feature="linkedin"
             )
 
+            st.success("✅ Your LinkedIn summary is ready!")
+
             st.markdown("---")
             st.text_area("📋 Copy from here:", value=summary, height=180)
             st.download_button(
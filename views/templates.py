@@ -2,7 +2,8 @@
 views/templates.py — Resume Template Showcase
 """
 import streamlit as st
-from utils.pdf_generator import TEMPLATES, build_pdf
+from utils.resume_templates import SAMPLE_RESUME, TEMPLATES, MissingFontsError
+from utils.pdf_preview import HAS_RASTERIZER, cached_thumbnail, render_all_thumbnails
 
 
 def show():
@@ -103,28 +104,8 @@ def show():
     selected = st.selectbox("Choose template to preview", list(TEMPLATES.keys()))
 
     if st.button("⬇️ Download Sample PDF", use_container_width=True):
-        sample_data = {
-            "name": "Priya Sharma",
-            "email": "priya@gmail.com",
-            "phone": "+91 9876543210",
-            "location": "Hyderabad, India",
-            "linkedin": "linkedin.com/in/priyasharma",
-            "github": "github.com/priyasharma",
-            "summary": "Final year B.Tech CSE student with a strong foundation in Python, Machine Learning, and web development. Built 3+ end-to-end ML projects and completed a data science internship at a tech startup. Seeking a full-time SDE/Data Science role where I can apply my skills to solve real-world problems.",
-            "education": [
-                {"degree": "B.Tech Computer Science", "institution": "JNTU Hyderabad", "year": "2020 – 2024", "grade": "8.5 / 10"},
-                {"degree": "Class 12 (MPC)", "institution": "Narayana Junior College", "year": "2018 – 2020", "grade": "95.4%"},
-            ],
-            "experience": [
-                {"role": "Data Science Intern", "company": "TechStartup Pvt. Ltd.", "duration": "May – Aug 2023",
-                 "description": "• Built a customer churn prediction model using XGBoost with 89% accuracy, reducing churn by 12%\n• Automated weekly reporting dashboards using Python and Tableau, saving 5 hours per week\n• Collaborated with a team of 4 engineers in an Agile environment"}
-            ],
-            "projects": "• Fake News Detector (Python, NLP, LSTM): Classified news articles as real/fake with 94% accuracy. Deployed as a Flask web app.\n• Stock Price Predictor (Python, LSTM, yfinance): Predicted next-day stock prices with RMSE of 2.3 for NIFTY 50.\n• Personal Finance Tracker (React, Firebase): Built a full-stack app to track expenses with visualizations.",
-            "skills": "Languages: Python, Java, SQL, JavaScript\nFrameworks: TensorFlow, Scikit-learn, React, Flask\nTools: Git, Docker, Jupyter, VS Code, Tableau\nSoft Skills: Problem Solving, Team Collaboration, Communication",
-            "achievements": "• Google Data Analytics Professional Certificate – Coursera (2023)\n• Ranked Top 5% in HackerRank Python Assessment (Gold Badge)\n• 1st Place – College Hackathon 2023 (50+ teams)",
-            "extra": "• Technical Lead, College Coding Club (2022-23) — organized workshops for 200+ students\n• NSS Volunteer — coordinated blood donation drives and awareness campaigns",
-        }
-        pdf_bytes = build_pdf(sample_data, selected)
+        from utils.pdf_generator import build_pdf
+        pdf_bytes = build_pdf(SAMPLE_RESUME, selected)
         st.download_button(
             f"📄 Download {selected} Sample",
             data=pdf_bytes,
@@ -133,5 +114,25 @@ def show():
             use_container_width=True,
         )
 
+    # ── Your Resume in Every Template ─────────────────────────────────────────
+    from views.builder import MISSING_FONTS_MESSAGE, current_resume_data
+    resume_data = current_resume_data()
+    if HAS_RASTERIZER and resume_data and resume_data.get("name"):
+        st.markdown("---")
+        st.subheader("👀 Your Resume in Every Template")
+        st.markdown("*Uses the details you entered in the Resume Builder.*")
+        if st.button("🖼️ Show My Previews", use_container_width=True):
+            try:
+                with st.spinner("🖼️ Rendering previews in all templates..."):
+                    render_all_thumbnails(resume_data)
+            except MissingFontsError:
+                st.error(MISSING_FONTS_MESSAGE)
+        if cached_thumbnail(resume_data, selected) is not None:
+            cols = st.columns(3)
+            for i, tname in enumerate(TEMPLATES):
+                png = cached_thumbnail(resume_data, tname)
+                if png is not None:
+                    cols[i % 3].image(png, caption=tname)
+
     st.markdown("---")
     st.info("🚀 Ready to build your own? Click **📝 Build My Resume** in the sidebar!")